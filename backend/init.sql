@@ -26,9 +26,44 @@ CREATE TABLE IF NOT EXISTS videos (
     error_message TEXT
 );
 
+CREATE TABLE IF NOT EXISTS analysis_cache (
+    cache_key VARCHAR(64) PRIMARY KEY,
+    video_hash VARCHAR(64) NOT NULL,
+    params JSONB NOT NULL,
+    result JSONB NOT NULL,
+    hit_count INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id VARCHAR(36) PRIMARY KEY,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    kind VARCHAR(50) NOT NULL,
+    status VARCHAR(20) DEFAULT 'queued',
+    payload JSONB NOT NULL,
+    result JSONB,
+    progress JSONB,
+    error TEXT,
+    credits_cost INTEGER DEFAULT 0,
+    attempts INTEGER DEFAULT 0,
+    max_attempts INTEGER DEFAULT 1,
+    worker_id VARCHAR(255),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    run_after TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
 CREATE INDEX idx_videos_user_id ON videos(user_id);
 CREATE INDEX idx_videos_status ON videos(status);
 CREATE INDEX idx_users_email ON users(email);
+CREATE INDEX idx_analysis_cache_video_hash ON analysis_cache(video_hash);
+CREATE INDEX idx_analysis_cache_expires_at ON analysis_cache(expires_at);
+CREATE INDEX idx_jobs_user_id ON jobs(user_id);
+-- Workers claim the oldest runnable queued job
+CREATE INDEX idx_jobs_queued ON jobs(created_at) WHERE status = 'queued';
 
 -- Insert default admin user (password: admin123)
 -- Password hash for 'admin123' with bcrypt
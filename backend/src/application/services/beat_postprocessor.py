@@ -0,0 +1,283 @@
+"""
+Beat Post-Processor
+Deterministic repair of the model's beats before TTS: fixes timestamps
+(missing, unordered, overlapping, outside the video) and makes every beat's
+script fit the time until the next beat at the voice's calibrated WPS, so the
+narration never runs into the following segment. Nothing is re-generated:
+beats are merged, text is moved between neighbours and trimmed only as a last resort.
+"""
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+from src.domain.entities.video_analysis import Beat, VideoAnalysis, Voiceover
+
+# Share of the available time speech may fill (1.0 = ends exactly when the next beat starts)
+BEAT_MAX_FILL_RATIO = float(os.getenv("BEAT_MAX_FILL_RATIO", "1.0"))
+# Shorter beats are merged into a neighbour
+MIN_BEAT_S = 0.5
+
+SENTENCE_ENDINGS = (".", "!", "?", "…", '."', '!"', '?"')
+CLAUSE_ENDINGS = (",", ";", ":", "—")
+
+
+@dataclass
+class BeatRepairReport:
+    """What repair_beats changed"""
+    times_fixed: int = 0
+    reordered: bool = False
+    merged: int = 0
+    pauses_reduced: int = 0
+    words_moved: int = 0
+    words_trimmed: int = 0
+    overlong: List[int] = field(default_factory=list)  # ids of beats that were over budget
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.times_fixed or self.reordered or self.merged or self.pauses_reduced
+                    or self.words_moved or self.words_trimmed)
+
+    def summary(self) -> str:
+        return (f"{len(self.overlong)} overlong, {self.times_fixed} times fixed, {self.merged} merged, "
+                f"{self.pauses_reduced} pauses reduced, {self.words_moved} words moved, "
+                f"{self.words_trimmed} words trimmed")
+
+
+def script_of(beat: Beat) -> str:
+    return (beat.voiceover.script or "").strip() if beat.voiceover else ""
+
+
+def word_count(text: str) -> int:
+    return len(text.split())
+
+
+def word_budget(available_s: float, words_per_sec: float, fill_ratio: float = BEAT_MAX_FILL_RATIO) -> int:
+    """Maximum words that can be spoken in available_s seconds"""
+    return max(0, int(available_s * words_per_sec * fill_ratio))
+
+
+def split_text(text: str, max_words: int) -> Tuple[str, str]:
+    """
+    Split text into a head of at most max_words words and the rest
+
+    Prefers cutting after a sentence, then after a clause, then between
+    words, as long as the head keeps at least half of the allowed words.
+
+    Returns:
+        (head, tail) - either may be empty
+    """
+    words = text.split()
+    if len(words) <= max_words:
+        return text.strip(), ""
+    if max_words <= 0:
+        return "", text.strip()
+
+    floor = max(1, max_words // 2)
+    for endings in (SENTENCE_ENDINGS, CLAUSE_ENDINGS):
+        for cut in range(max_words, floor - 1, -1):
+            if words[cut - 1].endswith(endings):
+                return " ".join(words[:cut]), " ".join(words[cut:])
+    return " ".join(words[:max_words]), " ".join(words[max_words:])
+
+
+def set_script(beat: Beat, text: str):
+    beat.voiceover.script = text
+    if beat.voiceover.subtitle:
+        beat.voiceover.subtitle = text
+
+
+def fix_timestamps(beats: List[Beat], duration_s: float, report: BeatRepairReport) -> List[Beat]:
+    """Fill missing times, clamp to the video, sort and remove overlaps"""
+    previous_end = 0.0
+    for index, beat in enumerate(beats):
+        start, end = beat.start_s, beat.end_s
+        if start is None:
+            start = previous_end
+        if end is None:
+            following = next((b.start_s for b in beats[index + 1:] if b.start_s is not None), None)
+            end = following if following is not None and following > start else duration_s
+        start = min(max(0.0, start), duration_s)
+        end = min(max(start, end), duration_s)
+        if (start, end) != (beat.start_s, beat.end_s):
+            beat.start_s, beat.end_s = round(start, 3), round(end, 3)
+            report.times_fixed += 1
+        previous_end = end
+
+    ordered = sorted(beats, key=lambda b: (b.start_s, b.end_s))
+    if [id(b) for b in ordered] != [id(b) for b in beats]:
+        report.reordered = True
+
+    for previous, beat in zip(ordered, ordered[1:]):
+        if previous.end_s > beat.start_s:
+            previous.end_s = beat.start_s
+            report.times_fixed += 1
+    return ordered
+
+
+def merge_short_beats(beats: List[Beat], report: BeatRepairReport) -> List[Beat]:
+    """Fold beats shorter than MIN_BEAT_S into the previous (or next) beat"""
+    merged: List[Beat] = []
+    pending: Optional[Beat] = None  # short leading beat waiting for a next one
+    for beat in beats:
+        if pending is not None:
+            beat.start_s = pending.start_s
+            _absorb(beat, pending, prepend=True)
+            report.merged += 1
+            pending = None
+
+        if beat.end_s - beat.start_s >= MIN_BEAT_S:
+            merged.append(beat)
+        elif merged:
+            previous = merged[-1]
+            previous.end_s = max(previous.end_s, beat.end_s)
+            _absorb(previous, beat, prepend=False)
+            report.merged += 1
+        else:
+            pending = beat
+
+    if pending is not None:
+        merged.append(pending)
+    return merged
+
+
+def _absorb(target: Beat, other: Beat, prepend: bool):
+    """Move other's script and visual summary into target"""
+    text = script_of(other)
+    if text:
+        if target.voiceover is None:
+            target.voiceover = Voiceover(script="", pause_after_s=0.0)
+        current = script_of(target)
+        set_script(target, f"{text} {current}".strip() if prepend else f"{current} {text}".strip())
+        if not prepend and other.voiceover.pause_after_s:
+            target.voiceover.pause_after_s = other.voiceover.pause_after_s
+    if other.visual_summary:
+        parts = [other.visual_summary, target.visual_summary] if prepend else [target.visual_summary, other.visual_summary]
+        target.visual_summary = " / ".join(p for p in parts if p)
+
+
+def available_time(beats: List[Beat], index: int, duration_s: float) -> float:
+    """Seconds from this beat's start until the next beat starts (or the video ends)"""
+    beat = beats[index]
+    next_start = beats[index + 1].start_s if index + 1 < len(beats) else duration_s
+    return max(0.0, next_start - beat.start_s)
+
+
+def fit_beat(beat: Beat, available_s: float, words_per_sec: float, report: BeatRepairReport) -> str:
+    """
+    Make one beat fit its time slot
+
+    The dramatic pause is shortened first; if the script still does not fit,
+    the words that overflow are cut off (at a sentence/clause when possible).
+
+    Returns:
+        Overflow text to hand to a neighbouring beat ("" if it fits)
+    """
+    text = script_of(beat)
+    if not text:
+        return ""
+
+    words = word_count(text)
+    pause = beat.voiceover.pause_after_s or 0.0
+    if words <= word_budget(available_s - pause, words_per_sec):
+        return ""
+
+    if beat.id is not None and beat.id not in report.overlong:
+        report.overlong.append(beat.id)
+    if pause:
+        speech_s = words / (words_per_sec * BEAT_MAX_FILL_RATIO)
+        beat.voiceover.pause_after_s = round(max(0.0, min(pause, available_s - speech_s)), 2)
+        report.pauses_reduced += 1
+        pause = beat.voiceover.pause_after_s
+
+    head, tail = split_text(text, word_budget(available_s - pause, words_per_sec))
+    if tail:
+        set_script(beat, head)
+    return tail
+
+
+def redistribute_scripts(beats: List[Beat], duration_s: float, words_per_sec: float, report: BeatRepairReport):
+    """
+    Forward pass: the overflow of beat i is prepended to beat i+1.
+    Backward pass: overflow left after the last beat is absorbed by the closest
+    earlier beats with spare room (the text stays in order, boundaries shift back).
+    Whatever still does not fit is trimmed from the end.
+    """
+    carry = ""
+    for index, beat in enumerate(beats):
+        if carry:
+            if beat.voiceover is None:
+                beat.voiceover = Voiceover(script="", pause_after_s=0.0)
+            set_script(beat, f"{carry} {script_of(beat)}".strip())
+            report.words_moved += word_count(carry)
+        carry = fit_beat(beat, available_time(beats, index, duration_s), words_per_sec, report)
+
+    if not carry:
+        return
+
+    counts = [word_count(script_of(beat)) for beat in beats]
+    excess = word_count(carry)
+    first_changed = len(beats)
+    for index in range(len(beats) - 1, -1, -1):
+        if not excess:
+            break
+        voiceover = beats[index].voiceover
+        pause = (voiceover.pause_after_s or 0.0) if voiceover else 0.0
+        spare = word_budget(available_time(beats, index, duration_s) - pause, words_per_sec) - counts[index]
+        if spare > 0:
+            taken = min(spare, excess)
+            counts[index] += taken
+            excess -= taken
+            report.words_moved += taken
+            first_changed = index
+
+    stream = " ".join([script_of(beat) for beat in beats[first_changed:]] + [carry]).split()
+    if excess:
+        report.words_trimmed += excess
+        stream = stream[:len(stream) - excess]
+
+    for index in range(first_changed, len(beats)):
+        chunk, stream = stream[:counts[index]], stream[counts[index]:]
+        if chunk and beats[index].voiceover is None:
+            beats[index].voiceover = Voiceover(script="", pause_after_s=0.0)
+        if beats[index].voiceover is not None:
+            set_script(beats[index], " ".join(chunk))
+
+
+def repair_beats(
+    beats: List[Beat],
+    duration_s: Optional[float],
+    words_per_sec: Optional[float]
+) -> Tuple[List[Beat], BeatRepairReport]:
+    """
+    Validate and repair beat timing and word budgets
+
+    Args:
+        beats: Beats from the model (modified in place)
+        duration_s: Video duration (falls back to the last beat end)
+        words_per_sec: Calibrated WPS of the voice; word budgets are skipped without it
+
+    Returns:
+        (repaired beats renumbered from 1, report)
+    """
+    report = BeatRepairReport()
+    if not beats:
+        return beats, report
+
+    if not duration_s:
+        duration_s = max((b.end_s or b.start_s or 0.0) for b in beats)
+
+    beats = fix_timestamps(beats, duration_s, report)
+    beats = merge_short_beats(beats, report)
+    if words_per_sec:
+        redistribute_scripts(beats, duration_s, words_per_sec, report)
+
+    for number, beat in enumerate(beats, start=1):
+        beat.id = number
+    return beats, report
+
+
+def repair_analysis(analysis: VideoAnalysis) -> BeatRepairReport:
+    """Repair analysis.beats in place using its duration and calibrated WPS"""
+    analysis.beats, report = repair_beats(analysis.beats, analysis.duration_s, analysis.words_per_second)
+    if report.changed:
+        print(f"   🩹 Beat repair: {report.summary()}")
+    return report
@@ -0,0 +1,279 @@
+"""
+Progress Service
+Stage-level progress events for long-running workflows. Use cases report
+through a ProgressReporter and never know where the events end up: the API
+publishes them to the ProgressBroker (streamed over SSE, relayed to the other
+API processes), the worker stores the latest one on the job row.
+"""
+import asyncio
+import os
+import time
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+# Closed channels stay readable this long, so a late subscriber still gets the outcome
+PROGRESS_RETENTION_S = float(os.getenv("PROGRESS_RETENTION_S", "300"))
+PROGRESS_HISTORY_LIMIT = int(os.getenv("PROGRESS_HISTORY_LIMIT", "500"))
+# Open channels nobody publishes to or listens on (abandoned requests) are dropped after this
+PROGRESS_IDLE_TIMEOUT_S = float(os.getenv("PROGRESS_IDLE_TIMEOUT_S", "3600"))
+
+STAGE_UPLOAD = "upload"            # request file received
+STAGE_ANALYZING = "analyzing"      # Gemini upload + processing
+STAGE_BEAT = "beat"                # one beat streamed in (current = beats so far)
+STAGE_BEATS_READY = "beats_ready"  # final, repaired beat list
+STAGE_TTS = "tts"                  # narration clips done (current/total)
+STAGE_IMAGES = "images"            # reel scene images fetched (current/total)
+STAGE_RENDERING = "rendering"      # mix/render percent from ffmpeg -progress
+STAGE_STORING = "storing"          # upload of the final video to object storage
+STAGE_COMPLETED = "completed"
+STAGE_FAILED = "failed"
+TERMINAL_STAGES = (STAGE_COMPLETED, STAGE_FAILED)
+
+
+@dataclass
+class ProgressEvent:
+    """One stage transition or progress tick"""
+    stage: str
+    message: str = ""
+    current: Optional[int] = None
+    total: Optional[int] = None
+    percent: Optional[float] = None
+    timestamp: float = field(default_factory=time.time)
+
+    @property
+    def terminal(self) -> bool:
+        return self.stage in TERMINAL_STAGES
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+class ProgressReporter:
+    """
+    What a use case talks to; the sink decides where events go
+
+    A reporter without a sink drops everything, so use cases can always
+    report unconditionally.
+    """
+
+    def __init__(self, sink: Optional[Callable[[ProgressEvent], None]] = None):
+        self.sink = sink
+        self._last_percent: Dict[str, int] = {}
+
+    def emit(
+        self,
+        stage: str,
+        message: str = "",
+        current: Optional[int] = None,
+        total: Optional[int] = None,
+        percent: Optional[float] = None
+    ):
+        if self.sink is None:
+            return
+        if percent is None and current is not None and total:
+            percent = current / total * 100
+        if percent is not None:
+            percent = round(min(100.0, max(0.0, percent)), 1)
+        try:
+            self.sink(ProgressEvent(stage, message, current, total, percent))
+        except Exception as e:
+            # Progress is best-effort; never fail the workflow over it
+            print(f"   ⚠️ Progress sink failed: {e}")
+
+    def percent(self, stage: str, percent: float, message: str = ""):
+        """Emit a percentage, at most once per whole percent (ffmpeg reports several times a second)"""
+        whole = int(percent)
+        if self._last_percent.get(stage) == whole:
+            return
+        self._last_percent[stage] = whole
+        self.emit(stage, message, percent=percent)
+
+    def counter(self, stage: str, total: int, message: str = "") -> Callable[[int, int], None]:
+        """Callback for n/m progress of a batch, emitting the initial 0/total right away"""
+        self.emit(stage, message, current=0, total=total)
+        return lambda done, count: self.emit(stage, message, current=done, total=count)
+
+
+NULL_PROGRESS = ProgressReporter()
+
+
+class _Channel:
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self.history: List[ProgressEvent] = []
+        self.subscribers: List[asyncio.Queue] = []
+        self.closed_at: Optional[float] = None
+        self.updated_at = time.time()
+
+
+class ProgressBroker:
+    """
+    Fan-out of progress events, keyed by a client-chosen progress id
+
+    The client picks the id, subscribes, and passes the same id with the
+    request that starts the work, so it sees events from the first stage.
+    Subscribers get the channel's history first, then live events, until a
+    terminal event closes the channel.
+
+    Channels live in process memory. With several API processes the SSE
+    request and the POST can land on different ones, so every published
+    event is also handed to the relay (see progress_relay.py), which brings
+    the other processes' events back in through deliver().
+    """
+
+    def __init__(
+        self,
+        retention_s: float = PROGRESS_RETENTION_S,
+        idle_timeout_s: float = PROGRESS_IDLE_TIMEOUT_S,
+        relay: Optional[Callable[[str, int, ProgressEvent], None]] = None
+    ):
+        self.retention_s = retention_s
+        self.idle_timeout_s = idle_timeout_s
+        self.relay = relay
+        self._channels: Dict[str, _Channel] = {}
+        self._lock = threading.Lock()
+
+    def _channel(self, progress_id: str, user_id: int) -> _Channel:
+        """Get or create a channel, refusing ids that belong to another user"""
+        self._purge()
+        channel = self._channels.get(progress_id)
+        if channel is None:
+            channel = self._channels[progress_id] = _Channel(user_id)
+        elif channel.user_id != user_id:
+            raise PermissionError(f"Progress id {progress_id} belongs to another user")
+        channel.updated_at = time.time()
+        return channel
+
+    def _purge(self):
+        now = time.time()
+        expired = [
+            key for key, c in self._channels.items()
+            if (c.closed_at and c.closed_at < now - self.retention_s)
+            or (not c.subscribers and c.updated_at < now - self.idle_timeout_s)
+        ]
+        for key in expired:
+            del self._channels[key]
+
+    def reporter(self, progress_id: Optional[str], user_id: int) -> ProgressReporter:
+        """
+        Reporter that publishes to a channel (a no-op reporter without an id)
+
+        Raises:
+            PermissionError: The id is already used by another user
+        """
+        if not progress_id:
+            return NULL_PROGRESS
+        with self._lock:
+            channel = self._channel(progress_id, user_id)
+            # Reusing an id starts a fresh run
+            channel.history.clear()
+            channel.closed_at = None
+        return ProgressReporter(lambda event: self.publish(progress_id, event))
+
+    def publish(self, progress_id: str, event: ProgressEvent):
+        """Record, fan out and relay an event (event loop thread only)"""
+        with self._lock:
+            channel = self._channels.get(progress_id)
+            if channel is None:
+                return
+            subscribers = self._record(channel, event)
+        for queue in subscribers:
+            queue.put_nowait(event)
+        if self.relay is not None:
+            try:
+                self.relay(progress_id, channel.user_id, event)
+            except Exception as e:
+                print(f"   ⚠️ Progress relay failed: {e}")
+
+    def deliver(self, progress_id: str, user_id: int, event_data: Dict):
+        """Record and fan out an event another process published (never relayed again)"""
+        event = ProgressEvent(**event_data)
+        with self._lock:
+            try:
+                channel = self._channel(progress_id, user_id)
+            except PermissionError:
+                return
+            if channel.closed_at and not event.terminal:
+                # The id was reused for a new run on the publishing process
+                channel.history.clear()
+                channel.closed_at = None
+            subscribers = self._record(channel, event)
+        for queue in subscribers:
+            queue.put_nowait(event)
+
+    def _record(self, channel: _Channel, event: ProgressEvent) -> List[asyncio.Queue]:
+        """Append to the history (caller holds the lock); returns the queues to notify"""
+        channel.history.append(event)
+        channel.updated_at = time.time()
+        del channel.history[:-PROGRESS_HISTORY_LIMIT]
+        if event.terminal:
+            channel.closed_at = time.time()
+        return list(channel.subscribers)
+
+    def subscribe(
+        self,
+        progress_id: str,
+        user_id: int,
+        keepalive_s: Optional[float] = None
+    ) -> AsyncIterator[Optional[ProgressEvent]]:
+        """
+        Replay the history, then yield live events until a terminal one
+
+        Ownership is checked here rather than on first iteration, so callers
+        can turn the error into a response before streaming starts.
+
+        Args:
+            progress_id: Channel id chosen by the client
+            user_id: Requesting user (must own the channel)
+            keepalive_s: Yield None after this long without events (lets SSE send a ping)
+
+        Raises:
+            PermissionError: The id belongs to another user
+        """
+        with self._lock:
+            self._channel(progress_id, user_id)
+        return self._stream(progress_id, user_id, keepalive_s)
+
+    async def _stream(
+        self,
+        progress_id: str,
+        user_id: int,
+        keepalive_s: Optional[float]
+    ) -> AsyncIterator[Optional[ProgressEvent]]:
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            channel = self._channel(progress_id, user_id)
+            backlog = list(channel.history)
+            channel.subscribers.append(queue)
+        try:
+            for event in backlog:
+                yield event
+                if event.terminal:
+                    return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=keepalive_s)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                yield event
+                if event.terminal:
+                    return
+        finally:
+            with self._lock:
+                if queue in channel.subscribers:
+                    channel.subscribers.remove(queue)
+
+
+_progress_broker: Optional[ProgressBroker] = None
+_progress_broker_lock = threading.Lock()
+
+
+def get_progress_broker() -> ProgressBroker:
+    """Process-wide progress broker singleton"""
+    global _progress_broker
+    with _progress_broker_lock:
+        if _progress_broker is None:
+            _progress_broker = ProgressBroker()
+        return _progress_broker
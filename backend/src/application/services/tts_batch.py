@@ -0,0 +1,133 @@
+"""
+TTS Batch Service
+Fans out TTS generation for many beats/scenes under a bounded semaphore
+"""
+import asyncio
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from src.domain.repositories.service_repositories import ITTSRepository
+
+TTS_MAX_CONCURRENCY = int(os.getenv("TTS_MAX_CONCURRENCY", "4"))
+
+
+@dataclass
+class TTSItem:
+    """One text to synthesize"""
+    text: str
+    voice_id: str
+    style: str
+    voice_settings: Optional[dict] = None
+
+    def key(self) -> Tuple:
+        return (self.text, self.voice_id, self.style, repr(sorted((self.voice_settings or {}).items())))
+
+
+class TTSStream:
+    """
+    Starts TTS jobs as items arrive (e.g. beats streamed from the AI),
+    bounded by a semaphore, and collects them in a final order later
+    """
+
+    def __init__(self, tts: ITTSRepository, max_concurrency: int = TTS_MAX_CONCURRENCY):
+        self.tts = tts
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._tasks: Dict[Tuple, asyncio.Task] = {}
+
+    async def _run(self, item: TTSItem) -> Tuple[str, float]:
+        async with self._semaphore:
+            return await self.tts.generate_audio(
+                text=item.text,
+                voice_id=item.voice_id,
+                style=item.style,
+                voice_settings=item.voice_settings
+            )
+
+    def submit(self, item: TTSItem) -> asyncio.Task:
+        """Start generating an item now (identical items share one job)"""
+        key = item.key()
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.create_task(self._run(item))
+        return self._tasks[key]
+
+    async def gather(
+        self,
+        items: List[TTSItem],
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Wait for the given items (submitting any not started yet), in order
+
+        Jobs started for items that are not in the final list (e.g. a streamed
+        beat the final parse dropped) are cancelled and their files removed.
+
+        Args:
+            items: Texts to collect audio for
+            on_progress: Called with (done, total) each time one of the items finishes
+
+        Returns:
+            List of (audio_file_path, duration_seconds), same order as items
+        """
+        wanted = [self.submit(item) for item in items]
+        wanted_ids = {id(task) for task in wanted}
+        stale = [task for task in self._tasks.values() if id(task) not in wanted_ids]
+        if on_progress:
+            self._track(wanted, on_progress)
+        try:
+            return list(await asyncio.gather(*wanted))
+        except BaseException:
+            await self.cancel()
+            raise
+        finally:
+            await self._discard(stale)
+
+    @staticmethod
+    def _track(tasks: List[asyncio.Task], on_progress: Callable[[int, int], None]):
+        done = [sum(task.done() and not task.cancelled() for task in tasks)]
+
+        def finished(task: asyncio.Task):
+            if not task.cancelled() and task.exception() is None:
+                done[0] += 1
+                on_progress(done[0], len(tasks))
+
+        for task in tasks:
+            if not task.done():
+                task.add_done_callback(finished)
+        if done[0]:
+            on_progress(done[0], len(tasks))
+
+    async def cancel(self):
+        """Cancel every job still running"""
+        await self._discard(list(self._tasks.values()))
+
+    @staticmethod
+    async def _discard(tasks: List[asyncio.Task]):
+        for task in tasks:
+            task.cancel()
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, tuple) and os.path.exists(result[0]):
+                os.remove(result[0])
+
+
+async def generate_audio_batch(
+    tts: ITTSRepository,
+    items: List[TTSItem],
+    max_concurrency: int = TTS_MAX_CONCURRENCY,
+    on_progress: Optional[Callable[[int, int], None]] = None
+) -> List[Tuple[str, float]]:
+    """
+    Generate audio for every item concurrently, preserving input order
+
+    If any item fails, the still-running ones are cancelled and the first
+    error is raised, matching the old one-by-one loop semantics.
+
+    Args:
+        tts: TTS repository
+        items: Texts to synthesize
+        max_concurrency: Maximum requests in flight at once
+        on_progress: Called with (done, total) as items finish
+
+    Returns:
+        List of (audio_file_path, duration_seconds), same order as items
+    """
+    return await TTSStream(tts, max_concurrency).gather(items, on_progress)
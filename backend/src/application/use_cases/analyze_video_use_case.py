@@ -4,13 +4,27 @@ Orchestrates video analysis, TTS generation, audio mixing, and storage
 """
 from dataclasses import dataclass
 from typing import Optional
-from src.domain.entities.video_analysis import VideoAnalysis
+from src.domain.entities.video_analysis import Beat, VideoAnalysis
 from src.domain.repositories.service_repositories import (
     IAIRepository,
     ITTSRepository,
     IVideoRepository,
     IStorageRepository
 )
+from src.application.services.tts_batch import TTSItem, TTSStream, TTS_MAX_CONCURRENCY
+from src.application.services.beat_postprocessor import repair_analysis
+from src.application.services.progress import (
+    ProgressReporter,
+    NULL_PROGRESS,
+    STAGE_ANALYZING,
+    STAGE_BEAT,
+    STAGE_BEATS_READY,
+    STAGE_TTS,
+    STAGE_RENDERING,
+    STAGE_STORING,
+    STAGE_COMPLETED,
+    STAGE_FAILED
+)
 
 
 @dataclass
@@ -24,6 +38,9 @@ class AnalyzeVideoRequest:
     language: str = "es"
     original_volume: float = 0.0
     background_music_path: Optional[str] = None
+    background_volume: float = 0.1
+    ducking: bool = True
+    input_mode: str = "video"  # "video" or "frames" (sampled keyframes, no file upload)
     session: Optional[any] = None  # Database session for saving video record
 
 
@@ -42,8 +59,8 @@ class AnalyzeVideoUseCase:
     Use Case: Analyze video and generate narrated version
     
     This orchestrates the entire workflow:
-    1. Analyze video with AI (Gemini)
-    2. Generate TTS audio for narrative segments
+    1. Analyze video with AI (Gemini), streaming beats as they are written
+    2. Generate TTS audio for narrative segments (started per beat during step 1)
     3. Mix audio with video
     4. Upload final video to storage
     """
@@ -53,58 +70,106 @@ class AnalyzeVideoUseCase:
         ai_repository: IAIRepository,
         tts_repository: ITTSRepository,
         video_repository: IVideoRepository,
-        storage_repository: IStorageRepository
+        storage_repository: IStorageRepository,
+        tts_concurrency: int = TTS_MAX_CONCURRENCY
     ):
         self.ai = ai_repository
         self.tts = tts_repository
         self.video = video_repository
         self.storage = storage_repository
+        self.tts_concurrency = tts_concurrency
     
-    async def execute(self, request: AnalyzeVideoRequest) -> AnalyzeVideoResponse:
+    async def execute(
+        self,
+        request: AnalyzeVideoRequest,
+        progress: Optional[ProgressReporter] = None
+    ) -> AnalyzeVideoResponse:
         """
         Execute the video analysis workflow
         
         Args:
             request: Video analysis request
+            progress: Receives stage events (analysis, beats, TTS n/m, render %, upload)
             
         Returns:
             AnalyzeVideoResponse with results
         """
+        progress = progress or NULL_PROGRESS
         try:
-            # Step 1: Analyze video with AI
-            print(f"[UseCase] Step 1: Analyzing video with AI...")
-            analysis = await self.ai.analyze_video(
-                video_path=request.video_path,
-                style=request.style,
-                pace=request.pace,
-                voice_id=request.voice_id or "default",
-                language=request.language
-            )
+            progress.emit(STAGE_ANALYZING, "Analyzing video with AI")
+            # Steps 1+2: Analyze video with AI, starting TTS for each beat as it streams in
+            print(f"[UseCase] Step 1: Analyzing video with AI (streaming beats to TTS, "
+                  f"max {self.tts_concurrency} in parallel)...")
+            voice_id = request.voice_id or "default"
+            tts_stream = TTSStream(self.tts, max_concurrency=self.tts_concurrency)
+            
+            def tts_item(beat: Beat) -> TTSItem:
+                return TTSItem(
+                    text=beat.voiceover.script,  # ✅ Fixed: text instead of script
+                    voice_id=voice_id,
+                    style=request.style
+                )
+            
+            streamed = 0
+            
+            async def on_beat(beat: Beat):
+                nonlocal streamed
+                streamed += 1
+                progress.emit(STAGE_BEAT, f"Beat {streamed} ready", current=streamed)
+                if beat.voiceover and beat.voiceover.script:
+                    tts_stream.submit(tts_item(beat))
+            
+            try:
+                analysis = await self.ai.analyze_video_streaming(
+                    video_path=request.video_path,
+                    style=request.style,
+                    pace=request.pace,
+                    voice_id=voice_id,
+                    on_beat=on_beat,
+                    language=request.language,
+                    input_mode=request.input_mode
+                )
+            except BaseException:
+                await tts_stream.cancel()
+                raise
             
             if not analysis or not analysis.beats:
+                await tts_stream.cancel()
+                progress.emit(STAGE_FAILED, "AI analysis produced no beats")
                 return AnalyzeVideoResponse(
                     success=False,
                     error="AI analysis produced no beats"
                 )
             
-            # Step 2: Generate TTS audio for each beat
-            print(f"[UseCase] Step 2: Generating TTS audio for {len(analysis.beats)} beats...")
-            audio_segments = []
+            # Fix timestamps and word budgets locally so no narration runs into the next beat
+            # (TTS already started for beats whose script changed is discarded by gather)
+            repair_analysis(analysis)
             
-            for beat in analysis.beats:
-                if beat.voiceover and beat.voiceover.script:
-                    audio_path, duration = await self.tts.generate_audio(
-                        text=beat.voiceover.script,  # ✅ Fixed: text instead of script
-                        voice_id=request.voice_id or "default",
-                        style=request.style
-                    )
-                    
-                    audio_segments.append({
-                        "path": audio_path,
-                        "start_s": beat.start_s or 0.0,
-                        "duration": duration,
-                        "pause_after": beat.voiceover.pause_after_s or 0.0
-                    })
+            # Step 2: Collect TTS audio in beat order (the final analysis is authoritative)
+            narrated_beats = [
+                beat for beat in analysis.beats
+                if beat.voiceover and beat.voiceover.script
+            ]
+            progress.emit(
+                STAGE_BEATS_READY, f"{len(analysis.beats)} beats, {len(narrated_beats)} narrated",
+                current=len(analysis.beats), total=len(analysis.beats)
+            )
+            print(f"[UseCase] Step 2: Collecting TTS audio for {len(narrated_beats)} beats...")
+            
+            tts_results = await tts_stream.gather(
+                [tts_item(beat) for beat in narrated_beats],
+                on_progress=progress.counter(STAGE_TTS, len(narrated_beats), "Generating narration")
+            )
+            
+            audio_segments = [
+                {
+                    "path": audio_path,
+                    "start_s": beat.start_s or 0.0,
+                    "duration": duration,
+                    "pause_after": beat.voiceover.pause_after_s or 0.0
+                }
+                for beat, (audio_path, duration) in zip(narrated_beats, tts_results)
+            ]
             
             # Step 3: Mix audio with video
             print(f"[UseCase] Step 3: Mixing {len(audio_segments)} audio segments with video...")
@@ -114,11 +179,16 @@ class AnalyzeVideoUseCase:
                 video_path=request.video_path,
                 audio_segments=audio_segments,
                 output_path=final_video_path,
-                original_volume=request.original_volume
+                original_volume=request.original_volume,
+                background_track_path=request.background_music_path,
+                background_volume=request.background_volume,
+                ducking=request.ducking,
+                on_progress=lambda percent: progress.percent(STAGE_RENDERING, percent, "Rendering video")
             )
             
             # Step 4: Upload to storage
             print("[UseCase] Step 4: Uploading final video to storage...")
+            progress.emit(STAGE_STORING, "Uploading final video")
             import os
             filename = os.path.basename(output_path)  # ✅ Extract filename from path
             storage_url, object_name = await self.storage.upload_video(
@@ -139,22 +209,22 @@ class AnalyzeVideoUseCase:
                     storage_object_name=object_name,
                     storage_url=storage_url,
                     status='completed',
-                    voice_config={"voice_id": request.voice_id, "style": request.style},
-                    audio_config={"original_volume": request.original_volume},
+                    voice_config={"voice_id": request.voice_id, "style": request.style, "input_mode": request.input_mode},
+                    audio_config={
+                        "original_volume": request.original_volume,
+                        "background_volume": request.background_volume,
+                        "ducking": request.ducking
+                    },
                     completed_at=datetime.utcnow()
                 )
                 request.session.add(video_record)
                 await request.session.flush()
                 print(f"   ✅ Video saved to DB with ID: {video_record.id}")
             
-            # Step 6: Cleanup temp files
+            # Step 6: Cleanup temp files (the uploaded input belongs to the caller, which
+            # removes it once the result is committed or the job failed for good)
             print("[UseCase] Step 6: Cleaning up temporary files...")
             try:
-                # Remove uploaded video
-                if os.path.exists(request.video_path):
-                    os.remove(request.video_path)
-                    print(f"   ✅ Removed: {request.video_path}")
-                
                 # Remove generated audio files
                 for seg in audio_segments:
                     if os.path.exists(seg['path']):
@@ -170,6 +240,7 @@ class AnalyzeVideoUseCase:
                 print(f"   ⚠️ Cleanup warning: {cleanup_error}")
             
             print(f"[UseCase] ✅ Workflow complete! Video available at: {storage_url}")
+            progress.emit(STAGE_COMPLETED, "Video ready")
             
             return AnalyzeVideoResponse(
                 success=True,
@@ -180,6 +251,7 @@ class AnalyzeVideoUseCase:
             
         except Exception as e:
             print(f"[UseCase] ❌ Error in workflow: {str(e)}")
+            progress.emit(STAGE_FAILED, str(e))
             return AnalyzeVideoResponse(
                 success=False,
                 error=str(e)
@@ -3,8 +3,10 @@ Create Reel Use Case
 Orchestrates complete reel video creation workflow
 """
 from dataclasses import dataclass
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from pathlib import Path
+import asyncio
+import os
 import time
 import uuid
 
@@ -14,6 +16,21 @@ from src.domain.repositories.service_repositories import (
     IStorageRepository
 )
 from src.domain.repositories.image_repository import IImageRepository
+from src.application.services.tts_batch import TTSItem, generate_audio_batch, TTS_MAX_CONCURRENCY
+from src.infrastructure.concurrency import Pipeline
+from src.application.services.progress import (
+    ProgressReporter,
+    NULL_PROGRESS,
+    STAGE_TTS,
+    STAGE_IMAGES,
+    STAGE_RENDERING,
+    STAGE_STORING,
+    STAGE_COMPLETED,
+    STAGE_FAILED
+)
+
+# Scene image searches/downloads in flight at once (Pexels rate limits)
+IMAGE_MAX_CONCURRENCY = int(os.getenv("IMAGE_MAX_CONCURRENCY", "4"))
 
 
 @dataclass
@@ -41,7 +58,7 @@ class CreateReelUseCase:
     
     Workflow:
     1. Generate TTS audio for each scene
-    2. Download images from Pexels for each scene
+    2. Download images from Pexels for each scene (concurrently with step 1)
     3. Assemble video with Ken Burns effect
     4. Add background music
     5. Upload to storage
@@ -52,23 +69,33 @@ class CreateReelUseCase:
         tts_repository: ITTSRepository,
         image_repository: IImageRepository,
         video_repository: IVideoRepository,
-        storage_repository: IStorageRepository
+        storage_repository: IStorageRepository,
+        tts_concurrency: int = TTS_MAX_CONCURRENCY,
+        image_concurrency: int = IMAGE_MAX_CONCURRENCY
     ):
         self.tts = tts_repository
         self.images = image_repository
         self.video = video_repository
         self.storage = storage_repository
+        self.tts_concurrency = tts_concurrency
+        self.image_concurrency = image_concurrency
     
-    async def execute(self, request: CreateReelRequest) -> CreateReelResponse:
+    async def execute(
+        self,
+        request: CreateReelRequest,
+        progress: Optional[ProgressReporter] = None
+    ) -> CreateReelResponse:
         """
         Create reel video from script
         
         Args:
             request: Reel creation request
+            progress: Receives stage events (TTS n/m, images n/m, render %, upload)
             
         Returns:
             CreateReelResponse with video URL
         """
+        progress = progress or NULL_PROGRESS
         try:
             # Create job directory
             job_id = f"reel_{int(time.time())}_{uuid.uuid4().hex[:6]}"
@@ -79,80 +106,118 @@ class CreateReelUseCase:
             
             scenes = request.script.get('scenes', [])
             if not scenes:
+                progress.emit(STAGE_FAILED, "Script contains no scenes")
                 return CreateReelResponse(
                     success=False,
                     error="Script contains no scenes"
                 )
             
-            # Step 1 & 2: Generate audio and download images
             print(f"[CreateReel] Processing {len(scenes)} scenes...")
-            audio_map = []
-            processed_scenes = []
-            current_time = 0.0
-            
-            for i, scene in enumerate(scenes):
-                # Generate TTS
-                narration = scene.get('narration', '')
-                if narration:
-                    audio_path, duration = await self.tts.generate_audio(
-                        text=narration,
-                        voice_id=request.voice_id,
-                        style="viral"
-                    )
-                    
-                    audio_map.append({
-                        'path': audio_path,
-                        'start_s': current_time,
-                        'duration': duration
-                    })
-                    
-                    scene['duration_estimate'] = duration
-                    current_time += duration
-                
-                # Download image
-                visual_query = scene.get('visual_query')
-                image_path = job_dir / f"image_{i}.jpg"
-                
-                if visual_query:
-                    image_url = await self.images.search_image(visual_query)
-                    if image_url:
-                        await self.images.download_image(str(image_url), str(image_path))
-                        scene['image_path'] = str(image_path)
-                
-                processed_scenes.append(scene)
-            
-            # Step 3: Assemble video
-            print(f"[CreateReel] Assembling video...")
+            narrated = [i for i, scene in enumerate(scenes) if scene.get('narration', '')]
             final_filename = f"final_{job_id}.mp4"
             final_path = job_dir / final_filename
             
-            # Delegate to existing reel creation
-            from src.infrastructure.video import create_reel_video
-            
             bg_track_path = None
             if request.bg_music:
                 bg_track_path = f"src/assets/music/{request.bg_music}"
             
-            create_reel_video(
-                scenes=processed_scenes,
-                audio_map=audio_map,
-                output_path=str(final_path),
-                background_track=bg_track_path
-            )
+            # Step 1: Generate TTS for every scene concurrently (results keep scene order)
+            async def generate_tts() -> List:
+                return await generate_audio_batch(
+                    self.tts,
+                    [
+                        TTSItem(text=scenes[i]['narration'], voice_id=request.voice_id, style="viral")
+                        for i in narrated
+                    ],
+                    max_concurrency=self.tts_concurrency,
+                    on_progress=progress.counter(STAGE_TTS, len(narrated), "Generating narration")
+                )
+            
+            # Step 2: Search and download scene images (independent of TTS, so both run at once)
+            async def fetch_images() -> List[Optional[str]]:
+                semaphore = asyncio.Semaphore(max(1, self.image_concurrency))
+                images_done = progress.counter(STAGE_IMAGES, len(scenes), "Fetching images")
+                done = 0
+                
+                async def fetch(i: int, scene: dict) -> Optional[str]:
+                    nonlocal done
+                    visual_query = scene.get('visual_query')
+                    image_path = None
+                    if visual_query:
+                        async with semaphore:
+                            image_url = await self.images.search_image(visual_query)
+                            if image_url:
+                                image_path = str(job_dir / f"image_{i}.jpg")
+                                await self.images.download_image(str(image_url), image_path)
+                    done += 1
+                    images_done(done, len(scenes))
+                    return image_path
+                
+                return await asyncio.gather(*(fetch(i, scene) for i, scene in enumerate(scenes)))
+            
+            # Step 3: Lay out the timeline once narration lengths and images are known
+            def lay_out(tts: List, images: List[Optional[str]]) -> Tuple[List[Dict], List[Dict]]:
+                audio_by_scene = dict(zip(narrated, tts))
+                audio_map = []
+                current_time = 0.0
+                
+                for i, scene in enumerate(scenes):
+                    if i in audio_by_scene:
+                        audio_path, duration = audio_by_scene[i]
+                        
+                        audio_map.append({
+                            'path': audio_path,
+                            'start_s': current_time,
+                            'duration': duration
+                        })
+                        
+                        scene['duration_estimate'] = duration
+                        current_time += duration
+                    
+                    if images[i]:
+                        scene['image_path'] = images[i]
+                
+                return scenes, audio_map
+            
+            # Step 4: Assemble video (rendered in the process pool, so the event loop keeps serving requests)
+            async def render(layout: Tuple[List[Dict], List[Dict]]) -> str:
+                print(f"[CreateReel] Assembling video...")
+                processed_scenes, audio_map = layout
+                return await self.video.create_reel(
+                    scenes=processed_scenes,
+                    audio_map=audio_map,
+                    output_path=str(final_path),
+                    background_track_path=bg_track_path,
+                    on_progress=lambda percent: progress.percent(STAGE_RENDERING, percent, "Rendering reel")
+                )
+            
+            # Step 5: Upload to storage
+            async def store(render: str) -> Tuple[str, str]:
+                print(f"[CreateReel] Uploading to storage...")
+                progress.emit(STAGE_STORING, "Uploading final video")
+                return await self.storage.upload_video(
+                    file_path=render,
+                    user_id=request.user_id,
+                    filename=final_filename
+                )
             
-            # Step 4: Upload to storage
-            print(f"[CreateReel] Uploading to storage...")
-            storage_url, object_name = await self.storage.upload_video(
-                file_path=str(final_path),
-                user_id=request.user_id,
-                filename=final_filename
+            stages = await (
+                Pipeline("reel")
+                .stage("tts", generate_tts)
+                .stage("images", fetch_images)
+                .stage("layout", lay_out, needs=("tts", "images"))
+                .stage("render", render, needs=("layout",))
+                .stage("store", store, needs=("render",))
+                .run()
             )
+            print(f"[CreateReel] ⏱️ Stages: {stages.summary()}")
+            _, audio_map = stages["layout"]
+            storage_url, object_name = stages["store"]
             
-            # Step 5: Cleanup ALL temporary files
+            # Step 6: Cleanup ALL temporary files
             print(f"[CreateReel] Cleaning up temporary files...")
             try:
                 import shutil
-                import os
                 
                 # Remove audio files (may be outside job_dir in outputs/)
                 for audio_info in audio_map:
@@ -170,6 +235,7 @@ class CreateReelUseCase:
                 print(f"[CreateReel] ⚠️ Cleanup warning: {e}")
             
             print(f"[CreateReel] ✅ Reel created successfully!")
+            progress.emit(STAGE_COMPLETED, "Reel ready")
             
             return CreateReelResponse(
                 success=True,
@@ -179,6 +245,7 @@ class CreateReelUseCase:
             
         except Exception as e:
             print(f"[CreateReel] ❌ Error: {str(e)}")
+            progress.emit(STAGE_FAILED, str(e))
             import traceback
             traceback.print_exc()
             return CreateReelResponse(
@@ -51,8 +51,11 @@ class GenerateReelScriptUseCase:
             
             # Delegate to AI repository (wraps core.content_generator)
             from src.infrastructure.ai.content_generator import generate_reels_script
+            from src.infrastructure.concurrency import run_blocking
             
-            script = generate_reels_script(
+            script = await run_blocking(
+                "gemini",
+                generate_reels_script,
                 topic=request.topic,
                 style=request.style
             )
@@ -55,3 +55,4 @@ class VideoAnalysis(BaseModel):
     visual_timeline: List[VisualBeat] = Field(default_factory=list)  # Raw visual analysis
     beats: List[Beat] = Field(default_factory=list)  # Final narrated beats
     final_cta: Optional[str] = None
+    words_per_second: Optional[float] = None  # Calibrated TTS speed the word budgets were based on
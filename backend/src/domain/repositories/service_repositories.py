@@ -3,8 +3,8 @@ Repository interfaces - Abstract contracts for external services
 Following the Dependency Inversion Principle
 """
 from abc import ABC, abstractmethod
-from typing import Tuple, Optional
-from src.domain.entities.video_analysis import VideoAnalysis
+from typing import Awaitable, Callable, Tuple, Optional
+from src.domain.entities.video_analysis import Beat, VideoAnalysis
 
 
 class IAIRepository(ABC):
@@ -17,7 +17,8 @@ class IAIRepository(ABC):
         style: str,
         pace: str,
         voice_id: str,
-        language: str = "es"
+        language: str = "es",
+        input_mode: str = "video"
     ) -> VideoAnalysis:
         """
         Analyze video and generate narrative structure
@@ -28,11 +29,45 @@ class IAIRepository(ABC):
             pace: Narrative pace (slow, medium, fast)
             voice_id: Voice identifier for TTS
             language: Target language
+            input_mode: "video" (send the whole video) or "frames" (sampled keyframes inline)
             
         Returns:
             VideoAnalysis with beats and narrative
         """
         pass
+    
+    async def analyze_video_streaming(
+        self,
+        video_path: str,
+        style: str,
+        pace: str,
+        voice_id: str,
+        on_beat: Callable[[Beat], Awaitable[None]],
+        language: str = "es",
+        input_mode: str = "video"
+    ) -> VideoAnalysis:
+        """
+        Analyze video, calling on_beat for each beat as soon as it is available
+        
+        Implementations that cannot stream fall back to this default, which
+        emits every beat after the full analysis returns.
+        
+        Args:
+            video_path: Path to video file
+            style: Narrative style (viral, documentary, etc.)
+            pace: Narrative pace (slow, medium, fast)
+            voice_id: Voice identifier for TTS
+            on_beat: Async callback receiving each completed beat
+            language: Target language
+            input_mode: "video" or "frames" (see analyze_video)
+            
+        Returns:
+            The complete VideoAnalysis (authoritative over the streamed beats)
+        """
+        analysis = await self.analyze_video(video_path, style, pace, voice_id, language, input_mode)
+        for beat in analysis.beats:
+            await on_beat(beat)
+        return analysis
 
 
 class ITTSRepository(ABC):
@@ -70,7 +105,11 @@ class IVideoRepository(ABC):
         video_path: str,
         audio_segments: list,
         output_path: str,
-        original_volume: float = 0.0
+        original_volume: float = 0.0,
+        background_track_path: Optional[str] = None,
+        background_volume: float = 0.1,
+        ducking: bool = True,
+        on_progress: Optional[Callable[[float], None]] = None
     ) -> str:
         """
         Mix audio tracks with video
@@ -80,6 +119,34 @@ class IVideoRepository(ABC):
             audio_segments: List of audio segments with timing
             output_path: Path for output video
             original_volume: Original audio volume (0.0-1.0)
+            background_track_path: Optional background music file
+            background_volume: Background music volume (0.0-1.0)
+            ducking: Lower music and original audio under the narration
+            on_progress: Optional callback with the render percent (0-100)
+            
+        Returns:
+            Path to final video file
+        """
+        pass
+    
+    @abstractmethod
+    async def create_reel(
+        self,
+        scenes: list,
+        audio_map: list,
+        output_path: str,
+        background_track_path: Optional[str] = None,
+        on_progress: Optional[Callable[[float], None]] = None
+    ) -> str:
+        """
+        Assemble a vertical reel from scene images and narration audio
+        
+        Args:
+            scenes: Scenes with image paths and durations
+            audio_map: Audio segments with timing
+            output_path: Path for output video
+            background_track_path: Optional background music file
+            on_progress: Optional callback with the render percent (0-100)
             
         Returns:
             Path to final video file
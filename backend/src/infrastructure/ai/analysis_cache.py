@@ -0,0 +1,168 @@
+"""
+Analysis Result Cache
+Persists VideoAnalysis results in Postgres (JSONB) keyed by everything that
+shapes the model output, so identical re-submissions skip Gemini entirely.
+"""
+import os
+import json
+import hashlib
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from src.domain.entities.video_analysis import VideoAnalysis
+
+ANALYSIS_CACHE_ENABLED = os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() == "true"
+ANALYSIS_CACHE_TTL_HOURS = float(os.getenv("ANALYSIS_CACHE_TTL_HOURS", "168"))
+# Calibrated WPS values closer than this produce the same word budget for practical purposes
+WPS_BUCKET_SIZE = 0.25
+
+
+def wps_bucket(words_per_sec: float) -> float:
+    """Round a calibrated WPS to its cache bucket"""
+    return round(round(words_per_sec / WPS_BUCKET_SIZE) * WPS_BUCKET_SIZE, 2)
+
+
+def make_analysis_key(
+    video_hash: str,
+    style: str,
+    pace: str,
+    language: str,
+    words_per_sec: float,
+    prompt_version: str
+) -> Dict:
+    """
+    Build the cache parameters for one analysis
+
+    Args:
+        video_hash: SHA-256 of the video content
+        style: Narrative style
+        pace: Narrative pace
+        language: Target language
+        words_per_sec: Calibrated WPS of the voice (bucketed)
+        prompt_version: Version of the prompt + model that produced the result
+
+    Returns:
+        Dict with the parameters and their SHA-256 under 'cache_key'
+    """
+    params = {
+        "video_hash": video_hash,
+        "style": style,
+        "pace": pace,
+        "language": language,
+        "wps_bucket": wps_bucket(words_per_sec),
+        "prompt_version": prompt_version,
+    }
+    payload = json.dumps(params, sort_keys=True)
+    return {**params, "cache_key": hashlib.sha256(payload.encode("utf-8")).hexdigest()}
+
+
+def make_timeline_key(video_hash: str, prompt_version: str) -> Dict:
+    """
+    Cache parameters for a two-stage visual timeline (independent of style/pace/language)
+
+    Returns:
+        Dict with the parameters and their SHA-256 under 'cache_key'
+    """
+    params = {
+        "video_hash": video_hash,
+        "stage": "visual_timeline",
+        "prompt_version": prompt_version,
+    }
+    payload = json.dumps(params, sort_keys=True)
+    return {**params, "cache_key": hashlib.sha256(payload.encode("utf-8")).hexdigest()}
+
+
+class AnalysisCache:
+    """Postgres-backed cache of VideoAnalysis results with TTL eviction"""
+
+    def __init__(self, ttl_hours: float = ANALYSIS_CACHE_TTL_HOURS):
+        self.ttl = timedelta(hours=ttl_hours)
+
+    async def get(self, key: Dict) -> Optional[VideoAnalysis]:
+        """
+        Look up a cached analysis
+
+        Returns:
+            VideoAnalysis on a live hit, None on miss, expiry or database error
+        """
+        from sqlalchemy import update
+        from src.infrastructure.database.database import async_session_maker, AnalysisCacheEntry
+
+        try:
+            async with async_session_maker() as session:
+                entry = await session.get(AnalysisCacheEntry, key["cache_key"])
+                if entry is None or entry.expires_at <= datetime.utcnow():
+                    return None
+
+                await session.execute(
+                    update(AnalysisCacheEntry)
+                    .where(AnalysisCacheEntry.cache_key == key["cache_key"])
+                    .values(hit_count=AnalysisCacheEntry.hit_count + 1)
+                )
+                await session.commit()
+                return VideoAnalysis(**entry.result)
+        except Exception as e:
+            print(f"   ⚠️ Analysis cache lookup failed: {e}")
+            return None
+
+    async def has_video(self, video_hash: str) -> bool:
+        """
+        Whether any live entry (analysis or visual timeline) exists for a video
+
+        Cheap pre-check that needs only the content hash: a video never seen
+        before cannot hit, so its upload can start before the exact key is known.
+        Returns True on database errors so callers don't speculate blindly.
+        """
+        from sqlalchemy import select
+        from src.infrastructure.database.database import async_session_maker, AnalysisCacheEntry
+
+        try:
+            async with async_session_maker() as session:
+                found = await session.execute(
+                    select(AnalysisCacheEntry.cache_key)
+                    .where(AnalysisCacheEntry.video_hash == video_hash,
+                           AnalysisCacheEntry.expires_at > datetime.utcnow())
+                    .limit(1)
+                )
+                return found.first() is not None
+        except Exception as e:
+            print(f"   ⚠️ Analysis cache lookup failed: {e}")
+            return True
+
+    async def put(self, key: Dict, analysis: VideoAnalysis):
+        """Store (or refresh) a result; failures are logged and ignored"""
+        from src.infrastructure.database.database import async_session_maker, AnalysisCacheEntry
+
+        now = datetime.utcnow()
+        params = {k: v for k, v in key.items() if k != "cache_key"}
+        try:
+            async with async_session_maker() as session:
+                await session.merge(AnalysisCacheEntry(
+                    cache_key=key["cache_key"],
+                    video_hash=key["video_hash"],
+                    params=params,
+                    result=analysis.dict(),
+                    hit_count=0,
+                    created_at=now,
+                    expires_at=now + self.ttl
+                ))
+                await session.commit()
+        except Exception as e:
+            print(f"   ⚠️ Analysis cache store failed: {e}")
+
+    async def purge_expired(self) -> int:
+        """
+        Delete expired entries
+
+        Returns:
+            Number of rows removed
+        """
+        from sqlalchemy import delete
+        from src.infrastructure.database.database import async_session_maker, AnalysisCacheEntry
+
+        async with async_session_maker() as session:
+            result = await session.execute(
+                delete(AnalysisCacheEntry).where(AnalysisCacheEntry.expires_at <= datetime.utcnow())
+            )
+            await session.commit()
+            return result.rowcount or 0
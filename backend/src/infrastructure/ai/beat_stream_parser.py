@@ -0,0 +1,107 @@
+"""
+Beat Stream Parser
+Incremental, tolerant JSON scanner for streamed Gemini responses: emits each
+object of the "beats" array as soon as its closing brace arrives.
+"""
+import json
+from typing import Dict, List, Optional
+
+# Keys the model uses for the beats array ("scenes" is accepted by parse_analysis_response too)
+BEAT_ARRAY_KEYS = ("beats", "scenes")
+
+
+class BeatStreamParser:
+    """
+    Feed it text chunks; it returns the beat dicts completed by each chunk
+
+    It only tracks string/escape state and bracket depth, so markdown fences,
+    text before the JSON or a truncated tail do not break beats already seen.
+    """
+
+    def __init__(self, array_keys=BEAT_ARRAY_KEYS):
+        self.array_keys = array_keys
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # String literal being read, used to recognise the array key
+        self._string_start: Optional[int] = None
+        self._last_string: Optional[str] = None
+        # Depth of the beats array ("[" already consumed), None until found
+        self._array_depth: Optional[int] = None
+        self._array_done = False
+        self._object_start: Optional[int] = None
+        self._expect_array = False
+        self.emitted = 0
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """
+        Consume a chunk of streamed text
+
+        Returns:
+            Beat dicts whose objects closed inside this chunk, in order
+        """
+        self.text += chunk
+        beats = []
+        text = self.text
+
+        while self._pos < len(text):
+            ch = text[self._pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start + 1:self._pos]
+                self._pos += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = self._pos
+            elif ch == ":":
+                # `"beats": [` - the next "[" opens the array we stream
+                self._expect_array = not self._array_done and self._last_string in self.array_keys
+            elif ch in "{[":
+                self._depth += 1
+                if ch == "[" and self._expect_array:
+                    self._array_depth = self._depth
+                elif ch == "{" and self._array_depth is not None and self._depth == self._array_depth + 1:
+                    self._object_start = self._pos
+                self._expect_array = False
+            elif ch in "}]":
+                if ch == "}" and self._object_start is not None and self._depth == self._array_depth + 1:
+                    beat = self._decode(text[self._object_start:self._pos + 1])
+                    if beat is not None:
+                        beats.append(beat)
+                    self._object_start = None
+                elif ch == "]" and self._array_depth is not None and self._depth == self._array_depth:
+                    # Array closed: ignore any later arrays with the same key
+                    self._array_depth = None
+                    self._array_done = True
+                self._depth -= 1
+            elif not ch.isspace():
+                self._expect_array = False
+
+            self._pos += 1
+
+        self.emitted += len(beats)
+        return beats
+
+    @staticmethod
+    def _decode(fragment: str) -> Optional[Dict]:
+        """Parse one beat object, skipping it if the model produced invalid JSON"""
+        try:
+            value = json.loads(fragment)
+        except ValueError:
+            # Tolerate trailing commas, the most common streaming glitch
+            try:
+                value = json.loads(fragment.replace(",}", "}").replace(",]", "]"))
+            except ValueError:
+                print(f"   ⚠️ Skipping malformed streamed beat: {fragment[:80]}...")
+                return None
+        return value if isinstance(value, dict) else None
@@ -0,0 +1,160 @@
+"""
+Chunked Long-Video Analysis
+Analyzes the first chunk to establish characters and tone, then the rest
+concurrently, and merges everything into one VideoAnalysis on the source timeline.
+"""
+import os
+import asyncio
+from typing import Awaitable, Callable, List, Optional
+
+from src.domain.entities.video_analysis import Beat, Overall, VideoAnalysis
+from src.infrastructure.video.chunker import VideoChunk
+
+GEMINI_CHUNK_CONCURRENCY = int(os.getenv("GEMINI_CHUNK_CONCURRENCY", "4"))
+# Extra attempts for a chunk that comes back without beats
+GEMINI_CHUNK_RETRIES = int(os.getenv("GEMINI_CHUNK_RETRIES", "1"))
+
+
+class ChunkAnalysisError(Exception):
+    """A chunk still had no beats after its retries; a merge without it would leave a hole"""
+
+
+def build_continuity_context(chunk: VideoChunk, total_chunks: int, first: Optional[VideoAnalysis]) -> str:
+    """Prompt block telling the model which part it sees and which names are already in use"""
+    lines = [
+        f"Este video es la PARTE {chunk.index + 1} de {total_chunks} de un video más largo "
+        f"(empieza en el segundo {chunk.start_s:.1f} del original).",
+        "Usa timestamps relativos a ESTA parte (empezando en 0.0).",
+    ]
+    if chunk.index > 0:
+        lines.append("NO escribas una introducción: la historia ya empezó en las partes anteriores.")
+    if chunk.index < total_chunks - 1:
+        lines.append("NO cierres la historia: continúa en la siguiente parte.")
+    if first and first.overall and first.overall.full_narrative_script:
+        lines.append(
+            "Narrativa de la PARTE 1 (mantén EXACTAMENTE los mismos nombres de personajes y el tono):\n"
+            f"{first.overall.full_narrative_script}"
+        )
+    return "\n".join(lines)
+
+
+def rebase_beat(beat: Beat, offset_s: float, chunk_end_s: float) -> Beat:
+    """Shift a chunk-relative beat onto the source timeline"""
+    rebased = beat.copy(deep=True)
+    if rebased.start_s is not None:
+        rebased.start_s = round(min(rebased.start_s + offset_s, chunk_end_s), 3)
+    if rebased.end_s is not None:
+        rebased.end_s = round(min(rebased.end_s + offset_s, chunk_end_s), 3)
+    return rebased
+
+
+def merge_chunk_analyses(chunks: List[VideoChunk], analyses: List[VideoAnalysis]) -> VideoAnalysis:
+    """
+    Merge per-chunk analyses into one VideoAnalysis
+
+    Beats and visual timeline entries are rebased by each chunk's start time
+    and renumbered; the overall hook/tone come from the first chunk and the
+    full narrative is the concatenation of every chunk's narrative.
+    """
+    beats = []
+    timeline = []
+    narratives = []
+    for chunk, analysis in zip(chunks, analyses):
+        for beat in analysis.beats:
+            rebased = rebase_beat(beat, chunk.start_s, chunk.end_s)
+            rebased.id = len(beats) + 1
+            beats.append(rebased)
+        for entry in analysis.visual_timeline:
+            shifted = entry.copy(update={
+                "id": len(timeline) + 1,
+                "start_s": entry.start_s + chunk.start_s,
+                "end_s": min(entry.end_s + chunk.start_s, chunk.end_s),
+            })
+            timeline.append(shifted)
+        if analysis.overall and analysis.overall.full_narrative_script:
+            narratives.append(analysis.overall.full_narrative_script.strip())
+
+    first = analyses[0] if analyses else VideoAnalysis()
+    overall = (first.overall or Overall()).copy(update={"full_narrative_script": " ".join(narratives)})
+    return VideoAnalysis(
+        language=first.language,
+        duration_s=chunks[-1].end_s if chunks else 0.0,
+        overall=overall,
+        visual_timeline=timeline,
+        beats=beats,
+        final_cta=analyses[-1].final_cta if analyses else None
+    )
+
+
+async def analyze_chunks(
+    chunks: List[VideoChunk],
+    analyze_chunk: Callable[[VideoChunk, str, Optional[Callable[[Beat], Awaitable[None]]]], Awaitable[VideoAnalysis]],
+    on_beat: Optional[Callable[[Beat], Awaitable[None]]] = None,
+    max_concurrency: int = GEMINI_CHUNK_CONCURRENCY,
+    retries: int = GEMINI_CHUNK_RETRIES
+) -> VideoAnalysis:
+    """
+    Analyze chunk 1, then the remaining chunks concurrently with its names as context
+
+    The analyzer reports Gemini errors as an empty VideoAnalysis, so a chunk
+    without beats is retried; if it still has none the whole analysis fails
+    rather than merging (and caching) narration with a gap in it.
+
+    Args:
+        chunks: Chunks from chunk_long_video
+        analyze_chunk: Coroutine (chunk, continuity_context, on_beat) -> chunk-relative VideoAnalysis
+        on_beat: Optional callback, receives beats already rebased to the source timeline
+        max_concurrency: Maximum chunks analyzed at once
+        retries: Extra attempts per chunk that comes back without beats
+
+    Returns:
+        Merged VideoAnalysis covering every chunk
+
+    Raises:
+        ChunkAnalysisError: A chunk produced no beats after its retries
+    """
+    def rebased_callback(chunk: VideoChunk):
+        if on_beat is None:
+            return None
+
+        async def forward(beat: Beat):
+            await on_beat(rebase_beat(beat, chunk.start_s, chunk.end_s))
+        return forward
+
+    total = len(chunks)
+
+    async def analyze_with_retries(chunk: VideoChunk, first: Optional[VideoAnalysis]) -> VideoAnalysis:
+        context = build_continuity_context(chunk, total, first)
+        for attempt in range(1, retries + 2):
+            analysis = await analyze_chunk(chunk, context, rebased_callback(chunk))
+            if analysis.beats:
+                return analysis
+            print(f"   ⚠️ Chunk {chunk.index + 1}/{total} returned no beats (attempt {attempt}/{retries + 1})")
+        raise ChunkAnalysisError(
+            f"Chunk {chunk.index + 1}/{total} ({chunk.start_s:.0f}s-{chunk.end_s:.0f}s) "
+            f"produced no beats after {retries + 1} attempts"
+        )
+
+    print(f"   🧩 Analyzing chunk 1/{total} to establish characters...")
+    first = await analyze_with_retries(chunks[0], None)
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(chunk: VideoChunk) -> VideoAnalysis:
+        async with semaphore:
+            print(f"   🧩 Analyzing chunk {chunk.index + 1}/{total} ({chunk.start_s:.0f}s-{chunk.end_s:.0f}s)...")
+            return await analyze_with_retries(chunk, first)
+
+    tasks = [asyncio.create_task(run(chunk)) for chunk in chunks[1:]]
+    try:
+        rest = await asyncio.gather(*tasks)
+    except BaseException:
+        # One chunk failing fails the analysis: don't keep paying for the others
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    merged = merge_chunk_analyses(chunks, [first, *rest])
+    print(f"   🧩 Merged {total} chunks into {len(merged.beats)} beats")
+    return merged
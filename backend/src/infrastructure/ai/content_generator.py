@@ -3,47 +3,29 @@ import os
 import json
 import re
 from typing import List, Dict, Optional
-from pathlib import Path
 from dotenv import load_dotenv
+from src.infrastructure.ai.prompt_registry import get_prompt_registry
 
 load_dotenv()
 
 # Configure API
 genai.configure(api_key=os.environ.get("GOOGLE_API_KEY"))
 
-# Prompts directory (in src/prompts - sibling of infrastructure)
-PROMPTS_DIR = Path(__file__).parent.parent.parent / "prompts"
-
 def load_prompt(category: str, name: str) -> str:
-    """Load a prompt from external .txt file"""
-    path = PROMPTS_DIR / category / f"{name}.txt"
-    if path.exists():
-        return path.read_text(encoding="utf-8")
-    print(f"⚠️ Prompt not found: {path}")
-    return ""
+    """Load a prompt from external .txt file (compiled once, reloaded when the file changes)"""
+    try:
+        return get_prompt_registry().get(category, name).text
+    except FileNotFoundError as e:
+        print(f"⚠️ Prompt not found: {e.filename}")
+        return ""
 
 def load_styles() -> Dict[str, str]:
     """Load style definitions from styles.txt"""
-    styles = {}
-    content = load_prompt("reels", "styles")
-    
-    current_style = None
-    current_desc = []
-    
-    for line in content.split("\n"):
-        if line.startswith("[") and line.endswith("]"):
-            if current_style and current_desc:
-                styles[current_style] = " ".join(current_desc).strip()
-            current_style = line[1:-1]
-            current_desc = []
-        elif current_style and line.strip():
-            current_desc.append(line.strip())
-    
-    # Add last style
-    if current_style and current_desc:
-        styles[current_style] = " ".join(current_desc).strip()
-    
-    return styles
+    try:
+        return get_prompt_registry().sections("reels", "styles")
+    except FileNotFoundError as e:
+        print(f"⚠️ Prompt not found: {e.filename}")
+        return {}
 
 def clean_json_response(text: str) -> str:
     """Cleans markdown code blocks and fixes common JSON issues."""
@@ -111,16 +93,17 @@ def generate_reels_script(topic: str, style: str = "curious", duration_seconds:
         generation_config={"response_mime_type": "application/json", "temperature": 0.7}
     )
 
-    # Load prompts from external files
+    # Prompts are compiled once by the registry (prompts/reels/*.txt)
+    registry = get_prompt_registry()
     system_role = load_prompt("reels", "system_prompt")
-    prompt_template = load_prompt("reels", "script_generation")
     
     # Load styles from file
     style_instructions = load_styles()
     selected_style = style_instructions.get(style, style_instructions.get("curious", ""))
     
     # Build full prompt from template
-    prompt = f"{system_role}\n\n{prompt_template}".format(
+    prompt = f"{system_role}\n\n" + registry.render(
+        "reels", "script_generation",
         topic=topic,
         duration=duration_seconds,
         style_description=selected_style
@@ -0,0 +1,345 @@
+"""
+Gemini Context Cache
+Registers the static part of a system prompt (rules, schema, examples) with
+Gemini context caching so each request only sends its small dynamic suffix.
+Caches are keyed by model name + prompt version and recreated when they expire.
+The backend is injectable: GeminiContextCacheBackend talks to the API,
+FakeContextCacheBackend keeps everything in memory for local runs.
+"""
+import os
+import time
+import asyncio
+import datetime
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import google.generativeai as genai
+
+from src.infrastructure.concurrency import run_blocking
+
+GEMINI_CONTEXT_CACHE_ENABLED = os.getenv("GEMINI_CONTEXT_CACHE_ENABLED", "true").lower() == "true"
+GEMINI_CONTEXT_CACHE_TTL_S = int(os.getenv("GEMINI_CONTEXT_CACHE_TTL_S", "3600"))
+# "gemini" (API context caching) or "fake" (in-memory, no network)
+GEMINI_CONTEXT_CACHE_BACKEND = os.getenv("GEMINI_CONTEXT_CACHE_BACKEND", "gemini")
+# Recreate a cache this long before it expires so in-flight requests never hit a deleted one
+CONTEXT_CACHE_EXPIRY_MARGIN_S = 120
+# After a failed creation (e.g. prompt below the model's minimum cacheable size) don't retry for a while
+CONTEXT_CACHE_RETRY_AFTER_S = 600
+CONTEXT_CACHE_DISPLAY_PREFIX = "narrator"
+# Gemini refuses to cache content below a per-model token minimum; smaller prefixes are
+# sent inline without ever calling the caching API
+GEMINI_CONTEXT_CACHE_MIN_TOKENS = int(os.getenv("GEMINI_CONTEXT_CACHE_MIN_TOKENS", "1024"))
+CONTEXT_CACHE_MIN_TOKENS_BY_MODEL = {
+    "gemini-2.5-pro": 4096,
+    "gemini-3-pro": 4096,
+}
+# Conservative chars-per-token estimate (prompts are mostly Spanish/JSON text)
+CONTEXT_CACHE_CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class CachedPrefix:
+    """A registered static prompt prefix"""
+    key: str
+    name: str
+    model_name: str
+    expires_at: float
+    handle: Any = None
+
+
+class ContextCacheBackend(ABC):
+    """Storage for cached prompt prefixes"""
+
+    @abstractmethod
+    def create(self, key: str, model_name: str, system_instruction: str, ttl_s: int) -> CachedPrefix:
+        """Register system_instruction as a cached prefix for model_name"""
+
+    @abstractmethod
+    def find(self, key: str, model_name: str) -> Optional[CachedPrefix]:
+        """Existing prefix for this key (e.g. created by another worker), if any"""
+
+    @abstractmethod
+    def delete(self, prefix: CachedPrefix):
+        """Remove a cached prefix"""
+
+    @abstractmethod
+    def model_for(self, prefix: CachedPrefix, generation_config: Dict):
+        """Generative model that uses the cached prefix as its system instruction"""
+
+
+class GeminiContextCacheBackend(ContextCacheBackend):
+    """Gemini API context caching (genai.caching.CachedContent)"""
+
+    def create(self, key: str, model_name: str, system_instruction: str, ttl_s: int) -> CachedPrefix:
+        from google.generativeai import caching
+
+        cached = caching.CachedContent.create(
+            model=model_name,
+            display_name=f"{CONTEXT_CACHE_DISPLAY_PREFIX}-{key}",
+            system_instruction=system_instruction,
+            ttl=datetime.timedelta(seconds=ttl_s)
+        )
+        return self._to_prefix(key, model_name, cached)
+
+    def find(self, key: str, model_name: str) -> Optional[CachedPrefix]:
+        from google.generativeai import caching
+
+        display_name = f"{CONTEXT_CACHE_DISPLAY_PREFIX}-{key}"
+        for cached in caching.CachedContent.list():
+            if cached.display_name == display_name and cached.model.endswith(model_name):
+                return self._to_prefix(key, model_name, cached)
+        return None
+
+    def delete(self, prefix: CachedPrefix):
+        prefix.handle.delete()
+
+    def model_for(self, prefix: CachedPrefix, generation_config: Dict):
+        return genai.GenerativeModel.from_cached_content(
+            cached_content=prefix.handle,
+            generation_config=generation_config
+        )
+
+    @staticmethod
+    def _to_prefix(key: str, model_name: str, cached) -> CachedPrefix:
+        return CachedPrefix(
+            key=key,
+            name=cached.name,
+            model_name=model_name,
+            expires_at=cached.expire_time.timestamp(),
+            handle=cached
+        )
+
+
+class FakeGenerativeModel:
+    """Stand-in model for FakeContextCacheBackend: records requests, answers with a canned text"""
+
+    @dataclass
+    class Response:
+        text: str
+
+    def __init__(self, prefix: CachedPrefix, generation_config: Dict, response_text: str):
+        self.prefix = prefix
+        self.generation_config = generation_config
+        self.response_text = response_text
+        self.requests: List[Any] = []
+
+    def generate_content(self, contents, **kwargs):
+        self.requests.append(contents)
+        return self.Response(self.response_text)
+
+    async def generate_content_async(self, contents, stream: bool = False, **kwargs):
+        self.requests.append(contents)
+        if not stream:
+            return self.Response(self.response_text)
+
+        async def chunks():
+            for i in range(0, len(self.response_text), 64):
+                yield self.Response(self.response_text[i:i + 64])
+        return chunks()
+
+
+@dataclass
+class FakeContextCacheBackend(ContextCacheBackend):
+    """In-memory backend: exercises the cache lifecycle without calling Gemini"""
+    response_text: str = '{"beats": []}'
+    min_chars: int = 0
+    entries: Dict[str, CachedPrefix] = field(default_factory=dict)
+    created: int = 0
+    deleted: int = 0
+
+    def create(self, key: str, model_name: str, system_instruction: str, ttl_s: int) -> CachedPrefix:
+        if len(system_instruction) < self.min_chars:
+            raise ValueError(f"Cached content too small ({len(system_instruction)} < {self.min_chars} chars)")
+        self.created += 1
+        prefix = CachedPrefix(
+            key=key,
+            name=f"cachedContents/fake-{self.created}",
+            model_name=model_name,
+            expires_at=time.time() + ttl_s,
+            handle=system_instruction
+        )
+        self.entries[prefix.name] = prefix
+        return prefix
+
+    def find(self, key: str, model_name: str) -> Optional[CachedPrefix]:
+        for prefix in self.entries.values():
+            if prefix.key == key and prefix.model_name == model_name and prefix.expires_at > time.time():
+                return prefix
+        return None
+
+    def delete(self, prefix: CachedPrefix):
+        if self.entries.pop(prefix.name, None) is not None:
+            self.deleted += 1
+
+    def model_for(self, prefix: CachedPrefix, generation_config: Dict):
+        return FakeGenerativeModel(prefix, generation_config, self.response_text)
+
+
+class ContextCacheManager:
+    """Hands out models bound to a cached static prefix, creating/refreshing caches on demand"""
+
+    def __init__(
+        self,
+        backend: Optional[ContextCacheBackend] = None,
+        ttl_s: int = GEMINI_CONTEXT_CACHE_TTL_S,
+        enabled: bool = GEMINI_CONTEXT_CACHE_ENABLED,
+        min_tokens: Optional[int] = None
+    ):
+        self.backend = backend or self._default_backend()
+        self.ttl_s = ttl_s
+        self.enabled = enabled
+        # None: the model's own minimum (CONTEXT_CACHE_MIN_TOKENS_BY_MODEL)
+        self.min_tokens = min_tokens
+        self._too_small: set = set()
+        self._prefixes: Dict[str, CachedPrefix] = {}
+        self._failed_until: Dict[str, float] = {}
+        # One creation per key at a time; concurrent jobs share it. Dropped once the
+        # creation settles (waiters keep their reference and find the new prefix)
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _default_backend() -> ContextCacheBackend:
+        if GEMINI_CONTEXT_CACHE_BACKEND == "fake":
+            return FakeContextCacheBackend()
+        return GeminiContextCacheBackend()
+
+    @staticmethod
+    def make_key(model_name: str, prompt_version: str) -> str:
+        return f"{model_name.replace('/', '_')}-{prompt_version}"
+
+    def min_tokens_for(self, model_name: str) -> int:
+        """Smallest prefix (in tokens) the model accepts for context caching"""
+        if self.min_tokens is not None:
+            return self.min_tokens
+        base_name = model_name.split("/")[-1]
+        for prefix, minimum in CONTEXT_CACHE_MIN_TOKENS_BY_MODEL.items():
+            if base_name.startswith(prefix):
+                return minimum
+        return GEMINI_CONTEXT_CACHE_MIN_TOKENS
+
+    def _cacheable(self, key: str, model_name: str, prefix_text: str) -> bool:
+        """False (logged once per key) when the prefix is below the model's caching minimum"""
+        if key in self._too_small:
+            return False
+        estimated_tokens = len(prefix_text) // CONTEXT_CACHE_CHARS_PER_TOKEN
+        minimum = self.min_tokens_for(model_name)
+        if estimated_tokens >= minimum:
+            return True
+        self._too_small.add(key)
+        print(f"   🧊 Prompt prefix too small for context caching (~{estimated_tokens} < {minimum} tokens), "
+              f"sending full prompt for {key}")
+        return False
+
+    async def get_model(self, model_name: str, prompt_version: str, prefix_text: str, generation_config: Dict):
+        """
+        Model whose system instruction is the cached prefix
+
+        Args:
+            model_name: Gemini model
+            prompt_version: Hash of the templates that produced prefix_text
+            prefix_text: Static system prompt to cache
+            generation_config: Generation settings for the returned model
+
+        Returns:
+            Model bound to the cache, or None when caching is disabled/unavailable
+            (the caller then sends the full system prompt)
+        """
+        if not self.enabled:
+            return None
+
+        key = self.make_key(model_name, prompt_version)
+        if not self._cacheable(key, model_name, prefix_text):
+            return None
+        if self._failed_until.get(key, 0.0) > time.time():
+            return None
+
+        prefix = self._valid(key)
+        if prefix is None:
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                prefix = self._valid(key)
+                if prefix is None:
+                    prefix = await self._create(key, model_name, prefix_text)
+                    # Valid prefix or failure backoff now answers this key without the lock
+                    self._locks.pop(key, None)
+                    if prefix is None:
+                        return None
+                    return self.backend.model_for(prefix, generation_config)
+
+        self.hits += 1
+        return self.backend.model_for(prefix, generation_config)
+
+    def _valid(self, key: str) -> Optional[CachedPrefix]:
+        prefix = self._prefixes.get(key)
+        if prefix and prefix.expires_at - CONTEXT_CACHE_EXPIRY_MARGIN_S > time.time():
+            return prefix
+        return None
+
+    async def _create(self, key: str, model_name: str, prefix_text: str) -> Optional[CachedPrefix]:
+        self.misses += 1
+        stale = self._prefixes.pop(key, None)
+        try:
+            prefix = await run_blocking("gemini", self.backend.find, key, model_name)
+            if prefix is None or prefix.expires_at - CONTEXT_CACHE_EXPIRY_MARGIN_S <= time.time():
+                prefix = await run_blocking("gemini", self.backend.create, key, model_name, prefix_text, self.ttl_s)
+                print(f"   🧊 Context cache created: {prefix.name} ({len(prefix_text)} chars, ttl {self.ttl_s}s)")
+            else:
+                print(f"   🧊 Context cache found: {prefix.name}")
+        except Exception as e:
+            print(f"   ⚠️ Context caching unavailable for {key}, sending full prompt: {e}")
+            self._failed_until[key] = time.time() + CONTEXT_CACHE_RETRY_AFTER_S
+            return None
+
+        self._prefixes[key] = prefix
+        if stale and stale.name != prefix.name:
+            await self._delete_quietly(stale)
+        return prefix
+
+    def invalidate(self, model_name: str, prompt_version: str):
+        """Forget a cache the API rejected (expired or deleted elsewhere)"""
+        self._prefixes.pop(self.make_key(model_name, prompt_version), None)
+
+    async def _delete_quietly(self, prefix: CachedPrefix):
+        try:
+            await run_blocking("gemini", self.backend.delete, prefix)
+        except Exception as e:
+            print(f"   ⚠️ Could not delete context cache {prefix.name}: {e}")
+
+    async def close(self):
+        """Delete every cache this process created"""
+        prefixes = list(self._prefixes.values())
+        self._prefixes.clear()
+        for prefix in prefixes:
+            await self._delete_quietly(prefix)
+
+    def stats(self) -> Dict:
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "active": len(self._prefixes),
+            "too_small": len(self._too_small),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_manager: Optional[ContextCacheManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_context_cache_manager() -> ContextCacheManager:
+    """Process-wide context cache manager singleton"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ContextCacheManager()
+        return _manager
+
+
+def set_context_cache_manager(manager: ContextCacheManager):
+    """Swap the process-wide manager (e.g. to a FakeContextCacheBackend one)"""
+    global _manager
+    with _manager_lock:
+        _manager = manager
@@ -3,27 +3,73 @@ Gemini AI Adapter - Implements IAIRepository interface
 Wraps Gemini API for video analysis
 """
 import google.generativeai as genai
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 import os
+import time
+import asyncio
+import threading
 from src.domain.repositories.service_repositories import IAIRepository
-from src.domain.entities.video_analysis import VideoAnalysis
+from src.domain.entities.video_analysis import Beat, VideoAnalysis
+from src.infrastructure.ai.analysis_cache import (
+    AnalysisCache,
+    make_analysis_key,
+    make_timeline_key,
+    ANALYSIS_CACHE_ENABLED
+)
+from src.infrastructure.concurrency import Pipeline, run_blocking
+
+# "unified": one multimodal call per analysis
+# "two_stage": visual timeline once per video + text-only narration per style/pace/language
+GEMINI_ANALYSIS_MODE = os.getenv("GEMINI_ANALYSIS_MODE", "unified")
+ANALYSIS_MODES = ("unified", "two_stage")
+# Split long videos at keyframes and analyze the chunks concurrently (unified mode)
+LONG_VIDEO_MODE = os.getenv("LONG_VIDEO_MODE", "true").lower() == "true"
+# "video": upload the (proxied) video; "frames": sampled JPEG keyframes sent inline
+INPUT_MODES = ("video", "frames")
+
+# Speculative uploads in flight (only for videos the analysis cache has never seen). One the
+# analysis ends up not needing (chunked video, failed lookup) still completes and lands in
+# the reuse registry for the next analysis.
+_speculative_uploads = set()
+
+
+def _settle_upload(task: asyncio.Task):
+    _speculative_uploads.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"   ⚠️ Speculative Gemini upload failed: {task.exception()}")
 
 
 class GeminiAdapter(IAIRepository):
     """Adapter for Google Gemini AI video analysis"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        cache: Optional[AnalysisCache] = None,
+        analysis_mode: Optional[str] = None,
+        long_video_mode: bool = LONG_VIDEO_MODE
+    ):
         """
         Initialize Gemini adapter
         
         Args:
             api_key: Gemini API key (defaults to GEMINI_API_KEY env var)
+            cache: Analysis result cache (defaults to the Postgres cache when ANALYSIS_CACHE_ENABLED)
+            analysis_mode: "unified" or "two_stage" (defaults to GEMINI_ANALYSIS_MODE env var)
+            long_video_mode: Analyze long videos as concurrent keyframe-aligned chunks
         """
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found")
         
         genai.configure(api_key=self.api_key)
+        self.cache = cache or (AnalysisCache() if ANALYSIS_CACHE_ENABLED else None)
+        self.analysis_mode = (analysis_mode or GEMINI_ANALYSIS_MODE).lower()
+        if self.analysis_mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode '{self.analysis_mode}', expected one of {ANALYSIS_MODES}")
+        self.long_video_mode = long_video_mode
+        self._latency = {}
+        self._latency_lock = threading.Lock()
     
     async def analyze_video(
         self,
@@ -31,7 +77,8 @@ class GeminiAdapter(IAIRepository):
         style: str,
         pace: str,
         voice_id: str,
-        language: str = "es"
+        language: str = "es",
+        input_mode: str = "video"
     ) -> VideoAnalysis:
         """
         Analyze video using Gemini AI
@@ -42,18 +89,300 @@ class GeminiAdapter(IAIRepository):
             pace: Narrative pace
             voice_id: Voice ID for calibration
             language: Target language
+            input_mode: "video" or "frames" (skips the Gemini file upload/processing queue)
             
         Returns:
             VideoAnalysis with narrative beats
         """
-        # Import the actual implementation from infrastructure
-        from src.infrastructure.ai.gemini_legacy import analyze_video_content  # ✅ Fixed: correct function name
+        return await self._analyze(video_path, style, pace, voice_id, language, input_mode)
+    
+    async def analyze_video_streaming(
+        self,
+        video_path: str,
+        style: str,
+        pace: str,
+        voice_id: str,
+        on_beat: Callable[[Beat], Awaitable[None]],
+        language: str = "es",
+        input_mode: str = "video"
+    ) -> VideoAnalysis:
+        """
+        Analyze video with a streamed Gemini response
+        
+        Each beat is passed to on_beat as soon as its JSON object is complete,
+        so callers can start TTS while the model is still writing.
+        
+        Args:
+            video_path: Path to video file
+            style: Narrative style
+            pace: Narrative pace
+            voice_id: Voice ID for calibration
+            on_beat: Async callback receiving each completed beat
+            language: Target language
+            input_mode: "video" or "frames"
+            
+        Returns:
+            The complete VideoAnalysis
+        """
+        return await self._analyze(video_path, style, pace, voice_id, language, input_mode, on_beat=on_beat)
+    
+    def get_latency_stats(self) -> dict:
+        """Analysis latency per mode (count, mean, min, max, last in seconds)"""
+        with self._latency_lock:
+            return {
+                mode: {
+                    "count": len(samples),
+                    "mean_s": round(sum(samples) / len(samples), 2),
+                    "min_s": round(min(samples), 2),
+                    "max_s": round(max(samples), 2),
+                    "last_s": round(samples[-1], 2),
+                }
+                for mode, samples in self._latency.items()
+            }
+    
+    def _record_latency(self, mode: str, elapsed: float):
+        with self._latency_lock:
+            samples = self._latency.setdefault(mode, [])
+            samples.append(elapsed)
+            # Keep a rolling window so the stats follow current behaviour
+            del samples[:-200]
+    
+    async def _analyze(
+        self,
+        video_path: str,
+        style: str,
+        pace: str,
+        voice_id: str,
+        language: str,
+        input_mode: str = "video",
+        on_beat: Optional[Callable[[Beat], Awaitable[None]]] = None
+    ) -> VideoAnalysis:
+        """Shared cached analysis path with per-mode latency tracking"""
+        if input_mode not in INPUT_MODES:
+            raise ValueError(f"Unknown input mode '{input_mode}', expected one of {INPUT_MODES}")
         
-        # Delegate to existing implementation
-        analysis = analyze_video_content(
-            video_path=video_path,
-            style=style,
-            pace=pace
+        # Frames mode is always a single unified call
+        mode = f"{self.analysis_mode if input_mode == 'video' else 'unified'}/{input_mode}"
+        started = time.perf_counter()
+        analysis, cache_hit = await self._run_analysis(
+            video_path, style, pace, voice_id, language, input_mode, mode, on_beat
         )
+        elapsed = time.perf_counter() - started
         
+        label = "cache" if cache_hit else mode
+        self._record_latency(label, elapsed)
+        print(f"   ⏱️ Analysis latency [{label}]: {elapsed:.1f}s")
         return analysis
+    
+    async def _run_analysis(
+        self,
+        video_path: str,
+        style: str,
+        pace: str,
+        voice_id: str,
+        language: str,
+        input_mode: str,
+        mode: str,
+        on_beat: Optional[Callable[[Beat], Awaitable[None]]]
+    ):
+        """Cached analysis path; streams beats to on_beat when given. Returns (analysis, cache_hit)"""
+        # Import the actual implementation from infrastructure
+        from src.infrastructure.ai.gemini_legacy import (
+            analyze_video_content_async,
+            analyze_video_frames_async,
+            narrate_visual_timeline_async,
+            resolve_voice_id,
+            analysis_prompt_version,
+            ANALYSIS_MODEL
+        )
+        from src.infrastructure.ai.chunked_analysis import analyze_chunks
+        from src.infrastructure.tts.calibration import get_wps_for_voice
+        from src.infrastructure.video.chunker import chunk_long_video, remove_chunks
+        from src.infrastructure.video.media_probe import file_content_hash, probe_media
+        
+        voice_id = resolve_voice_id(voice_id)
+        
+        # WPS (maybe a calibration TTS call), the content hash and the Gemini upload
+        # (proxy + upload + activation) are independent. The upload starts speculatively,
+        # while calibration is still going, but only for videos the cache has never seen:
+        # a possible hit (exact key needs the WPS) must not pay for a proxy and upload.
+        lookup = (
+            Pipeline("analysis.lookup")
+            .stage("wps", lambda: get_wps_for_voice(voice_id, language, style), service="elevenlabs")
+            .stage("uploads_whole", self._uploads_whole_video, needs=("path", "input_mode"), service="media")
+        )
+        if self.cache:
+            (lookup
+                .stage("video_hash", file_content_hash, needs=("path",), service="media")
+                .stage("seen", self.cache.has_video, needs=("video_hash",))
+                .stage("upload", self._start_upload, needs=("path", "uploads_whole", "seen")))
+        else:
+            lookup.stage("upload", self._start_upload, needs=("path", "uploads_whole"))
+        inputs = await lookup.run(path=video_path, input_mode=input_mode)
+        words_per_sec = inputs["wps"]
+        # None for seen videos: the analysis uploads after its cache lookups miss
+        # (chunked videos never await it; it finishes into the reuse registry)
+        upload = inputs["upload"]
+        
+        cache_key = None
+        video_hash = None
+        if self.cache:
+            video_hash = inputs["video_hash"]
+            cache_key = make_analysis_key(
+                video_hash=video_hash,
+                style=style,
+                pace=pace,
+                language=language,
+                words_per_sec=words_per_sec,
+                prompt_version=f"{ANALYSIS_MODEL}:{analysis_prompt_version()}:{mode}"
+            )
+            cached = await self.cache.get(cache_key)
+            if cached:
+                cached.words_per_second = words_per_sec
+                print(f"   ♻️ Analysis cache hit ({len(cached.beats)} beats), skipping Gemini")
+                if on_beat:
+                    for beat in cached.beats:
+                        await on_beat(beat)
+                return cached, True
+        
+        if input_mode == "frames":
+            analysis = await analyze_video_frames_async(
+                video_path=video_path,
+                style=style,
+                pace=pace,
+                voice_id=voice_id,
+                language=language,
+                words_per_sec=words_per_sec,
+                on_beat=on_beat
+            )
+        elif self.analysis_mode == "two_stage":
+            timeline = await self.get_visual_timeline(video_path, video_hash, video_file=upload)
+            if not timeline.visual_timeline:
+                return timeline, False
+            analysis = await narrate_visual_timeline_async(
+                video_path=video_path,
+                visual_timeline=timeline.visual_timeline,
+                style=style,
+                pace=pace,
+                voice_id=voice_id,
+                language=language,
+                words_per_sec=words_per_sec,
+                on_beat=on_beat
+            )
+            analysis.duration_s = timeline.duration_s
+        else:
+            chunks = await run_blocking("media", chunk_long_video, video_path) if self.long_video_mode else None
+            if chunks:
+                async def analyze_chunk(chunk, continuity_context, chunk_on_beat):
+                    return await analyze_video_content_async(
+                        video_path=chunk.path,
+                        style=style,
+                        pace=pace,
+                        voice_id=voice_id,
+                        language=language,
+                        words_per_sec=words_per_sec,
+                        on_beat=chunk_on_beat,
+                        continuity_context=continuity_context
+                    )
+                try:
+                    analysis = await analyze_chunks(chunks, analyze_chunk, on_beat=on_beat)
+                finally:
+                    # A stream-copied full-size second copy of the upload
+                    await run_blocking("media", remove_chunks, chunks)
+            else:
+                # Delegate to existing implementation (upload/activation polling never blocks the event loop)
+                analysis = await analyze_video_content_async(
+                    video_path=video_path,
+                    style=style,
+                    pace=pace,
+                    voice_id=voice_id,
+                    language=language,
+                    words_per_sec=words_per_sec,
+                    on_beat=on_beat,
+                    video_file=upload
+                )
+        
+        analysis.words_per_second = words_per_sec
+        if analysis.beats and not analysis.duration_s:
+            # The unified schema has no duration; the beat post-processor needs it
+            analysis.duration_s = (await run_blocking("media", probe_media, video_path)).duration_s
+        if cache_key and analysis.beats:
+            await self.cache.put(cache_key, analysis)
+        
+        return analysis, False
+
+    def _uploads_whole_video(self, path: str, input_mode: str) -> bool:
+        """Whether the analysis will upload the whole video (as opposed to frames or chunks)"""
+        from src.infrastructure.video.chunker import LONG_VIDEO_THRESHOLD_S
+        from src.infrastructure.video.media_probe import probe_media
+        
+        if input_mode != "video":
+            return False
+        if self.analysis_mode == "two_stage" or not self.long_video_mode:
+            return True
+        return probe_media(path).duration_s <= LONG_VIDEO_THRESHOLD_S
+    
+    @staticmethod
+    async def _start_upload(path: str, uploads_whole: bool, seen: bool = False) -> Optional[asyncio.Task]:
+        """Kick off the upload and return its task right away (the pipeline would await a bare task)"""
+        from src.infrastructure.ai.gemini_files import upload_video_for_analysis
+        
+        if not uploads_whole or seen:
+            return None
+        task = asyncio.create_task(upload_video_for_analysis(path), name=f"gemini-upload:{os.path.basename(path)}")
+        _speculative_uploads.add(task)
+        task.add_done_callback(_settle_upload)
+        return task
+    
+    async def get_visual_timeline(
+        self,
+        video_path: str,
+        video_hash: Optional[str] = None,
+        video_file: Optional[Awaitable] = None
+    ) -> VideoAnalysis:
+        """
+        Stage 1 of two-stage mode: visual timeline, extracted once per video content
+        
+        Args:
+            video_path: Path to video file
+            video_hash: SHA-256 of the video if the caller already computed it
+            video_file: Upload of the video the caller already started
+            
+        Returns:
+            VideoAnalysis holding only duration_s and visual_timeline
+        """
+        from src.infrastructure.ai.gemini_legacy import (
+            extract_visual_timeline_async,
+            visual_timeline_prompt_version,
+            ANALYSIS_MODEL
+        )
+        from src.infrastructure.video.media_probe import file_content_hash
+        
+        timeline_key = None
+        if self.cache:
+            video_hash = video_hash or await run_blocking("media", file_content_hash, video_path)
+            timeline_key = make_timeline_key(video_hash, f"{ANALYSIS_MODEL}:{visual_timeline_prompt_version()}")
+            cached = await self.cache.get(timeline_key)
+            if cached and cached.visual_timeline:
+                print(f"   ♻️ Visual timeline cache hit ({len(cached.visual_timeline)} entries)")
+                return cached
+        
+        timeline = await extract_visual_timeline_async(video_path, video_file=video_file)
+        if timeline_key and timeline.visual_timeline:
+            await self.cache.put(timeline_key, timeline)
+        return timeline
+
+    async def upload_video(self, video_path: str, mime_type: str = "video/mp4"):
+        """
+        Upload a file and wait until Gemini marks it ACTIVE
+        
+        Args:
+            video_path: Path to video file
+            mime_type: MIME type of the file
+            
+        Returns:
+            ACTIVE Gemini file handle
+        """
+        from src.infrastructure.ai.gemini_files import upload_and_activate
+        
+        return await upload_and_activate(video_path, mime_type=mime_type)
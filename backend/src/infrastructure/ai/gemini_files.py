@@ -0,0 +1,281 @@
+"""
+Gemini File Upload - async upload-and-activate
+Uploads a file to the Gemini File API and polls until it is ACTIVE without
+blocking the event loop (exponential backoff with jitter, deadline, cancellation).
+Files already uploaded with the same content hash are reused while still ACTIVE.
+"""
+import os
+import json
+import time
+import fcntl
+import random
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+import google.generativeai as genai
+
+from src.infrastructure.concurrency import run_blocking
+from src.infrastructure.video.media_probe import file_content_hash
+from src.infrastructure.video.proxy import make_analysis_proxy, ANALYSIS_PROXY_ENABLED
+
+GEMINI_ACTIVATION_TIMEOUT_S = float(os.getenv("GEMINI_ACTIVATION_TIMEOUT_S", "600"))
+GEMINI_POLL_INITIAL_S = float(os.getenv("GEMINI_POLL_INITIAL_S", "1.0"))
+GEMINI_POLL_MAX_S = float(os.getenv("GEMINI_POLL_MAX_S", "10.0"))
+GEMINI_FILE_REGISTRY_PATH = os.getenv("GEMINI_FILE_REGISTRY_PATH", "src/temp/gemini_files.json")
+# Don't hand out a file that expires before the analysis can finish
+GEMINI_FILE_EXPIRY_MARGIN_S = 15 * 60
+# The File API keeps uploads for 48 hours
+GEMINI_FILE_DEFAULT_TTL_S = 48 * 3600
+
+
+class GeminiFileError(Exception):
+    """Raised when an uploaded file fails processing or misses its deadline"""
+
+
+def backoff_delay(attempt: int, initial_s: float = GEMINI_POLL_INITIAL_S, max_s: float = GEMINI_POLL_MAX_S) -> float:
+    """
+    Exponential backoff with jitter
+
+    The ceiling doubles per attempt up to max_s; the actual delay is drawn
+    from the upper half of it so concurrent jobs don't poll in lockstep.
+    """
+    ceiling = min(max_s, initial_s * (2 ** attempt))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+async def delete_file_quietly(name: str):
+    """Best-effort removal of an uploaded file (used on cancel/failure)"""
+    try:
+        await run_blocking("gemini", genai.delete_file, name)
+        print(f"   🗑️ Deleted Gemini file {name}")
+    except Exception as e:
+        print(f"   ⚠️ Could not delete Gemini file {name}: {e}")
+
+
+async def wait_until_active(
+    file,
+    timeout_s: float = GEMINI_ACTIVATION_TIMEOUT_S,
+    initial_s: float = GEMINI_POLL_INITIAL_S,
+    max_s: float = GEMINI_POLL_MAX_S
+):
+    """
+    Poll an uploaded file until Google finishes processing it
+
+    Args:
+        file: File returned by genai.upload_file
+        timeout_s: Deadline for the whole wait
+        initial_s: First poll delay
+        max_s: Upper bound for a single poll delay
+
+    Returns:
+        The refreshed, ACTIVE file
+
+    Raises:
+        GeminiFileError if processing fails or the deadline passes
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_s
+    attempt = 0
+
+    while file.state.name == "PROCESSING":
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise GeminiFileError(f"File {file.name} still processing after {timeout_s:.0f}s")
+
+        await asyncio.sleep(min(remaining, backoff_delay(attempt, initial_s, max_s)))
+        attempt += 1
+        file = await run_blocking("gemini", genai.get_file, file.name)
+
+    if file.state.name != "ACTIVE":
+        raise GeminiFileError(f"File {file.name} failed to process (state: {file.state.name})")
+
+    return file
+
+
+class GeminiFileRegistry:
+    """
+    Maps a file's SHA-256 to its Gemini upload (name, URI, expiry), persisted as JSON
+
+    The API and worker processes share the file, so every operation re-reads it
+    and writes back under an exclusive flock instead of keeping a private copy
+    that would overwrite the other processes' entries.
+    """
+
+    def __init__(self, path: str = GEMINI_FILE_REGISTRY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _entries(self) -> Iterator[Dict[str, Dict]]:
+        """Current entries, locked against other threads and processes; changes are saved on exit"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, open(f"{self.path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                entries = self._load()
+                before = dict(entries)
+                yield entries
+                if entries != before:
+                    self._save(entries)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, entries: Dict[str, Dict]):
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, content_hash: str) -> Optional[Dict]:
+        """Registered upload for this hash, if it has not expired yet"""
+        with self._entries() as entries:
+            entry = entries.get(content_hash)
+            if entry and entry["expires_at"] - GEMINI_FILE_EXPIRY_MARGIN_S > time.time():
+                return entry
+            entries.pop(content_hash, None)
+            return None
+
+    def register(self, content_hash: str, file):
+        expiration = getattr(file, "expiration_time", None)
+        expires_at = expiration.timestamp() if expiration else time.time() + GEMINI_FILE_DEFAULT_TTL_S
+        with self._entries() as entries:
+            # Drop expired entries while we are rewriting the file anyway
+            now = time.time()
+            for key in [k for k, v in entries.items() if v["expires_at"] <= now]:
+                del entries[key]
+            entries[content_hash] = {"name": file.name, "uri": file.uri, "expires_at": expires_at}
+
+    def forget(self, content_hash: str):
+        with self._entries() as entries:
+            entries.pop(content_hash, None)
+
+
+_registry: Optional[GeminiFileRegistry] = None
+_registry_lock = threading.Lock()
+# One upload per content hash at a time; concurrent jobs for the same clip share it
+_upload_locks: Dict[str, asyncio.Lock] = {}
+
+
+def get_gemini_file_registry() -> GeminiFileRegistry:
+    """Process-wide uploaded-file registry singleton"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = GeminiFileRegistry()
+        return _registry
+
+
+async def _reuse_registered_file(registry: GeminiFileRegistry, content_hash: str):
+    """Return the registered upload if Gemini still has it ACTIVE, else None"""
+    entry = registry.get(content_hash)
+    if entry is None:
+        return None
+    try:
+        file = await run_blocking("gemini", genai.get_file, entry["name"])
+    except Exception as e:
+        print(f"   ⚠️ Registered Gemini file {entry['name']} unavailable: {e}")
+        registry.forget(content_hash)
+        return None
+
+    if file.state.name == "PROCESSING":
+        # A previous job uploaded it but never saw it finish
+        try:
+            file = await wait_until_active(file)
+        except GeminiFileError:
+            registry.forget(content_hash)
+            return None
+    if file.state.name != "ACTIVE":
+        registry.forget(content_hash)
+        return None
+
+    print(f"   ♻️ Reusing Gemini file {file.name} (skipped upload)")
+    return file
+
+
+async def upload_and_activate(
+    path: str,
+    mime_type: str = "video/mp4",
+    timeout_s: float = GEMINI_ACTIVATION_TIMEOUT_S,
+    reuse: bool = True
+):
+    """
+    Upload a file and wait until it can be used in a prompt
+
+    With reuse enabled, a previous upload of the same content (SHA-256) is
+    returned directly while Gemini still has it ACTIVE.
+
+    If the caller is cancelled or the file never becomes ACTIVE, the uploaded
+    file is deleted so it does not linger in the project's quota.
+
+    Args:
+        path: Local file to upload
+        mime_type: MIME type sent to the File API
+        timeout_s: Deadline for processing after the upload finishes
+        reuse: Look up / record the upload in the content-hash registry
+
+    Returns:
+        ACTIVE Gemini file
+    """
+    if not reuse:
+        return await _upload_new(path, mime_type, timeout_s)
+
+    content_hash = await run_blocking("media", file_content_hash, path)
+    registry = get_gemini_file_registry()
+    lock = _upload_locks.setdefault(content_hash, asyncio.Lock())
+
+    try:
+        async with lock:
+            file = await _reuse_registered_file(registry, content_hash)
+            if file is None:
+                file = await _upload_new(path, mime_type, timeout_s)
+                registry.register(content_hash, file)
+            return file
+    finally:
+        if not lock.locked():
+            _upload_locks.pop(content_hash, None)
+
+
+async def _upload_new(path: str, mime_type: str, timeout_s: float):
+    """Upload + activation wait, deleting the file on cancellation or failure"""
+    file = await run_blocking("gemini", genai.upload_file, path, mime_type=mime_type)
+    print(f"Uploaded file '{file.display_name}' as: {file.uri}")
+
+    try:
+        file = await wait_until_active(file, timeout_s=timeout_s)
+    except asyncio.CancelledError:
+        print(f"   ⚠️ Upload of {os.path.basename(path)} cancelled")
+        await asyncio.shield(delete_file_quietly(file.name))
+        raise
+    except GeminiFileError:
+        await delete_file_quietly(file.name)
+        raise
+
+    print(f"   ✅ Gemini file {file.name} is ACTIVE")
+    return file
+
+
+async def upload_video_for_analysis(video_path: str, use_proxy: bool = ANALYSIS_PROXY_ENABLED):
+    """
+    Upload the low-bitrate analysis proxy of a video (built and cached on first use)
+
+    Args:
+        video_path: Original video
+        use_proxy: Upload the proxy instead of the original (ANALYSIS_PROXY_ENABLED)
+
+    Returns:
+        ACTIVE Gemini file
+    """
+    upload_path = video_path
+    if use_proxy:
+        upload_path = await run_blocking("media", make_analysis_proxy, video_path)
+    return await upload_and_activate(upload_path)
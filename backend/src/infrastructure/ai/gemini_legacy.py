@@ -1,12 +1,60 @@
 import os
+import json
 import time
+import functools
 import google.generativeai as genai
-from src.domain.schemas import VideoAnalysis
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from src.domain.schemas import Beat, VideoAnalysis, VisualBeat
 from src.infrastructure.tts.calibration import get_wps_for_voice
+from src.infrastructure.ai.prompt_registry import get_prompt_registry
+from src.infrastructure.concurrency import Pipeline, run_blocking
 
 # Configure API
 genai.configure(api_key=os.environ.get("GOOGLE_API_KEY"))
 
+ANALYSIS_MODEL = "gemini-3-flash-preview"
+ANALYSIS_GENERATION_CONFIG = {"response_mime_type": "application/json", "temperature": 0.7}
+DEFAULT_VOICE_ID = os.environ.get("ELEVENLABS_VOICE_ID", "JBFqnCBsd6RMkjVDRZzb")
+
+# Two-stage mode: the visual timeline is extracted once per video, narration is text-only
+NARRATION_MODEL = os.environ.get("GEMINI_NARRATION_MODEL", ANALYSIS_MODEL)
+# Templates under prompts/video/ that make up each prompt (their hashes version the caches)
+ANALYSIS_PROMPT_TEMPLATES = (
+    "system_instruction", "styles", "paces", "unified_rules", "job_parameters",
+    "visual_timeline_input", "scene_cuts", "continuity", "frames_input"
+)
+VISUAL_TIMELINE_PROMPT_TEMPLATES = ("visual_timeline", "scene_cuts")
+
+
+def analysis_prompt_version() -> str:
+    """
+    Hash de las plantillas del prompt unificado; cambia solo si se edita algún archivo.
+    """
+    return get_prompt_registry().version("video", ANALYSIS_PROMPT_TEMPLATES)
+
+
+def unified_rules_version() -> str:
+    """
+    Hash del prefijo estático del prompt unificado (clave de la caché de contexto).
+    """
+    return get_prompt_registry().get("video", "unified_rules").version
+
+
+def visual_timeline_prompt_version() -> str:
+    """
+    Hash de las plantillas del prompt de timeline visual.
+    """
+    return get_prompt_registry().version("video", VISUAL_TIMELINE_PROMPT_TEMPLATES)
+
+
+def resolve_voice_id(voice_id: Optional[str]) -> str:
+    """
+    Convierte el voice_id "default" (o vacío) en la voz configurada por entorno.
+    """
+    if not voice_id or voice_id == "default":
+        return DEFAULT_VOICE_ID
+    return voice_id
+
 def upload_to_gemini(path: str, mime_type: str = "video/mp4"):
     """
     Uploads the given file to Gemini.
@@ -44,223 +92,123 @@ def clean_json_response(text: str) -> str:
         cleaned = cleaned[:-3]
     return cleaned.strip()
 
-def analyze_video_content(video_path: str, style: str = "viral", pace: str = "fast") -> VideoAnalysis:
+def scene_cuts_block(scene_cuts: List[float]) -> str:
     """
-    Single-stage unified pipeline:
-    - Gemini analyzes video and generates narrative simultaneously
-    - Returns complete beats with timestamps and scripts in one call
+    Bloque de prompt con los cortes de escena detectados localmente.
+    """
+    cuts = ", ".join(f"{t:.2f}" for t in scene_cuts)
+    return get_prompt_registry().render("video", "scene_cuts", cuts=cuts)
+
+
+def build_analysis_prompt_parts(
+    video_path: str,
+    style: str = "viral",
+    pace: str = "fast",
+    voice_id: Optional[str] = None,
+    language: str = "es",
+    words_per_sec: Optional[float] = None,
+    visual_timeline: Optional[List[VisualBeat]] = None,
+    continuity_context: Optional[str] = None,
+    scene_cuts: Optional[List[float]] = None,
+    video_duration: Optional[float] = None
+) -> Tuple[str, str]:
+    """
+    Construye el system prompt unificado (análisis + narrativa) para un video, en dos partes:
+    un prefijo estático (reglas, esquema, ejemplos; igual en todos los jobs, cacheable)
+    y un sufijo dinámico (estilo, ritmo, duración, WPS y bloques opcionales).
+    Usa la duración del video y el WPS calibrado para fijar el presupuesto de palabras.
+    Si se pasa visual_timeline, el prompt es solo de texto: el timeline reemplaza al video.
+    continuity_context describe las otras partes cuando el video se analiza por fragmentos.
+    scene_cuts son los cortes de plano detectados localmente, usados como límites de beat preferidos.
+    video_duration evita volver a medir el video cuando el llamador ya la tiene.
     """
-    # 1. Upload
-    video_file = upload_to_gemini(video_path)
-    wait_for_files_active([video_file])
-
-    # --- UNIFIED ANALYSIS & NARRATION ---
-    print("   ↳ 🎬 Analyzing video and generating narrative...")
-    
     from src.infrastructure.ai.prompts import get_system_instruction
     
     # Get base system instruction with style and pace
     base_instruction = get_system_instruction(style, pace)
     
     # Get video duration from file
-    from src.infrastructure.video.video_service import check_video_duration
-    video_duration = check_video_duration(video_path)
+    if video_duration is None:
+        from src.infrastructure.video.video_service import check_video_duration
+        video_duration = check_video_duration(video_path)
     print(f"   📹 Video duration: {video_duration:.1f}s")
     
     # Calculate WPS for narrative
-    voice_id = os.environ.get("ELEVENLABS_VOICE_ID", "JBFqnCBsd6RMkjVDRZzb")
-    words_per_sec = get_wps_for_voice(voice_id, language="es", style=style)
+    words_per_sec = resolve_wps(voice_id, language, style, words_per_sec)
     total_words_max = int(video_duration * words_per_sec * 0.85)
     print(f"   📊 Using calibrated WPS: {words_per_sec:.2f} words/second")
     print(f"   📝 Target narrative length: ~{total_words_max} words")
     
-    unified_system_prompt = f"""{base_instruction}
-
-<segmented_continuous_narrative_approach>
-ENFOQUE DE NARRATIVA CONTINUA SEGMENTADA:
-
-Este sistema genera UNA NARRATIVA COMPLETA coherente que luego se DIVIDE en segmentos sincronizados con cada beat visual.
-
-PROCESO:
-1. Analiza el video completo y comprende la historia
-2. Crea beats visuales con timestamps precisos
-3. Escribe UNA narrativa completa fluida (~{total_words_max} palabras totales)
-4. DIVIDE esa narrativa en segmentos, asignando cada parte al beat correspondiente
-
-CLAVE: La narrativa debe ser UNA HISTORIA COHERENTE que se cuenta de forma continua,
-pero dividida inteligentemente para que cada beat tenga su porción sincronizada.
-</segmented_continuous_narrative_approach>
-
-<beat_creation>
-CREACIÓN DE BEATS VISUALES:
-- Analiza el video y crea beats con timestamps precisos
-- Cada beat representa un momento visual clave
-- Incluye: id, start_s, end_s, visual_summary
-- Calcula duración de cada beat para distribuir palabras
-</beat_creation>
-
-<narrative_segmentation>
-SEGMENTACIÓN DE LA NARRATIVA - MUY IMPORTANTE:
-
-El video dura {video_duration:.1f}s.
-La voz TTS tiene velocidad de {words_per_sec:.1f} palabras/segundo.
-Palabras totales disponibles: ~{total_words_max}
-
-PASO 1: ESCRIBIR NARRATIVA COMPLETA
-Escribe primero la historia completa en overall.full_narrative_script:
-- Inicio enganchante
-- Desarrollo coherente
-- Cierre satisfactorio
-- Tercera persona siempre
-- Nombres de personajes consistentes
-- Total: ~{total_words_max} palabras
-
-PASO 2: DIVIDIR EN SEGMENTOS POR BEAT
-Para cada beat, asigna un SEGMENTO de la narrativa completa:
-- El segmento debe corresponder temporalmente a lo que se ve en ese beat
-- Calcula palabras por beat usando: (end_s - start_s) × {words_per_sec:.1f} × 0.85
-- Los segmentos deben fluir naturalmente uno tras otro
-- Juntos, los segmentos forman la narrativa completa
-
-EJEMPLO (video 20s, 3 beats):
-
-overall.full_narrative_script: "En las sombras de la noche, El Jakal prepara su jugada más arriesgada. Cada movimiento es preciso, calculado. Sabe que no hay margen de error. Las calles están vacías, pero la tensión es palpable. Marcus observa desde la distancia. Este es el momento que definirá todo."
-
-beat[0] (0-7s, ~14 palabras): 
-  visual: "Hombre camina por calles oscuras"
-  script: "En las sombras de la noche, El Jakal prepara su jugada más arriesgada."
-
-beat[1] (7-13s, ~12 palabras):
-  visual: "Close-up de manos ajustando equipo"
-  script: "Cada movimiento es preciso, calculado. Sabe que no hay margen de error."
-
-beat[2] (13-20s, ~14 palabras):
-  visual: "Otra persona observando desde lejos"
-  script: "Las calles están vacías, pero la tensión es palpable. Marcus observa desde la distancia."
-
-REGLAS CRÍTICAS:
-- Cada beat.voiceover.script debe tener EXACTAMENTE las palabras calculadas (±2 aceptable)
-- Los scripts deben ser PARTES CONSECUTIVAS de la narrativa completa
-- NO repitas información entre beats
-- La suma de todos los scripts = narrativa completa
-- Mantén coherencia narrativa absoluta
-</narrative_segmentation>
-
-<character_naming_rules>
-CONTINUIDAD DE PERSONAJES:
-- Asigna nombres creativos desde el primer beat
-- USA LOS MISMOS NOMBRES en todos los beats
-- Ejemplos: "El Jakal", "Marcus", "La Doctora Chen"
-</character_naming_rules>
-
-<creative_storytelling>
-NARRATIVA ATRAPANTE:
-- Interpreta las escenas, no solo describas
-- Inventa motivaciones y contexto emocional
-- Agrega tensión y drama
-- Conecta causas y consecuencias
-- La narrativa debe sentirse como una historia completa, no fragmentos
-</creative_storytelling>
-
-<dramatic_pauses>
-PAUSAS ESTRATÉGICAS - SILENCIO CINEMATOGRÁFICO:
-
-Puedes agregar pausas dramáticas DESPUÉS de ciertos beats usando voiceover.pause_after_s.
-
-CUÁNDO USAR PAUSAS (0.3-0.8 segundos):
-✅ USAR pausa cuando:
-- Cambio de escena importante o transición temporal
-- Momento de suspense que requiere "respiración"
-- Antes de un reveal o giro dramático
-- Después de una frase impactante para dejar que "aterrice"
-- Cierre de segmento narrativo antes de clímax
-
-❌ NO usar pausa cuando:
-- La acción es continua y rápida
-- El diálogo fluye naturalmente al siguiente beat
-- Ya hay espacio natural entre beats
-
-DURACIÓN DE PAUSAS:
-- 0.3s: Pausa breve (cambio de escena suave)
-- 0.5s: Pausa media (suspense, transición)
-- 0.8s: Pausa larga (momento muy dramático)
-
-EJEMPLO:
-Beat 1: "El Jakal ajusta el arma con precisión absoluta."
-  → pause_after_s: 0.5 (dejar que la imagen del arma "respire")
-
-Beat 2: "Marcus lo observa desde las sombras, esperando el momento perfecto."
-  → pause_after_s: 0.0 (continúa fluidamente)
-
-Beat 3: "El disparo rompe el silencio de la noche."
-  → pause_after_s: 0.8 (pausa dramática después del clímax)
-
-REGLA: Usa pausas con moderación. No más del 30% de los beats deben tener pausa.
-</dramatic_pauses>
-
-<output_schema>
-ESTRUCTURA JSON REQUERIDA:
-{{
-  "overall": {{
-    "hook": "Frase inicial atrapante (5-10 palabras)",
-    "tone": "{style}",
-    "full_narrative_script": "LA NARRATIVA COMPLETA aquí. Escribe toda la historia de principio a fin, ~{total_words_max} palabras. Esta es la versión completa y fluida de la historia."
-  }},
-  "beats": [
-    {{
-      "id": 1,
-      "start_s": 0.0,
-      "end_s": 7.2,
-      "visual_summary": "Descripción breve de lo que se ve",
-      "voiceover": {{
-        "script": "SEGMENTO 1 de la narrativa completa.",
-        "pause_after_s": 0.5
-      }}
-    }},
-    {{
-      "id": 2,
-      "start_s": 7.2,
-      "end_s": 14.5,
-      "visual_summary": "Descripción breve de lo que se ve",
-      "voiceover": {{
-        "script": "SEGMENTO 2 de la narrativa. Continúa donde terminó el segmento 1.",
-        "pause_after_s": 0.0
-      }}
-    }}
-  ]
-}}
-</output_schema>
-
-<critical_reminders>
-1. overall.full_narrative_script = Historia completa (~{total_words_max} palabras)
-2. beat[i].voiceover.script = Segmento i de esa historia
-3. Segmentos deben fluir naturalmente: segmento1 + segmento2 + ... = narrativa completa
-4. Cada segmento sincronizado con su beat visual
-5. Tercera persona y nombres consistentes en TODO
-6. Calcula palabras por beat: (duration) × {words_per_sec:.1f} × 0.85
-</critical_reminders>
-"""
-    
-    # Create model with unified system prompt
-    model = genai.GenerativeModel(
-        model_name="gemini-3-flash-preview",
-        generation_config={"response_mime_type": "application/json", "temperature": 0.7},
-        system_instruction=unified_system_prompt
+    registry = get_prompt_registry()
+    prefix = registry.render("video", "unified_rules")
+    blocks = [base_instruction, registry.render(
+        "video", "job_parameters",
+        video_duration=video_duration,
+        words_per_sec=words_per_sec,
+        total_words_max=total_words_max,
+        style=style
+    )]
+
+    if visual_timeline:
+        timeline_json = json.dumps([vb.dict() for vb in visual_timeline], ensure_ascii=False, indent=1)
+        blocks.append(registry.render("video", "visual_timeline_input", timeline_json=timeline_json))
+
+    if scene_cuts:
+        blocks.append(scene_cuts_block(scene_cuts))
+
+    if continuity_context:
+        blocks.append(registry.render("video", "continuity", continuity_context=continuity_context))
+
+    return prefix, "\n".join(blocks)
+
+
+def resolve_wps(voice_id: Optional[str], language: str, style: str, words_per_sec: Optional[float] = None) -> float:
+    """
+    WPS recibido o el calibrado para la voz (puede lanzar una calibración con TTS si no existe).
+    """
+    if words_per_sec is not None:
+        return words_per_sec
+    return get_wps_for_voice(resolve_voice_id(voice_id), language=language, style=style)
+
+
+def video_file_stage(video_file: Optional[Awaitable[Any]] = None) -> Callable[[str], Awaitable[Any]]:
+    """
+    Etapa de subida: espera una subida ya iniciada por el llamador o sube el video aquí.
+    """
+    from src.infrastructure.ai.gemini_files import upload_video_for_analysis
+
+    if video_file is None:
+        return upload_video_for_analysis
+    return lambda video_path: video_file
+
+
+def build_analysis_prompt(*args, **kwargs) -> str:
+    """
+    System prompt unificado completo (prefijo estático + sufijo dinámico).
+    Acepta los mismos argumentos que build_analysis_prompt_parts.
+    """
+    prefix, suffix = build_analysis_prompt_parts(*args, **kwargs)
+    return f"{prefix}\n{suffix}"
+
+
+def create_analysis_model(system_prompt: str, model_name: str = ANALYSIS_MODEL):
+    """
+    Crea el modelo de Gemini configurado para devolver JSON.
+    """
+    return genai.GenerativeModel(
+        model_name=model_name,
+        generation_config=ANALYSIS_GENERATION_CONFIG,
+        system_instruction=system_prompt
     )
-    
-    # Make single API call
-    try:
-        response = model.generate_content([video_file, f"Analiza este video y genera la narrativa completa."])
-        print(f"   ✅ Gemini response received ({len(response.text)} chars)")
-        
-    except Exception as e:
-        print(f"❌ Error calling Gemini API: {e}")
-        return VideoAnalysis()
-    
-    # Parse response
-    import json
+
+
+def parse_analysis_response(text: str) -> VideoAnalysis:
+    """
+    Convierte la respuesta JSON de Gemini en un VideoAnalysis.
+    Devuelve un VideoAnalysis vacío si la respuesta no se puede parsear.
+    """
     try:
-        cleaned_text = clean_json_response(response.text)
+        cleaned_text = clean_json_response(text)
         result_data = json.loads(cleaned_text)
         
         # Handle different response structures
@@ -285,5 +233,323 @@ ESTRUCTURA JSON REQUERIDA:
         
     except Exception as e:
         print(f"❌ Error parsing response: {e}")
-        print(f"   Raw response: {response.text[:500]}...")
+        print(f"   Raw response: {text[:500]}...")
         return VideoAnalysis()
+
+
+def analyze_video_content(
+    video_path: str,
+    style: str = "viral",
+    pace: str = "fast",
+    voice_id: Optional[str] = None,
+    language: str = "es"
+) -> VideoAnalysis:
+    """
+    Single-stage unified pipeline:
+    - Gemini analyzes video and generates narrative simultaneously
+    - Returns complete beats with timestamps and scripts in one call
+    """
+    # 1. Upload
+    video_file = upload_to_gemini(video_path)
+    wait_for_files_active([video_file])
+
+    # --- UNIFIED ANALYSIS & NARRATION ---
+    print("   ↳ 🎬 Analyzing video and generating narrative...")
+    model = create_analysis_model(build_analysis_prompt(video_path, style, pace, voice_id, language))
+
+    # Make single API call
+    try:
+        response = model.generate_content([video_file, f"Analiza este video y genera la narrativa completa."])
+        print(f"   ✅ Gemini response received ({len(response.text)} chars)")
+
+    except Exception as e:
+        print(f"❌ Error calling Gemini API: {e}")
+        return VideoAnalysis()
+
+    return parse_analysis_response(response.text)
+
+
+async def detect_scene_cuts_async(video_path: str) -> List[float]:
+    """
+    Cortes de escena locales (en un hilo), vacío si el detector está desactivado.
+    """
+    from src.infrastructure.video.scene_detector import detect_scene_cuts, SCENE_DETECT_ENABLED
+
+    if not SCENE_DETECT_ENABLED:
+        return []
+    return await run_blocking("media", detect_scene_cuts, video_path)
+
+
+def snap_to_scene_cuts(analysis: VideoAnalysis, scene_cuts: List[float]):
+    """
+    Ajusta los límites de los beats del modelo a los cortes reales cercanos.
+    """
+    from src.infrastructure.video.scene_detector import snap_beats_to_cuts
+
+    snapped = snap_beats_to_cuts(analysis.beats, scene_cuts, duration_s=analysis.duration_s or None)
+    if snapped:
+        print(f"   🧲 Snapped {snapped} beat boundaries to detected cuts")
+
+
+async def generate_response_text(
+    model,
+    contents,
+    on_beat: Optional[Callable[[Beat], Awaitable[None]]] = None
+) -> str:
+    """
+    Llama al modelo y devuelve el texto completo de la respuesta.
+    Con on_beat, la respuesta se pide en streaming y cada beat se emite en cuanto su objeto JSON se cierra.
+    """
+    if on_beat is None:
+        response = await model.generate_content_async(contents)
+        return response.text
+
+    from src.infrastructure.ai.beat_stream_parser import BeatStreamParser
+
+    parser = BeatStreamParser()
+    response = await model.generate_content_async(contents, stream=True)
+    async for chunk in response:
+        for beat_data in parser.feed(chunk.text):
+            try:
+                beat = Beat(**beat_data)
+            except Exception as e:
+                print(f"   ⚠️ Skipping invalid streamed beat: {e}")
+                continue
+            await on_beat(beat)
+
+    print(f"   📡 Streamed {parser.emitted} beats")
+    return parser.text
+
+
+async def generate_with_cached_prefix(
+    prefix: str,
+    suffix: str,
+    prefix_version: str,
+    contents: list,
+    on_beat: Optional[Callable[[Beat], Awaitable[None]]] = None,
+    model_name: str = ANALYSIS_MODEL
+) -> str:
+    """
+    Genera con el prefijo estático servido desde la caché de contexto de Gemini.
+    El sufijo dinámico se envía como primer contenido de la petición. Si la caché no
+    está disponible (o la API la rechaza) se usa el system prompt completo.
+    """
+    from src.infrastructure.ai.context_cache import get_context_cache_manager
+
+    manager = get_context_cache_manager()
+    model = await manager.get_model(model_name, prefix_version, prefix, ANALYSIS_GENERATION_CONFIG)
+    if model is not None:
+        try:
+            return await generate_response_text(model, [suffix, *contents] if suffix else contents, on_beat)
+        except Exception as e:
+            print(f"   ⚠️ Cached prompt request failed, retrying with the full prompt: {e}")
+            manager.invalidate(model_name, prefix_version)
+
+    model = create_analysis_model(f"{prefix}\n{suffix}" if suffix else prefix, model_name=model_name)
+    return await generate_response_text(model, contents, on_beat)
+
+
+async def analyze_video_content_async(
+    video_path: str,
+    style: str = "viral",
+    pace: str = "fast",
+    voice_id: Optional[str] = None,
+    language: str = "es",
+    words_per_sec: Optional[float] = None,
+    on_beat: Optional[Callable[[Beat], Awaitable[None]]] = None,
+    continuity_context: Optional[str] = None,
+    video_file: Optional[Awaitable[Any]] = None
+) -> VideoAnalysis:
+    """
+    Versión async de analyze_video_content.
+    La subida y la espera de procesamiento no bloquean el event loop (backoff + deadline).
+    Con on_beat, la respuesta llega en streaming y cada beat se entrega al terminar de escribirse.
+    Con video_file (una subida ya en marcha, p. ej. una asyncio.Task) no se vuelve a subir.
+    """
+    from src.infrastructure.video.video_service import check_video_duration
+
+    # 1. Upload and wait for ACTIVE (cancellable) while scene cuts, duration and WPS are
+    #    computed locally; the prompt is ready before Google finishes processing the file
+    stages = await (
+        Pipeline("analysis.unified")
+        .stage("video_file", video_file_stage(video_file), needs=("video_path",))
+        .stage("scene_cuts", detect_scene_cuts_async, needs=("video_path",))
+        .stage("duration", check_video_duration, needs=("video_path",), service="media")
+        .stage("wps", functools.partial(resolve_wps, voice_id, language, style, words_per_sec), service="elevenlabs")
+        .stage(
+            "prompt",
+            lambda duration, wps, scene_cuts: build_analysis_prompt_parts(
+                video_path, style, pace, voice_id, language, wps,
+                None, continuity_context, scene_cuts, video_duration=duration
+            ),
+            needs=("duration", "wps", "scene_cuts"),
+            service="media"
+        )
+        .run(video_path=video_path)
+    )
+    print(f"   ⏱️ Analysis inputs: {stages.summary()}")
+    video_file, scene_cuts = stages["video_file"], stages["scene_cuts"]
+    prefix, suffix = stages["prompt"]
+
+    # --- UNIFIED ANALYSIS & NARRATION ---
+    print("   ↳ 🎬 Analyzing video and generating narrative...")
+
+    try:
+        text = await generate_with_cached_prefix(
+            prefix, suffix, unified_rules_version(),
+            [video_file, f"Analiza este video y genera la narrativa completa."], on_beat
+        )
+        print(f"   ✅ Gemini response received ({len(text)} chars)")
+
+    except Exception as e:
+        print(f"❌ Error calling Gemini API: {e}")
+        return VideoAnalysis()
+
+    analysis = parse_analysis_response(text)
+    snap_to_scene_cuts(analysis, scene_cuts)
+    return analysis
+
+
+async def analyze_video_frames_async(
+    video_path: str,
+    style: str = "viral",
+    pace: str = "fast",
+    voice_id: Optional[str] = None,
+    language: str = "es",
+    words_per_sec: Optional[float] = None,
+    on_beat: Optional[Callable[[Beat], Awaitable[None]]] = None
+) -> VideoAnalysis:
+    """
+    Modo keyframe-sampling: envía N fotogramas JPEG con timestamps en una sola petición inline.
+    Evita la subida y la cola de procesamiento de archivos de Google (lo más lento y variable).
+    """
+    from src.infrastructure.video.frame_sampler import sample_frames
+    from src.infrastructure.video.video_service import check_video_duration
+
+    # Frame sampling waits for the scene cuts; WPS and the prompt overlap with it
+    stages = await (
+        Pipeline("analysis.frames")
+        .stage("scene_cuts", detect_scene_cuts_async, needs=("video_path",))
+        .stage("duration", check_video_duration, needs=("video_path",), service="media")
+        .stage("wps", functools.partial(resolve_wps, voice_id, language, style, words_per_sec), service="elevenlabs")
+        .stage(
+            "frames",
+            lambda video_path, duration, scene_cuts: sample_frames(video_path, duration, scene_cuts),
+            needs=("video_path", "duration", "scene_cuts"),
+            service="media"
+        )
+        .stage(
+            "prompt",
+            lambda duration, wps, scene_cuts: build_analysis_prompt_parts(
+                video_path, style, pace, voice_id, language, wps,
+                None, None, scene_cuts, video_duration=duration
+            ),
+            needs=("duration", "wps", "scene_cuts"),
+            service="media"
+        )
+        .run(video_path=video_path)
+    )
+    print(f"   ⏱️ Analysis inputs: {stages.summary()}")
+    scene_cuts, duration, frames = stages["scene_cuts"], stages["duration"], stages["frames"]
+    if not frames:
+        print("❌ No frames could be sampled from the video")
+        return VideoAnalysis()
+
+    print("   ↳ 🖼️ Analyzing sampled frames and generating narrative...")
+    prefix, suffix = stages["prompt"]
+    suffix += "\n" + get_prompt_registry().render("video", "frames_input")
+
+    contents = []
+    for frame in frames:
+        contents.append(f"[t={frame.time_s:.2f}s]")
+        contents.append({"mime_type": "image/jpeg", "data": frame.jpeg})
+    contents.append(f"El video dura {duration:.1f}s. Analiza estos fotogramas y genera la narrativa completa.")
+
+    try:
+        text = await generate_with_cached_prefix(prefix, suffix, unified_rules_version(), contents, on_beat)
+        print(f"   ✅ Gemini response received ({len(text)} chars)")
+
+    except Exception as e:
+        print(f"❌ Error calling Gemini API: {e}")
+        return VideoAnalysis()
+
+    analysis = parse_analysis_response(text)
+    analysis.duration_s = duration
+    snap_to_scene_cuts(analysis, scene_cuts)
+    return analysis
+
+
+async def extract_visual_timeline_async(video_path: str, video_file: Optional[Awaitable[Any]] = None) -> VideoAnalysis:
+    """
+    Etapa 1 del modo two-stage: extrae solo el timeline visual del video.
+    El resultado no depende de estilo, ritmo ni idioma, así que se cachea por video.
+    Con video_file (una subida ya en marcha) no se vuelve a subir.
+
+    Returns:
+        VideoAnalysis con duration_s y visual_timeline (sin beats)
+    """
+    from src.infrastructure.video.video_service import check_video_duration
+
+    stages = await (
+        Pipeline("analysis.timeline")
+        .stage("video_file", video_file_stage(video_file), needs=("video_path",))
+        .stage("scene_cuts", detect_scene_cuts_async, needs=("video_path",))
+        .stage("duration", check_video_duration, needs=("video_path",), service="media")
+        .run(video_path=video_path)
+    )
+    print(f"   ⏱️ Timeline inputs: {stages.summary()}")
+    video_file, scene_cuts, duration = stages["video_file"], stages["scene_cuts"], stages["duration"]
+
+    print("   ↳ 🎞️ Extracting visual timeline...")
+    prefix = get_prompt_registry().render("video", "visual_timeline")
+    suffix = scene_cuts_block(scene_cuts) if scene_cuts else ""
+    try:
+        text = await generate_with_cached_prefix(
+            prefix, suffix, get_prompt_registry().get("video", "visual_timeline").version,
+            [video_file, "Describe el timeline visual de este video."]
+        )
+        data = json.loads(clean_json_response(text))
+        timeline = [VisualBeat(**vb) for vb in data.get("visual_timeline", [])]
+    except Exception as e:
+        print(f"❌ Error extracting visual timeline: {e}")
+        return VideoAnalysis()
+
+    print(f"   ✅ Visual timeline: {len(timeline)} entries")
+    return VideoAnalysis(duration_s=duration, visual_timeline=timeline)
+
+
+async def narrate_visual_timeline_async(
+    video_path: str,
+    visual_timeline: List[VisualBeat],
+    style: str = "viral",
+    pace: str = "fast",
+    voice_id: Optional[str] = None,
+    language: str = "es",
+    words_per_sec: Optional[float] = None,
+    on_beat: Optional[Callable[[Beat], Awaitable[None]]] = None
+) -> VideoAnalysis:
+    """
+    Etapa 2 del modo two-stage: narración solo de texto sobre un timeline ya extraído.
+    No sube ni procesa el video, por eso cambiar estilo/ritmo/idioma tarda segundos.
+    """
+    print("   ↳ ✍️ Narrating cached visual timeline (text-only)...")
+    prefix, suffix = await run_blocking(
+        "media",
+        build_analysis_prompt_parts, video_path, style, pace, voice_id, language, words_per_sec, visual_timeline
+    )
+
+    try:
+        text = await generate_with_cached_prefix(
+            prefix, suffix, unified_rules_version(),
+            ["Genera la narrativa completa a partir del timeline visual."], on_beat,
+            model_name=NARRATION_MODEL
+        )
+        print(f"   ✅ Gemini response received ({len(text)} chars)")
+
+    except Exception as e:
+        print(f"❌ Error calling Gemini API: {e}")
+        return VideoAnalysis()
+
+    analysis = parse_analysis_response(text)
+    analysis.visual_timeline = visual_timeline
+    return analysis
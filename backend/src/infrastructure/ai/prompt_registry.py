@@ -0,0 +1,153 @@
+"""
+Prompt Registry
+Loads the prompt templates under src/prompts once, pre-parses their
+placeholders and re-reads a file only when its mtime changes. Each template
+carries a content hash so caches keyed on prompts invalidate themselves.
+"""
+import os
+import hashlib
+import threading
+from pathlib import Path
+from string import Formatter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Prompts directory (in src/prompts - sibling of infrastructure)
+PROMPTS_DIR = Path(__file__).parent.parent.parent / "prompts"
+# Disable in production images where prompts never change to skip the stat() per render
+PROMPT_HOT_RELOAD = os.getenv("PROMPT_HOT_RELOAD", "true").lower() == "true"
+
+
+class PromptTemplate:
+    """A prompt file compiled into literal/placeholder segments"""
+
+    def __init__(self, name: str, text: str, mtime_ns: int):
+        self.name = name
+        self.text = text
+        self.mtime_ns = mtime_ns
+        self.version = hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+        # str.format syntax: {field}, {field:.1f}; {{ and }} are literal braces
+        self._segments: List[Tuple[str, Optional[str], str, Optional[str]]] = list(Formatter().parse(text))
+        self.fields = {field for _, field, _, _ in self._segments if field}
+
+    def render(self, **values) -> str:
+        """
+        Fill the placeholders (same result as text.format(**values))
+
+        Raises:
+            KeyError: If a placeholder has no value
+        """
+        parts = []
+        for literal, field, spec, conversion in self._segments:
+            parts.append(literal)
+            if field is None:
+                continue
+            value = values[field]
+            if conversion == "r":
+                value = repr(value)
+            elif conversion == "s":
+                value = str(value)
+            parts.append(format(value, spec or ""))
+        return "".join(parts)
+
+
+def parse_sections(text: str) -> Dict[str, str]:
+    """Parse "[name]" sections (one description per name, lines joined by spaces)"""
+    sections = {}
+    current = None
+    lines = []
+    for line in text.split("\n"):
+        if line.startswith("[") and line.endswith("]"):
+            if current and lines:
+                sections[current] = " ".join(lines).strip()
+            current = line[1:-1]
+            lines = []
+        elif current and line.strip():
+            lines.append(line.strip())
+
+    if current and lines:
+        sections[current] = " ".join(lines).strip()
+    return sections
+
+
+class PromptRegistry:
+    """Thread-safe cache of compiled prompt templates"""
+
+    def __init__(self, prompts_dir: Path = PROMPTS_DIR, hot_reload: bool = PROMPT_HOT_RELOAD):
+        self.prompts_dir = Path(prompts_dir)
+        self.hot_reload = hot_reload
+        self._templates: Dict[Tuple[str, str], PromptTemplate] = {}
+        self._sections: Dict[Tuple[str, str], Tuple[str, Dict[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, category: str, name: str) -> PromptTemplate:
+        """
+        Compiled template for prompts/<category>/<name>.txt
+
+        Raises:
+            FileNotFoundError: If the prompt file does not exist
+        """
+        key = (category, name)
+        cached = self._templates.get(key)
+        if cached and not self.hot_reload:
+            return cached
+
+        path = self.prompts_dir / category / f"{name}.txt"
+        mtime_ns = path.stat().st_mtime_ns
+        if cached and cached.mtime_ns == mtime_ns:
+            return cached
+
+        with self._lock:
+            cached = self._templates.get(key)
+            if cached and cached.mtime_ns == mtime_ns:
+                return cached
+            template = PromptTemplate(name, path.read_text(encoding="utf-8"), mtime_ns)
+            self._templates[key] = template
+            if cached:
+                print(f"🔄 Prompt reloaded: {category}/{name} ({cached.version} -> {template.version})")
+            return template
+
+    def render(self, category: str, name: str, **values) -> str:
+        """Render a template with str.format-style values"""
+        return self.get(category, name).render(**values)
+
+    def sections(self, category: str, name: str) -> Dict[str, str]:
+        """Named "[section]" blocks of a prompt file (e.g. style descriptions), parsed once per version"""
+        template = self.get(category, name)
+        cached = self._sections.get((category, name))
+        if cached and cached[0] == template.version:
+            return cached[1]
+        parsed = parse_sections(template.text)
+        self._sections[(category, name)] = (template.version, parsed)
+        return parsed
+
+    def version(self, category: str, names: Optional[Iterable[str]] = None) -> str:
+        """
+        Combined content hash of a set of templates (all files of the category by default)
+
+        Args:
+            category: Prompt folder
+            names: Template names to include
+
+        Returns:
+            12-char hex digest that changes whenever any included file changes
+        """
+        if names is None:
+            names = [path.stem for path in (self.prompts_dir / category).glob("*.txt")]
+        digest = hashlib.sha256()
+        for name in sorted(names):
+            digest.update(f"{name}:{self.get(category, name).version};".encode("utf-8"))
+        return digest.hexdigest()[:12]
+
+
+_registry: Optional[PromptRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Process-wide prompt registry"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PromptRegistry()
+    return _registry
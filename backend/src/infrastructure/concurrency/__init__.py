@@ -0,0 +1,16 @@
+# Re-export from service pools - import directly from file
+from src.infrastructure.concurrency.service_pools import (
+    ServicePool,
+    get_service_pool,
+    run_blocking,
+    service_pool_stats,
+    shutdown_service_pools
+)
+
+# Re-export from pipeline - import directly from file
+from src.infrastructure.concurrency.pipeline import (
+    Pipeline,
+    PipelineResult,
+    PipelineError,
+    pipeline_stats
+)
@@ -0,0 +1,208 @@
+"""
+Pipeline - small dependency-graph executor for workflow stages
+Stages declare which inputs/stage outputs they need and start as soon as
+those are ready, so independent work (upload, probes, calibration, image
+fetches) overlaps and the wall time follows the critical path instead of
+the sum of the stages. Every run records per-stage timings.
+"""
+import time
+import asyncio
+import inspect
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.infrastructure.concurrency.service_pools import run_blocking
+
+
+class PipelineError(Exception):
+    """The stage graph is invalid (unknown dependency, duplicate name, cycle)"""
+
+
+@dataclass
+class Stage:
+    """One unit of work; fn receives the outputs named in `needs` as keyword arguments"""
+    name: str
+    fn: Callable[..., Any]
+    needs: Tuple[str, ...] = ()
+    service: Optional[str] = None  # run a blocking fn on this service pool (see service_pools.py)
+
+
+@dataclass
+class StageTiming:
+    start_s: float  # relative to the start of the run
+    end_s: float
+
+    @property
+    def duration_s(self) -> float:
+        return self.end_s - self.start_s
+
+
+@dataclass
+class PipelineResult:
+    """Stage outputs plus where the time went"""
+    outputs: Dict[str, Any]
+    timings: Dict[str, StageTiming] = field(default_factory=dict)
+    total_s: float = 0.0
+    critical_path: List[str] = field(default_factory=list)
+
+    def __getitem__(self, name: str) -> Any:
+        return self.outputs[name]
+
+    @property
+    def stages_sum_s(self) -> float:
+        return sum(t.duration_s for t in self.timings.values())
+
+    def summary(self) -> str:
+        stages = ", ".join(f"{name} {t.duration_s:.1f}s" for name, t in self.timings.items())
+        return (f"{self.total_s:.1f}s wall vs {self.stages_sum_s:.1f}s sequential "
+                f"(critical path: {' → '.join(self.critical_path)}) [{stages}]")
+
+
+class Pipeline:
+    """
+    Declarative stage graph
+
+        result = await (
+            Pipeline("analysis")
+            .stage("upload", upload_video_for_analysis, needs=("video_path",))
+            .stage("duration", check_video_duration, needs=("video_path",), service="media")
+            .stage("prompt", build_prompt, needs=("duration",))
+            .run(video_path=path)
+        )
+
+    If a stage fails, the stages still running are cancelled and the
+    original exception propagates.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.stages: Dict[str, Stage] = {}
+
+    def stage(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        needs: Tuple[str, ...] = (),
+        service: Optional[str] = None
+    ) -> "Pipeline":
+        """Add a stage (chainable)"""
+        if name in self.stages:
+            raise PipelineError(f"Duplicate stage '{name}' in pipeline {self.name}")
+        self.stages[name] = Stage(name, fn, tuple(needs), service)
+        return self
+
+    def _order(self, inputs: Dict[str, Any]) -> List[Stage]:
+        """Topological order of the stages, validating the graph"""
+        for stage in self.stages.values():
+            if stage.name in inputs:
+                raise PipelineError(f"Stage '{stage.name}' shadows an input of pipeline {self.name}")
+            for dep in stage.needs:
+                if dep not in self.stages and dep not in inputs:
+                    raise PipelineError(f"Stage '{stage.name}' needs unknown '{dep}' in pipeline {self.name}")
+
+        ordered, done = [], set(inputs)
+        pending = list(self.stages.values())
+        while pending:
+            ready = [s for s in pending if all(dep in done for dep in s.needs)]
+            if not ready:
+                raise PipelineError(f"Cycle between stages {[s.name for s in pending]} in pipeline {self.name}")
+            for stage in ready:
+                ordered.append(stage)
+                done.add(stage.name)
+                pending.remove(stage)
+        return ordered
+
+    async def _call(self, stage: Stage, kwargs: Dict[str, Any]) -> Any:
+        if stage.service:
+            return await run_blocking(stage.service, stage.fn, **kwargs)
+        result = stage.fn(**kwargs)
+        return await result if inspect.isawaitable(result) else result
+
+    async def run(self, **inputs) -> PipelineResult:
+        """
+        Run every stage as soon as its dependencies are done
+
+        Args:
+            **inputs: Initial values stages can depend on by name
+
+        Returns:
+            PipelineResult with each stage's output, timings and critical path
+        """
+        order = self._order(inputs)
+        t0 = time.perf_counter()
+        outputs: Dict[str, Any] = dict(inputs)
+        timings: Dict[str, StageTiming] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(stage: Stage):
+            deps = [tasks[dep] for dep in stage.needs if dep in tasks]
+            if deps:
+                await asyncio.gather(*deps)
+            start = time.perf_counter() - t0
+            result = await self._call(stage, {dep: outputs[dep] for dep in stage.needs})
+            timings[stage.name] = StageTiming(start, time.perf_counter() - t0)
+            outputs[stage.name] = result
+            return result
+
+        for stage in order:
+            tasks[stage.name] = asyncio.create_task(run_stage(stage), name=f"{self.name}:{stage.name}")
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        result = PipelineResult(
+            outputs={name: outputs[name] for name in self.stages},
+            timings={stage.name: timings[stage.name] for stage in order},
+            total_s=time.perf_counter() - t0,
+            critical_path=self._critical_path(timings)
+        )
+        record_pipeline_timings(self.name, result)
+        return result
+
+    def _critical_path(self, timings: Dict[str, StageTiming]) -> List[str]:
+        """Walk back from the last stage to finish through the dependency that finished last"""
+        if not timings:
+            return []
+        path = [max(timings, key=lambda name: timings[name].end_s)]
+        while True:
+            deps = [dep for dep in self.stages[path[-1]].needs if dep in timings]
+            if not deps:
+                break
+            path.append(max(deps, key=lambda name: timings[name].end_s))
+        return list(reversed(path))
+
+
+_pipeline_timings: Dict[str, Dict[str, List[float]]] = {}
+_pipeline_timings_lock = threading.Lock()
+
+
+def record_pipeline_timings(name: str, result: PipelineResult):
+    with _pipeline_timings_lock:
+        samples = _pipeline_timings.setdefault(name, {})
+        for key, value in [("total", result.total_s)] + [(s, t.duration_s) for s, t in result.timings.items()]:
+            series = samples.setdefault(key, [])
+            series.append(value)
+            # Keep a rolling window so the stats follow current behaviour
+            del series[:-200]
+
+
+def pipeline_stats() -> Dict[str, Dict]:
+    """Mean/max seconds per pipeline and stage ('total' is the wall time of a run)"""
+    with _pipeline_timings_lock:
+        return {
+            name: {
+                key: {
+                    "count": len(series),
+                    "mean_s": round(sum(series) / len(series), 2),
+                    "max_s": round(max(series), 2),
+                }
+                for key, series in samples.items()
+            }
+            for name, samples in _pipeline_timings.items()
+        }
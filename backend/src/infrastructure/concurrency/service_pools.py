@@ -0,0 +1,155 @@
+"""
+Service Pools - bounded thread pools for blocking vendor SDK calls
+Each external service (Gemini, ElevenLabs, object storage) gets its own
+executor, so a slow vendor can only exhaust its own threads instead of the
+shared asyncio default pool. Every pool tracks queue depth and how long calls
+waited for a thread versus how long they ran.
+"""
+import os
+import time
+import asyncio
+import threading
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, List, Optional
+
+# Default threads per service; override with SERVICE_POOL_<NAME>_WORKERS (e.g. SERVICE_POOL_GEMINI_WORKERS=16)
+SERVICE_POOL_DEFAULTS = {
+    "gemini": 8,
+    "elevenlabs": 8,
+    "storage": 4,
+    # Local file work: hashing, probing, frame sampling, scene detection
+    "media": max(2, min(8, os.cpu_count() or 2)),
+}
+SERVICE_POOL_DEFAULT_WORKERS = int(os.getenv("SERVICE_POOL_DEFAULT_WORKERS", "4"))
+
+
+def _pool_size(name: str) -> int:
+    default = SERVICE_POOL_DEFAULTS.get(name, SERVICE_POOL_DEFAULT_WORKERS)
+    return max(1, int(os.getenv(f"SERVICE_POOL_{name.upper()}_WORKERS", str(default))))
+
+
+def _summary(samples: List[float]) -> Dict:
+    if not samples:
+        return {"mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(samples)
+    return {
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 1),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+        "max_ms": round(ordered[-1] * 1000, 1),
+    }
+
+
+class ServicePool:
+    """Thread pool dedicated to one external service, with queue/wait metrics"""
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"svc-{name}")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self._waits: List[float] = []
+        self._runs: List[float] = []
+
+    def _call(self, submitted: float, ctx: contextvars.Context, fn: Callable) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self.queued -= 1
+            self.active += 1
+            self._waits.append(started - submitted)
+            # Rolling window so the stats follow current behaviour
+            del self._waits[:-200]
+
+        ok = False
+        try:
+            result = ctx.run(fn)
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self.active -= 1
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                self._runs.append(time.perf_counter() - started)
+                del self._runs[:-200]
+
+    def _on_done(self, future: Future):
+        # A call cancelled while still queued never reaches _call
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking fn(*args, **kwargs) on this service's threads and await it
+
+        Context variables are propagated like asyncio.to_thread does.
+        """
+        with self._lock:
+            self.queued += 1
+        call = functools.partial(fn, *args, **kwargs)
+        future = self._executor.submit(self._call, time.perf_counter(), contextvars.copy_context(), call)
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queued": self.queued,
+                "active": self.active,
+                "completed": self.completed,
+                "failed": self.failed,
+                "wait": _summary(self._waits),
+                "run": _summary(self._runs),
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_service_pools: Dict[str, ServicePool] = {}
+_service_pools_lock = threading.Lock()
+
+
+def get_service_pool(name: str) -> ServicePool:
+    """Pool for an external service, created on first use"""
+    with _service_pools_lock:
+        pool = _service_pools.get(name)
+        if pool is None:
+            pool = _service_pools[name] = ServicePool(name, _pool_size(name))
+        return pool
+
+
+async def run_blocking(service: str, fn: Callable, *args, **kwargs) -> Any:
+    """
+    Await a blocking call on the given service's pool
+
+    Args:
+        service: Pool name, e.g. "gemini", "elevenlabs", "storage", "media"
+        fn: Blocking callable
+    """
+    return await get_service_pool(service).run(fn, *args, **kwargs)
+
+
+def service_pool_stats() -> Dict[str, Dict]:
+    """Metrics of every pool used so far"""
+    with _service_pools_lock:
+        pools = list(_service_pools.values())
+    return {pool.name: pool.stats() for pool in pools}
+
+
+def shutdown_service_pools(names: Optional[List[str]] = None):
+    with _service_pools_lock:
+        pools = [p for n, p in _service_pools.items() if names is None or n in names]
+        for pool in pools:
+            _service_pools.pop(pool.name, None)
+    for pool in pools:
+        pool.shutdown()
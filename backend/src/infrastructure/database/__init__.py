@@ -8,6 +8,8 @@ from src.infrastructure.database.database import (
     User,
     Video,
     SocialAccount,
+    AnalysisCacheEntry,
+    Job,
     get_user_by_email,
     get_user_by_id,
     create_user
@@ -89,6 +89,40 @@ class SocialAccount(Base):
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
+# Analysis cache model (Gemini results keyed by video hash + analysis parameters)
+class AnalysisCacheEntry(Base):
+    __tablename__ = "analysis_cache"
+
+    cache_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    video_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    params: Mapped[dict] = mapped_column(JSON, nullable=False)
+    result: Mapped[dict] = mapped_column(JSON, nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+# Background job model (queue claimed by workers with FOR UPDATE SKIP LOCKED)
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)  # analyze_video, create_reel
+    status: Mapped[str] = mapped_column(String(20), default="queued", index=True)  # queued, running, completed, failed
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    result: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    progress: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)  # latest ProgressEvent
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    credits_cost: Mapped[int] = mapped_column(Integer, default=0)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=1)
+    worker_id: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    run_after: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    heartbeat_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
 # Dependency to get database session
 async def get_db_session():
     """Dependency to get database session"""
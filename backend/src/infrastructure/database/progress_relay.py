@@ -0,0 +1,119 @@
+"""
+Progress Relay - progress events across API processes via Postgres LISTEN/NOTIFY
+Each API process publishes its progress events with pg_notify and listens on
+the same channel, delivering the other processes' events to its local
+ProgressBroker. An SSE subscriber therefore sees the events of a request no
+matter which process (or pod) handled the POST.
+"""
+import os
+import json
+import uuid
+import asyncio
+from typing import Any, Optional
+
+from src.infrastructure.database.database import DATABASE_URL
+
+PROGRESS_RELAY_ENABLED = os.getenv("PROGRESS_RELAY_ENABLED", "true").lower() == "true"
+PROGRESS_NOTIFY_CHANNEL = os.getenv("PROGRESS_NOTIFY_CHANNEL", "progress_events")
+# NOTIFY payloads are capped at 8000 bytes; messages are short, but never risk the limit
+PROGRESS_MESSAGE_MAX_CHARS = 500
+# Events published while the connection is down beyond this backlog are dropped (progress is best-effort)
+PROGRESS_RELAY_BACKLOG = 1000
+PROGRESS_RELAY_RECONNECT_S = 2.0
+
+
+def _asyncpg_dsn(url: str) -> str:
+    """asyncpg wants a plain postgresql:// URL, not SQLAlchemy's postgresql+asyncpg://"""
+    scheme, sep, rest = url.partition("://")
+    return f"{scheme.split('+')[0]}{sep}{rest}"
+
+
+class PostgresProgressRelay:
+    """One dedicated connection per process: NOTIFY our events, LISTEN for everyone else's"""
+
+    def __init__(self, broker: Any, dsn: str = DATABASE_URL, channel: str = PROGRESS_NOTIFY_CHANNEL):
+        self.broker = broker
+        self.dsn = _asyncpg_dsn(dsn)
+        self.channel = channel
+        # Our own notifications come back too; they were already delivered locally
+        self.origin = uuid.uuid4().hex
+        self._outbox: asyncio.Queue = asyncio.Queue(maxsize=PROGRESS_RELAY_BACKLOG)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Connect in the background and hook into the broker (call from the event loop)"""
+        self._task = asyncio.create_task(self._run(), name="progress-relay")
+        self.broker.relay = self.publish
+
+    async def stop(self):
+        self.broker.relay = None
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def publish(self, progress_id: str, user_id: int, event: Any):
+        """Queue an event for NOTIFY (broker relay hook, event loop thread)"""
+        data = event.to_dict()
+        data["message"] = (data.get("message") or "")[:PROGRESS_MESSAGE_MAX_CHARS]
+        payload = json.dumps({"origin": self.origin, "id": progress_id, "user": user_id, "event": data}, default=str)
+        try:
+            self._outbox.put_nowait(payload)
+        except asyncio.QueueFull:
+            print("   ⚠️ Progress relay backlog full, dropping event")
+
+    def _on_notify(self, connection, pid, channel, payload: str):
+        try:
+            message = json.loads(payload)
+            if message.get("origin") == self.origin:
+                return
+            self.broker.deliver(message["id"], message["user"], message["event"])
+        except Exception as e:
+            print(f"   ⚠️ Ignoring malformed progress notification: {e}")
+
+    async def _run(self):
+        import asyncpg
+
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                await connection.add_listener(self.channel, self._on_notify)
+                print(f"📡 Progress relay listening on '{self.channel}'")
+                # Sends go through this one task so notifications keep their order
+                while True:
+                    payload = await self._outbox.get()
+                    await connection.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Progress relay connection lost, reconnecting: {e}")
+                await asyncio.sleep(PROGRESS_RELAY_RECONNECT_S)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await asyncio.shield(connection.close())
+
+
+_progress_relay: Optional[PostgresProgressRelay] = None
+
+
+def start_progress_relay(broker: Any) -> Optional[PostgresProgressRelay]:
+    """
+    Start relaying a ProgressBroker's events between API processes (no-op when disabled)
+
+    Args:
+        broker: The process's ProgressBroker (needs a `relay` attribute and deliver())
+    """
+    global _progress_relay
+    if not PROGRESS_RELAY_ENABLED or _progress_relay is not None:
+        return _progress_relay
+    _progress_relay = PostgresProgressRelay(broker)
+    _progress_relay.start()
+    return _progress_relay
+
+
+async def stop_progress_relay():
+    global _progress_relay
+    if _progress_relay is not None:
+        await _progress_relay.stop()
+        _progress_relay = None
@@ -0,0 +1,9 @@
+# Re-export from job queue - import directly from file
+from src.infrastructure.jobs.job_queue import (
+    JobQueue,
+    InsufficientCreditsError,
+    JobLostError,
+    job_to_dict,
+    JOB_KINDS,
+    JOB_CREDIT_COSTS
+)
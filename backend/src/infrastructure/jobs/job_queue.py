@@ -0,0 +1,257 @@
+"""
+Job Queue - Postgres-backed background jobs
+API pods insert rows; worker processes claim them with
+SELECT ... FOR UPDATE SKIP LOCKED so any number of workers can poll the same
+table without double-processing. Credits are deducted in the same transaction
+that marks a job completed, and only by the worker that still owns the job.
+"""
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.database.database import async_session_maker, Job, User
+
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "2"))
+JOB_RETRY_DELAY_S = float(os.getenv("JOB_RETRY_DELAY_S", "30"))
+# A running job whose worker has not sent a heartbeat for this long is considered lost
+JOB_STALE_AFTER_S = float(os.getenv("JOB_STALE_AFTER_S", "180"))
+
+JOB_KINDS = ("analyze_video", "create_reel")
+JOB_CREDIT_COSTS = {"analyze_video": 1, "create_reel": 20}
+
+
+class InsufficientCreditsError(Exception):
+    """The user can no longer pay for the job when it is about to commit"""
+
+
+class JobLostError(Exception):
+    """The worker no longer owns the job (it was requeued as stale)"""
+
+
+def job_to_dict(job: Job, include_result: bool = False) -> Dict:
+    """Public view of a job"""
+    data = {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "error": job.error,
+        "progress": job.progress,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+    if include_result:
+        data["result"] = job.result
+    return data
+
+
+class JobQueue:
+    """Submit, claim and finish jobs stored in the jobs table"""
+
+    def __init__(self, max_attempts: int = JOB_MAX_ATTEMPTS, retry_delay_s: float = JOB_RETRY_DELAY_S):
+        self.max_attempts = max_attempts
+        self.retry_delay = timedelta(seconds=retry_delay_s)
+
+    async def submit(self, user_id: int, kind: str, payload: Dict, credits_cost: Optional[int] = None) -> Job:
+        """
+        Enqueue a job
+
+        Args:
+            user_id: Owner (charged on completion)
+            kind: One of JOB_KINDS
+            payload: JSON-serializable use case parameters
+            credits_cost: Credits charged on success (defaults to JOB_CREDIT_COSTS[kind])
+
+        Returns:
+            The queued Job
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind '{kind}', expected one of {JOB_KINDS}")
+
+        job = Job(
+            id=str(uuid.uuid4()),
+            user_id=user_id,
+            kind=kind,
+            status="queued",
+            payload=payload,
+            credits_cost=JOB_CREDIT_COSTS[kind] if credits_cost is None else credits_cost,
+            attempts=0,
+            max_attempts=self.max_attempts,
+            created_at=datetime.utcnow(),
+            run_after=datetime.utcnow()
+        )
+        async with async_session_maker() as session:
+            session.add(job)
+            await session.commit()
+        print(f"📥 Job {job.id} queued ({kind}, user {user_id})")
+        return job
+
+    async def get(self, job_id: str, user_id: Optional[int] = None) -> Optional[Job]:
+        """Job by id, optionally restricted to its owner"""
+        async with async_session_maker() as session:
+            job = await session.get(Job, job_id)
+            if job is None or (user_id is not None and job.user_id != user_id):
+                return None
+            return job
+
+    async def list_for_user(self, user_id: int, limit: int = 20) -> List[Job]:
+        """Most recent jobs of a user"""
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(Job).where(Job.user_id == user_id).order_by(Job.created_at.desc()).limit(limit)
+            )
+            return list(result.scalars().all())
+
+    async def claim(self, worker_id: str, kinds: Optional[List[str]] = None) -> Optional[Job]:
+        """
+        Atomically take the oldest runnable queued job
+
+        Rows locked by another worker's claim are skipped instead of waited on.
+
+        Returns:
+            The job, now 'running' and owned by worker_id, or None if the queue is empty
+        """
+        now = datetime.utcnow()
+        query = (
+            select(Job)
+            .where(Job.status == "queued", Job.run_after <= now)
+            .order_by(Job.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if kinds:
+            query = query.where(Job.kind.in_(kinds))
+
+        async with async_session_maker() as session:
+            job = (await session.execute(query)).scalar_one_or_none()
+            if job is None:
+                return None
+            job.status = "running"
+            job.worker_id = worker_id
+            job.attempts += 1
+            job.started_at = now
+            job.heartbeat_at = now
+            job.error = None
+            job.progress = None
+            await session.commit()
+            return job
+
+    async def heartbeat(self, job: Job) -> bool:
+        """Refresh the job's heartbeat; False if this worker no longer owns it"""
+        async with async_session_maker() as session:
+            result = await session.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.worker_id == job.worker_id, Job.status == "running")
+                .values(heartbeat_at=datetime.utcnow())
+            )
+            await session.commit()
+            return bool(result.rowcount)
+
+    async def update_progress(self, job: Job, progress: Dict) -> bool:
+        """Store the latest progress event of a running job; False if this worker no longer owns it"""
+        async with async_session_maker() as session:
+            result = await session.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.worker_id == job.worker_id, Job.status == "running")
+                .values(progress=progress)
+            )
+            await session.commit()
+            return bool(result.rowcount)
+
+    async def complete(self, session: AsyncSession, job: Job, result: Dict, progress: Optional[Dict] = None):
+        """
+        Charge the user and mark the job completed in the caller's transaction
+
+        Whatever the handler added to `session` (e.g. the Video row) commits
+        together with the credit deduction and the status change, or not at all.
+        `progress` (the terminal event) is written in the same update, so a
+        client following the row never sees the status without it.
+
+        Raises:
+            InsufficientCreditsError: The user's balance no longer covers the job
+            JobLostError: The job was requeued as stale and belongs to another worker
+        """
+        if job.credits_cost:
+            user = (await session.execute(
+                select(User).where(User.id == job.user_id).with_for_update()
+            )).scalar_one()
+            if user.credits < job.credits_cost:
+                raise InsufficientCreditsError(
+                    f"Insufficient credits ({user.credits} < {job.credits_cost})"
+                )
+            user.credits -= job.credits_cost
+
+        updated = await session.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.worker_id == job.worker_id, Job.status == "running")
+            .values(status="completed", result=result, error=None, finished_at=datetime.utcnow(),
+                    **({"progress": progress} if progress is not None else {}))
+        )
+        if not updated.rowcount:
+            raise JobLostError(f"Job {job.id} is no longer owned by {job.worker_id}")
+        await session.commit()
+        print(f"✅ Job {job.id} completed (charged {job.credits_cost} credits)")
+
+    async def fail(self, job: Job, error: str, retry: bool = True, progress: Optional[Dict] = None) -> bool:
+        """
+        Record a failure; the job is queued again after a delay while attempts remain
+
+        Args:
+            job: Job owned by this worker
+            error: Message shown to the user
+            retry: False for errors a retry cannot fix (e.g. insufficient credits)
+            progress: Final progress event, written with the status change
+
+        Returns:
+            True if the job will be retried, False if it failed for good
+        """
+        now = datetime.utcnow()
+        retrying = retry and job.attempts < job.max_attempts
+        values = (
+            {"status": "queued", "error": error, "worker_id": None, "run_after": now + self.retry_delay}
+            if retrying else
+            {"status": "failed", "error": error, "finished_at": now}
+        )
+        if progress is not None:
+            values["progress"] = progress
+        async with async_session_maker() as session:
+            await session.execute(
+                update(Job)
+                .where(Job.id == job.id, Job.worker_id == job.worker_id, Job.status == "running")
+                .values(**values)
+            )
+            await session.commit()
+        print(f"{'🔁' if retrying else '❌'} Job {job.id} failed (attempt {job.attempts}/{job.max_attempts}): {error}")
+        return retrying
+
+    async def requeue_stale(self, stale_after_s: float = JOB_STALE_AFTER_S) -> List[Job]:
+        """
+        Recover jobs whose worker died: requeue them, or fail them when out of attempts
+
+        Returns:
+            The jobs failed for good (their inputs can be cleaned up)
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=stale_after_s)
+        stale = (Job.status == "running") & (Job.heartbeat_at < cutoff)
+        async with async_session_maker() as session:
+            requeued = await session.execute(
+                update(Job)
+                .where(stale, Job.attempts < Job.max_attempts)
+                .values(status="queued", worker_id=None, error="Worker lost, retrying")
+            )
+            failed = (await session.execute(
+                update(Job)
+                .where(stale, Job.attempts >= Job.max_attempts)
+                .values(status="failed", error="Worker lost", finished_at=datetime.utcnow())
+                .returning(Job)
+            )).scalars().all()
+            await session.commit()
+        recovered = (requeued.rowcount or 0) + len(failed)
+        if recovered:
+            print(f"🧟 Recovered {recovered} stale jobs")
+        return list(failed)
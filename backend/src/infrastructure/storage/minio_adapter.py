@@ -5,6 +5,7 @@ Wraps MinIO for object storage operations
 from typing import Tuple
 import os
 from src.domain.repositories.service_repositories import IStorageRepository
+from src.infrastructure.concurrency import run_blocking
 
 
 class MinIOAdapter(IStorageRepository):
@@ -40,8 +41,10 @@ class MinIOAdapter(IStorageRepository):
         # Create object name with user folder structure
         object_name = f"users/{user_id}/videos/{filename}"
         
-        # Delegate to existing implementation
-        result = upload_file(
+        # Delegate to existing implementation (blocking boto3 transfer, run on the storage pool)
+        result = await run_blocking(
+            "storage",
+            upload_file,
             file_path=file_path,
             object_name=object_name
         )
@@ -65,4 +68,4 @@ class MinIOAdapter(IStorageRepository):
         from src.infrastructure.storage.minio_storage import delete_file  # ✅ Correct function name
         
         # Delegate to existing implementation
-        return delete_file(object_name=object_name)
+        return await run_blocking("storage", delete_file, object_name=object_name)
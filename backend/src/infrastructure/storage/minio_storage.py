@@ -101,6 +101,30 @@ def upload_file(file_path: str, object_name: str) -> Dict[str, str]:
         print(f"❌ Error uploading file: {e}")
         raise
 
+def download_file(object_name: str, file_path: str) -> bool:
+    """
+    Download a file from MinIO
+    
+    Args:
+        object_name: S3 object name
+        file_path: Local destination path
+    
+    Returns:
+        True if downloaded, False if the object doesn't exist or the download failed
+    """
+    s3_client = get_s3_client()
+    
+    try:
+        s3_client.download_file(MINIO_BUCKET_NAME, object_name, file_path)
+        return True
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') not in ('404', 'NoSuchKey'):
+            print(f"❌ Error downloading file: {e}")
+        return False
+    except Exception as e:
+        print(f"❌ Error downloading file: {e}")
+        return False
+
 def delete_file(object_name: str) -> bool:
     """
     Delete a file from MinIO
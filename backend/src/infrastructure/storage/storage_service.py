@@ -4,6 +4,7 @@ Uses S3-compatible object storage (AWS S3 or MinIO)
 """
 from src.infrastructure.storage.minio_storage import create_bucket_if_not_exists, upload_file, delete_file
 from src.infrastructure.database.database import Video, AsyncSession, User
+from src.infrastructure.concurrency import run_blocking
 from sqlalchemy import select
 from datetime import datetime
 from typing import List, Dict, Optional
@@ -28,7 +29,7 @@ async def save_video_to_storage(
         Video database object
     """
     # Ensure bucket exists
-    create_bucket_if_not_exists()
+    await run_blocking("storage", create_bucket_if_not_exists)
     
     # Create object name: users/{user_id}/videos/final_{timestamp}.mp4
     timestamp = int(datetime.utcnow().timestamp())
@@ -36,7 +37,7 @@ async def save_video_to_storage(
     
     # Upload to S3
     try:
-        storage_data = upload_file(video_path, object_name)
+        storage_data = await run_blocking("storage", upload_file, video_path, object_name)
     except Exception as e:
         print(f"❌ Error uploading to S3: {e}")
         # Log error and potentially raise, but we might want to fail gracefully?
@@ -92,7 +93,7 @@ async def delete_video(video_id: int, user_id: int, session: AsyncSession) -> bo
     # Delete from S3
     if video.storage_object_name:
         try:
-            delete_file(video.storage_object_name)
+            await run_blocking("storage", delete_file, video.storage_object_name)
         except Exception as e:
             print(f"Error deleting from S3: {e}")
             # Continue anyway to remove from DB
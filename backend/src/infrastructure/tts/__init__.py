@@ -3,3 +3,5 @@ from src.infrastructure.tts.tts_service import (
     generate_audio_for_beat,
     get_audio_duration
 )
+from src.infrastructure.tts.tts_cache import get_tts_cache
+from src.infrastructure.tts.audio_probe import probe_audio_duration
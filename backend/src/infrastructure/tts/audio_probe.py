@@ -0,0 +1,217 @@
+"""
+Audio duration probe
+Reads MP3 (Xing/Info, VBRI or frame scan) and WAV (RIFF) headers in pure Python,
+falling back to ffprobe for anything else - no decoder process per file.
+"""
+import os
+import struct
+import subprocess
+from typing import Optional
+
+from src.infrastructure.video.media_probe import FFPROBE_BINARY
+
+# Bitrates in kbps indexed by [version_family][layer][bitrate_index]
+# version_family: 0 = MPEG-1, 1 = MPEG-2/2.5 ; layer: 1, 2, 3
+_BITRATES = {
+    (0, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (0, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (0, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (1, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (1, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (1, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+
+# Sample rates indexed by version bits (0 = MPEG-2.5, 2 = MPEG-2, 3 = MPEG-1)
+_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],
+    2: [22050, 24000, 16000],
+    0: [11025, 12000, 8000],
+}
+
+
+def _parse_frame_header(data: bytes, pos: int) -> Optional[dict]:
+    """Decode a 4-byte MPEG audio frame header, or None if it isn't one"""
+    if pos + 4 > len(data):
+        return None
+    b1, b2, b3 = data[pos + 1], data[pos + 2], data[pos + 3]
+    if data[pos] != 0xFF or (b1 & 0xE0) != 0xE0:
+        return None
+
+    version_bits = (b1 >> 3) & 0x03
+    layer_bits = (b1 >> 1) & 0x03
+    bitrate_index = (b2 >> 4) & 0x0F
+    sample_rate_index = (b2 >> 2) & 0x03
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or sample_rate_index == 3:
+        return None
+
+    layer = 4 - layer_bits
+    family = 0 if version_bits == 3 else 1
+    bitrate = _BITRATES[(family, layer)][bitrate_index] * 1000
+    sample_rate = _SAMPLE_RATES[version_bits][sample_rate_index]
+    padding = (b2 >> 1) & 0x01
+    mono = ((b3 >> 6) & 0x03) == 3
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // sample_rate + padding) * 4
+    elif layer == 2:
+        samples = 1152
+        length = 144 * bitrate // sample_rate + padding
+    else:
+        samples = 1152 if family == 0 else 576
+        length = (144 if family == 0 else 72) * bitrate // sample_rate + padding
+
+    return {
+        "family": family,
+        "layer": layer,
+        "sample_rate": sample_rate,
+        "samples": samples,
+        "length": length,
+        "mono": mono,
+    }
+
+
+def _skip_id3v2(data: bytes) -> int:
+    """Offset of the first byte after an ID3v2 tag (0 if there is none)"""
+    if len(data) >= 10 and data[:3] == b"ID3":
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def mp3_duration(data: bytes) -> Optional[float]:
+    """
+    Duration of an MP3 file from its headers
+
+    Uses the Xing/Info or VBRI frame count when present (VBR and LAME CBR
+    files), otherwise walks the frame headers without decoding audio.
+
+    Returns:
+        Duration in seconds, or None if no MPEG frames were found
+    """
+    pos = _skip_id3v2(data)
+
+    # Find the first valid frame (two consecutive headers to avoid false syncs)
+    first = None
+    while pos < len(data) - 4:
+        header = _parse_frame_header(data, pos)
+        if header and header["length"] > 0:
+            following = _parse_frame_header(data, pos + header["length"])
+            if following or pos + header["length"] >= len(data):
+                first = header
+                break
+        pos += 1
+    if first is None:
+        return None
+
+    # Xing/Info lives right after the side information
+    if first["family"] == 0:
+        side_info = 17 if first["mono"] else 32
+    else:
+        side_info = 9 if first["mono"] else 17
+    xing = pos + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        if flags & 0x01:
+            frames = struct.unpack(">I", data[xing + 8:xing + 12])[0]
+            return frames * first["samples"] / first["sample_rate"]
+
+    vbri = pos + 4 + 32
+    if data[vbri:vbri + 4] == b"VBRI":
+        frames = struct.unpack(">I", data[vbri + 14:vbri + 18])[0]
+        return frames * first["samples"] / first["sample_rate"]
+
+    # Frame scan: sum samples of every frame header
+    total_samples = 0
+    while pos < len(data) - 4:
+        header = _parse_frame_header(data, pos)
+        if header is None or header["length"] <= 0:
+            if data[pos:pos + 3] == b"TAG":
+                break  # ID3v1 trailer
+            pos += 1
+            continue
+        total_samples += header["samples"]
+        pos += header["length"]
+
+    return total_samples / first["sample_rate"]
+
+
+def wav_duration(data: bytes, file_size: Optional[int] = None) -> Optional[float]:
+    """
+    Duration of a WAV file from its RIFF chunks
+
+    Args:
+        data: At least the beginning of the file (up to the data chunk header)
+        file_size: Real file size, used when the data chunk size is a streaming placeholder
+
+    Returns:
+        Duration in seconds, or None if the header is not a PCM RIFF/WAVE header
+    """
+    if len(data) < 12 or data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+
+    byte_rate = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        chunk_size = struct.unpack("<I", data[pos + 4:pos + 8])[0]
+        body = pos + 8
+
+        if chunk_id == b"fmt " and body + 12 <= len(data):
+            byte_rate = struct.unpack("<I", data[body + 8:body + 12])[0]
+        elif chunk_id == b"data":
+            if not byte_rate:
+                return None
+            if chunk_size in (0, 0xFFFFFFFF) and file_size:
+                chunk_size = file_size - body
+            return chunk_size / byte_rate
+
+        pos = body + chunk_size + (chunk_size & 1)
+
+    return None
+
+
+def _ffprobe_duration(path: str) -> float:
+    """Container duration via ffprobe (one subprocess, no decoding)"""
+    result = subprocess.run(
+        [
+            FFPROBE_BINARY, "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "default=noprint_wrappers=1:nokey=1",
+            path
+        ],
+        capture_output=True,
+        check=True
+    )
+    return float(result.stdout.strip() or 0.0)
+
+
+def probe_audio_duration(path: str) -> float:
+    """
+    Duration of a media file, parsing MP3/WAV headers directly when possible
+
+    Args:
+        path: Audio (or any media) file
+
+    Returns:
+        Duration in seconds
+
+    Raises:
+        Exception if neither the header parsers nor ffprobe can read the file
+    """
+    file_size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        head = f.read(64 * 1024)
+
+        if head[:4] == b"RIFF":
+            duration = wav_duration(head, file_size)
+            if duration is not None:
+                return duration
+
+        elif head[:3] == b"ID3" or (len(head) > 1 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0):
+            duration = mp3_duration(head + f.read())
+            if duration is not None:
+                return duration
+
+    return _ffprobe_duration(path)
@@ -4,7 +4,9 @@ Wraps ElevenLabs API for text-to-speech generation
 """
 from typing import Tuple, Optional
 import os
+import uuid
 from src.domain.repositories.service_repositories import ITTSRepository
+from src.infrastructure.concurrency import run_blocking
 
 
 class ElevenLabsAdapter(ITTSRepository):
@@ -31,6 +33,9 @@ class ElevenLabsAdapter(ITTSRepository):
         """
         Generate audio from text using ElevenLabs
         
+        Identical text/voice/settings are served from the TTS cache
+        (see tts_cache.py) without calling the API.
+        
         Args:
             text: Script to convert to speech
             voice_id: ElevenLabs voice ID
@@ -43,10 +48,13 @@ class ElevenLabsAdapter(ITTSRepository):
         # Import existing implementation
         from src.infrastructure.tts import generate_audio_for_beat
         
-        # Delegate to existing implementation with correct parameter names
-        result = generate_audio_for_beat(
+        # Delegate to existing implementation; the SDK call is blocking, so run it on the
+        # ElevenLabs pool. Unique paths keep concurrent beats from clobbering each other.
+        result = await run_blocking(
+            "elevenlabs",
+            generate_audio_for_beat,
             text=text,  # ✅ Correct parameter name
-            output_path=f"src/temp/outputs/audio_temp_{hash(text)}.mp3",  # ✅ Correct parameter name
+            output_path=f"src/temp/outputs/audio_temp_{uuid.uuid4().hex}.mp3",  # ✅ Correct parameter name
             voice_id=voice_id,
             style=style,
             voice_settings=voice_settings
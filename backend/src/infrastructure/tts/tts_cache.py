@@ -0,0 +1,192 @@
+"""
+Content-addressed TTS audio cache
+Local disk tier (size-bounded LRU) with an optional MinIO tier shared across workers
+"""
+import os
+import json
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "src/temp/tts_cache")
+TTS_CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", "500"))
+# The remote tier is only useful (and reachable) when MinIO is configured
+TTS_CACHE_REMOTE = os.getenv("TTS_CACHE_REMOTE", "true" if os.getenv("MINIO_ENDPOINT") else "false").lower() == "true"
+TTS_CACHE_PREFIX = "cache/tts"
+
+
+def make_cache_key(text: str, voice_id: str, model_id: str, voice_settings: Dict) -> str:
+    """
+    Hash everything that changes the generated audio
+
+    Args:
+        text: Text sent to the TTS model
+        voice_id: ElevenLabs voice ID
+        model_id: ElevenLabs model ID
+        voice_settings: Resolved voice settings (stability, similarity_boost, ...)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        {
+            "text": text,
+            "voice_id": voice_id,
+            "model_id": model_id,
+            "voice_settings": voice_settings,
+        },
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """Two-tier cache of generated MP3 files keyed by make_cache_key()"""
+
+    def __init__(
+        self,
+        cache_dir: str = TTS_CACHE_DIR,
+        max_bytes: int = TTS_CACHE_MAX_MB * 1024 * 1024,
+        use_remote: bool = TTS_CACHE_REMOTE
+    ):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.use_remote = use_remote
+        self._lock = threading.Lock()
+        # key -> size in bytes, least recently used first
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        self._counters = {"hits_disk": 0, "hits_remote": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def _load_index(self):
+        """Rebuild the LRU order from file modification times"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".mp3"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            stat = os.stat(path)
+            entries.append((stat.st_mtime, name[:-4], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._size += size
+
+    def _touch(self, key: str):
+        self._index.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def _add(self, key: str, size: int):
+        if key in self._index:
+            self._size -= self._index.pop(key)
+        self._index[key] = size
+        self._size += size
+
+        while self._size > self.max_bytes and len(self._index) > 1:
+            old_key, old_size = self._index.popitem(last=False)
+            self._size -= old_size
+            self._counters["evictions"] += 1
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    def fetch(self, key: str, output_path: str) -> bool:
+        """
+        Copy a cached file to output_path
+
+        Returns:
+            True on hit (disk or remote), False on miss
+        """
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        with self._lock:
+            if key in self._index and os.path.exists(self._path(key)):
+                shutil.copyfile(self._path(key), output_path)
+                self._touch(key)
+                self._counters["hits_disk"] += 1
+                return True
+            self._index.pop(key, None)
+
+        if self.use_remote and self._fetch_remote(key, output_path):
+            return True
+
+        with self._lock:
+            self._counters["misses"] += 1
+        return False
+
+    def _fetch_remote(self, key: str, output_path: str) -> bool:
+        """Pull an entry from MinIO into the disk tier and copy it to output_path"""
+        from src.infrastructure.storage.minio_storage import download_file
+
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.part"
+        if not download_file(f"{TTS_CACHE_PREFIX}/{key}.mp3", tmp_path):
+            return False
+
+        # Publish and copy under one lock hold: another thread's eviction could
+        # otherwise delete the entry before the caller gets its copy
+        with self._lock:
+            os.replace(tmp_path, self._path(key))
+            self._add(key, os.path.getsize(self._path(key)))
+            shutil.copyfile(self._path(key), output_path)
+            self._counters["hits_remote"] += 1
+        return True
+
+    def store(self, key: str, audio_bytes: bytes):
+        """Save generated audio in both tiers"""
+        tmp_path = f"{self._path(key)}.{threading.get_ident()}.part"
+        with open(tmp_path, "wb") as f:
+            f.write(audio_bytes)
+        os.replace(tmp_path, self._path(key))
+
+        with self._lock:
+            self._add(key, len(audio_bytes))
+            self._counters["stores"] += 1
+
+        if self.use_remote:
+            try:
+                from src.infrastructure.storage.minio_storage import upload_file
+                upload_file(self._path(key), f"{TTS_CACHE_PREFIX}/{key}.mp3")
+            except Exception as e:
+                print(f"   ⚠️ TTS cache remote store failed: {e}")
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and disk usage"""
+        with self._lock:
+            lookups = self._counters["hits_disk"] + self._counters["hits_remote"] + self._counters["misses"]
+            hits = self._counters["hits_disk"] + self._counters["hits_remote"]
+            return {
+                **self._counters,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._index),
+                "size_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "remote_enabled": self.use_remote,
+            }
+
+
+_cache: Optional[TTSCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_tts_cache() -> TTSCache:
+    """Process-wide TTS cache singleton"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TTSCache()
+        return _cache
@@ -1,12 +1,18 @@
 import os
 from elevenlabs import ElevenLabs, VoiceSettings
-from moviepy import AudioFileClip
 from typing import Optional, Tuple
+from src.infrastructure.tts.tts_cache import get_tts_cache, make_cache_key
+from src.infrastructure.tts.audio_probe import probe_audio_duration
+
+TTS_MODEL_ID = "eleven_multilingual_v2"
 
 def get_audio_duration(audio_path: str) -> float:
     """
     Mide la duración real de un archivo de audio MP3.
     
+    Lee las cabeceras MP3/WAV directamente (sin abrir un proceso de ffmpeg);
+    ffprobe solo se usa como respaldo para otros formatos.
+    
     Args:
         audio_path: Ruta al archivo MP3
     
@@ -14,10 +20,7 @@ def get_audio_duration(audio_path: str) -> float:
         float: Duración en segundos
     """
     try:
-        audio = AudioFileClip(audio_path)
-        duration_s = audio.duration
-        audio.close()
-        return duration_s
+        return probe_audio_duration(audio_path)
     except Exception as e:
         print(f"   ⚠️ Error midiendo duración de audio: {e}")
         return 0.0
@@ -56,6 +59,26 @@ def get_voice_settings(style: str = "viral") -> VoiceSettings:
     settings_dict = settings_by_style.get(style, settings_by_style["viral"])
     return VoiceSettings(**settings_dict)
 
+def resolve_voice_settings(style: str = "viral", voice_settings: dict = None) -> VoiceSettings:
+    """
+    Resuelve la configuración final de voz: custom si se especifica, o por estilo.
+    
+    Args:
+        style: Estilo de narración (solo si voice_settings es None)
+        voice_settings: Dict con stability, similarity_boost, style_exaggeration personalizados
+    
+    Returns:
+        VoiceSettings: Configuración que se enviará a ElevenLabs
+    """
+    if voice_settings:
+        return VoiceSettings(
+            stability=voice_settings.get("stability", 0.5),
+            similarity_boost=voice_settings.get("similarity_boost", 0.75),
+            style=voice_settings.get("style_exaggeration", 0.0),
+            use_speaker_boost=True
+        )
+    return get_voice_settings(style)
+
 def generate_audio_for_beat(
     text: str, 
     output_path: str, 
@@ -77,36 +100,36 @@ def generate_audio_for_beat(
         Tuple[str, float]: (ruta del archivo, duración en segundos) o None si falla
     """
     try:
+        # Usar voice_id de variable de entorno si no se especifica
+        if voice_id is None:
+            voice_id = os.environ.get("ELEVENLABS_VOICE_ID", "JBFqnCBsd6RMkjVDRZzb")
+
+        # Usar voice_settings custom o configuración por estilo
+        settings = resolve_voice_settings(style, voice_settings)
+        if voice_settings:
+            print(f"   🎛️ Custom settings: stability={settings.stability:.2f}, similarity={settings.similarity_boost:.2f}")
+
+        # Buscar en caché antes de llamar a la API (mismo texto/voz/modelo/configuración = mismo audio)
+        cache = get_tts_cache()
+        cache_key = make_cache_key(text, voice_id, TTS_MODEL_ID, settings.dict())
+        if cache.fetch(cache_key, output_path):
+            duration = get_audio_duration(output_path)
+            print(f"   ♻️ TTS cache hit ({style}): '{text[:50]}...' ({duration:.2f}s)")
+            return (output_path, duration)
+
         api_key = os.environ.get("ELEVENLABS_API_KEY")
         if not api_key:
             print("❌ ERROR: ELEVENLABS_API_KEY not set. Skipping audio generation.")
             return None
-        
-        # Usar voice_id de variable de entorno si no se especifica
-        if voice_id is None:
-            voice_id = os.environ.get("ELEVENLABS_VOICE_ID", "JBFqnCBsd6RMkjVDRZzb")
 
         print(f"   🎤 Generating TTS ({style}): '{text[:50]}...'")
         client = ElevenLabs(api_key=api_key)
 
-        # Usar voice_settings custom o configuración por estilo
-        if voice_settings:
-            settings = VoiceSettings(
-                stability=voice_settings.get("stability", 0.5),
-                similarity_boost=voice_settings.get("similarity_boost", 0.75),
-                style=voice_settings.get("style_exaggeration", 0.0),
-                use_speaker_boost=True
-            )
-            print(f"   🎛️ Custom settings: stability={voice_settings.get('stability'):.2f}, similarity={voice_settings.get('similarity_boost'):.2f}")
-        else:
-            # Fallback a configuración por estilo
-            settings = get_voice_settings(style)
-
         # Generar audio con configuración optimizada
         audio_generator = client.text_to_speech.convert(
             text=text,
             voice_id=voice_id,
-            model_id="eleven_multilingual_v2",
+            model_id=TTS_MODEL_ID,
             voice_settings=settings
         )
 
@@ -120,6 +143,8 @@ def generate_audio_for_beat(
         with open(output_path, "wb") as f:
             f.write(audio_bytes)
         
+        cache.store(cache_key, audio_bytes)
+        
         # Medir duración real
         duration = get_audio_duration(output_path)
         
@@ -4,3 +4,5 @@ from src.infrastructure.video.video_service import (
     mix_audio_with_video,
     check_video_duration
 )
+from src.infrastructure.video.ffmpeg_mixer import mix_audio_with_video_ffmpeg
+from src.infrastructure.video.media_probe import MediaInfo, probe_media
@@ -0,0 +1,271 @@
+"""
+In-memory Audio Mixer
+Decodes every stem once into float32 NumPy buffers and applies gains,
+offsets, looping and summing as vectorized operations - no temp files.
+"""
+import os
+import subprocess
+from typing import Callable, List, Dict, Optional, Tuple
+import numpy as np
+
+from src.infrastructure.video.ffmpeg_mixer import (
+    FFMPEG_BINARY,
+    MIX_SAMPLE_RATE,
+    DUCK_DEPTH,
+    DUCK_ATTACK_S,
+    DUCK_RELEASE_S,
+    mux_pcm_with_video
+)
+from src.infrastructure.video.media_probe import probe_media
+
+MIX_CHANNELS = 2
+
+
+def decode_audio(
+    path: str,
+    sample_rate: int = MIX_SAMPLE_RATE,
+    channels: int = MIX_CHANNELS,
+    max_duration: Optional[float] = None
+) -> np.ndarray:
+    """
+    Decode the first audio stream of a file into a float32 buffer
+
+    Args:
+        path: Audio or video file
+        sample_rate: Output sample rate
+        channels: Output channel count
+        max_duration: Stop decoding after this many seconds
+
+    Returns:
+        Array of shape (samples, channels) with values in [-1.0, 1.0]
+    """
+    cmd = [FFMPEG_BINARY, "-v", "error", "-i", path, "-map", "0:a:0", "-vn"]
+    if max_duration:
+        cmd += ["-t", f"{max_duration:.3f}"]
+    cmd += ["-f", "f32le", "-acodec", "pcm_f32le", "-ac", str(channels), "-ar", str(sample_rate), "pipe:1"]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, check=True)
+    except subprocess.CalledProcessError as e:
+        stderr = (e.stderr or b"").decode(errors="replace")[-1000:]
+        raise RuntimeError(f"Could not decode audio from {path}: {stderr}") from e
+
+    samples = np.frombuffer(result.stdout, dtype=np.float32)
+    usable = len(samples) - (len(samples) % channels)
+    return samples[:usable].reshape(-1, channels)
+
+
+def loop_to_length(buffer: np.ndarray, length: int) -> np.ndarray:
+    """Repeat a buffer until it covers `length` samples, then trim"""
+    if len(buffer) == 0:
+        return np.zeros((length, buffer.shape[1] if buffer.ndim == 2 else MIX_CHANNELS), dtype=np.float32)
+    if len(buffer) >= length:
+        return buffer[:length]
+    repeats = int(np.ceil(length / len(buffer)))
+    return np.tile(buffer, (repeats, 1))[:length]
+
+
+def build_duck_envelope(
+    intervals: List[Tuple[float, float]],
+    length: int,
+    sample_rate: int = MIX_SAMPLE_RATE,
+    depth: float = DUCK_DEPTH,
+    attack_s: float = DUCK_ATTACK_S,
+    release_s: float = DUCK_RELEASE_S
+) -> np.ndarray:
+    """
+    Build a sidechain gain envelope from the narration timeline
+
+    Each narration interval becomes a trapezoid: the gain ramps down during
+    `attack_s` before the voice starts (we know the timeline, so the duck can
+    lead the voice), holds while it speaks and ramps back up over `release_s`.
+    Overlapping intervals merge via the maximum duck amount.
+
+    Args:
+        intervals: List of (start_s, duration_s) narration intervals
+        length: Envelope length in samples
+        sample_rate: Sample rate of the buffers it will multiply
+        depth: Fraction of the bed removed under narration (0.0-1.0)
+        attack_s: Fade-down time before each interval
+        release_s: Fade-up time after each interval
+
+    Returns:
+        float32 gain array of shape (length,) with values in [1 - depth, 1.0]
+    """
+    duck = np.zeros(length, dtype=np.float32)
+    attack = max(1, int(round(attack_s * sample_rate)))
+    release = max(1, int(round(release_s * sample_rate)))
+
+    for start_s, duration_s in intervals:
+        start = int(round(start_s * sample_rate))
+        end = int(round((start_s + duration_s) * sample_rate))
+        if duration_s <= 0 or end <= 0 or start >= length:
+            continue
+
+        lo = max(0, start - attack)
+        hi = min(length, end + release)
+        t = np.arange(lo, hi, dtype=np.float32)
+        # Rising edge (0 -> 1 over the attack) times falling edge (1 -> 0 over the release)
+        shape = np.clip((t - (start - attack)) / attack, 0.0, 1.0) * np.clip(((end + release) - t) / release, 0.0, 1.0)
+        np.maximum(duck[lo:hi], shape, out=duck[lo:hi])
+
+    return 1.0 - np.float32(np.clip(depth, 0.0, 1.0)) * duck
+
+
+def mix_stems(
+    length: int,
+    narration: List[Tuple[np.ndarray, float]],
+    original: Optional[np.ndarray] = None,
+    original_gain: float = 1.0,
+    background: Optional[np.ndarray] = None,
+    background_gain: float = 0.1,
+    sample_rate: int = MIX_SAMPLE_RATE,
+    duck_envelope: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Sum all stems into one PCM buffer
+
+    Args:
+        length: Output length in samples
+        narration: List of (buffer, start offset in seconds)
+        original: Original audio buffer (already decoded)
+        original_gain: Gain for the original audio
+        background: Background music buffer, looped to fill the output
+        background_gain: Gain for the background music
+        sample_rate: Sample rate of every buffer
+        duck_envelope: Optional gain envelope (see build_duck_envelope) applied
+            to the music and original-audio bed, never to the narration
+
+    Returns:
+        float32 array of shape (length, channels), clipped to [-1.0, 1.0]
+    """
+    mix = np.zeros((length, MIX_CHANNELS), dtype=np.float32)
+
+    if original is not None and original_gain > 0:
+        n = min(length, len(original))
+        mix[:n] += original[:n] * np.float32(original_gain)
+
+    if background is not None and background_gain > 0:
+        mix += loop_to_length(background, length) * np.float32(background_gain)
+
+    if duck_envelope is not None:
+        mix *= duck_envelope[:length, np.newaxis]
+
+    for buffer, start_s in narration:
+        start = max(0, int(round(start_s * sample_rate)))
+        if start >= length:
+            continue
+        n = min(len(buffer), length - start)
+        mix[start:start + n] += buffer[:n]
+
+    np.clip(mix, -1.0, 1.0, out=mix)
+    return mix
+
+
+def render_audio_mix(
+    video_path: str,
+    audio_map: List[Dict],
+    duration: float,
+    keep_original_audio: bool = True,
+    has_original_audio: bool = True,
+    original_volume_factor: float = 1.0,
+    background_track_path: Optional[str] = None,
+    background_volume_factor: float = 0.1,
+    sample_rate: int = MIX_SAMPLE_RATE,
+    ducking: bool = False,
+    decoder: Callable[..., np.ndarray] = decode_audio
+) -> np.ndarray:
+    """
+    Decode every stem of a narration job once and return the final PCM mix
+
+    Args:
+        video_path: Source video (its audio is the "original" stem)
+        audio_map: List of dicts { 'path': str, 'start_s': float }
+        duration: Output duration in seconds (the video length)
+        keep_original_audio: Whether to include the original video sound
+        has_original_audio: Whether the source actually has an audio stream
+        original_volume_factor: Volume factor for original audio
+        background_track_path: Path to background music file
+        background_volume_factor: Volume for background music
+        ducking: Lower music and original audio under each narration segment
+        decoder: Same signature as decode_audio (the MoviePy fallback passes its own)
+
+    Returns:
+        float32 PCM buffer of shape (samples, 2)
+    """
+    length = int(round(duration * sample_rate))
+
+    narration = []
+    intervals = []
+    for item in audio_map:
+        if os.path.exists(item['path']):
+            buffer = decoder(item['path'], sample_rate)
+            start_s = float(item.get('start_s') or 0.0)
+            narration.append((buffer, start_s))
+            intervals.append((start_s, float(item.get('duration') or len(buffer) / sample_rate)))
+        else:
+            print(f"Warning: Audio file {item['path']} not found.")
+
+    original = None
+    if keep_original_audio and has_original_audio and original_volume_factor > 0:
+        original = decoder(video_path, sample_rate, max_duration=duration)
+        print(f"   🔊 Original audio volume adjusted to {original_volume_factor*100:.0f}%")
+
+    background = None
+    if background_track_path and os.path.exists(background_track_path):
+        try:
+            background = decoder(background_track_path, sample_rate, max_duration=duration)
+            print(f"   🎵 Added background track: {os.path.basename(background_track_path)} (Vol: {background_volume_factor*100:.0f}%)")
+        except Exception as e:
+            print(f"   ⚠️ Error processing background music: {e}")
+
+    duck_envelope = None
+    if ducking and intervals and (original is not None or background is not None):
+        duck_envelope = build_duck_envelope(intervals, length, sample_rate)
+        print(f"   🦆 Ducking bed under {len(intervals)} narration segments (depth {DUCK_DEPTH*100:.0f}%)")
+
+    return mix_stems(
+        length=length,
+        narration=narration,
+        original=original,
+        original_gain=original_volume_factor,
+        background=background,
+        background_gain=background_volume_factor,
+        sample_rate=sample_rate,
+        duck_envelope=duck_envelope
+    )
+
+
+def mix_audio_with_video_numpy(
+    video_path: str,
+    audio_map: List[Dict],
+    output_path: str,
+    keep_original_audio: bool = True,
+    original_volume_factor: float = 1.0,
+    background_track_path: Optional[str] = None,
+    background_volume_factor: float = 0.1,
+    remux: bool = True,
+    ducking: bool = False,
+    progress_path: Optional[str] = None
+) -> str:
+    """
+    Mix every stem in memory and hand the single PCM buffer to ffmpeg
+
+    Same contract as video_service.mix_audio_with_video.
+
+    Returns:
+        Path to the rendered video
+    """
+    info = probe_media(video_path)
+    pcm = render_audio_mix(
+        video_path=video_path,
+        audio_map=audio_map,
+        duration=info.duration_s,
+        keep_original_audio=keep_original_audio,
+        has_original_audio=info.has_audio,
+        original_volume_factor=original_volume_factor,
+        background_track_path=background_track_path,
+        background_volume_factor=background_volume_factor,
+        ducking=ducking
+    )
+    return mux_pcm_with_video(video_path, pcm, output_path, remux=remux, info=info, progress_path=progress_path)
@@ -0,0 +1,170 @@
+"""
+Video Chunker
+Splits long videos at keyframes with stream copy (no re-encode) so each
+chunk can be analyzed independently and concurrently.
+"""
+import os
+import math
+import shutil
+import tempfile
+import subprocess
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.infrastructure.video.ffmpeg_mixer import FFMPEG_BINARY
+from src.infrastructure.video.media_probe import FFPROBE_BINARY, probe_media
+
+LONG_VIDEO_THRESHOLD_S = float(os.getenv("LONG_VIDEO_THRESHOLD_S", "180"))
+LONG_VIDEO_CHUNK_TARGET_S = float(os.getenv("LONG_VIDEO_CHUNK_TARGET_S", "120"))
+LONG_VIDEO_MAX_CHUNKS = int(os.getenv("LONG_VIDEO_MAX_CHUNKS", "8"))
+CHUNK_DIR = os.getenv("VIDEO_CHUNK_DIR", "src/temp/chunks")
+# A chunk shorter than this is merged into its neighbour
+MIN_CHUNK_S = 20.0
+
+
+@dataclass
+class VideoChunk:
+    """One stream-copied piece of a longer video"""
+    index: int
+    path: str
+    start_s: float
+    end_s: float
+
+    @property
+    def duration_s(self) -> float:
+        return self.end_s - self.start_s
+
+
+def keyframe_times(video_path: str) -> List[float]:
+    """
+    Timestamps of the video keyframes, read from packet flags (no decoding)
+
+    Returns:
+        Sorted list of keyframe times in seconds
+    """
+    result = subprocess.run(
+        [
+            FFPROBE_BINARY, "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,flags",
+            "-of", "csv=p=0",
+            video_path
+        ],
+        capture_output=True,
+        check=True
+    )
+    times = []
+    for line in result.stdout.decode(errors="replace").splitlines():
+        pts, _, flags = line.partition(",")
+        if "K" in flags and pts not in ("", "N/A"):
+            times.append(float(pts))
+    return sorted(times)
+
+
+def plan_chunk_boundaries(
+    duration_s: float,
+    keyframes: List[float],
+    target_s: float = LONG_VIDEO_CHUNK_TARGET_S,
+    max_chunks: int = LONG_VIDEO_MAX_CHUNKS
+) -> List[float]:
+    """
+    Pick chunk boundaries from the duration, snapped to the nearest keyframes
+
+    Args:
+        duration_s: Video duration
+        keyframes: Keyframe times (stream copy can only cut there)
+        target_s: Preferred chunk length
+        max_chunks: Upper bound on the number of chunks
+
+    Returns:
+        Boundaries [0.0, b1, ..., duration_s]
+    """
+    count = max(1, min(max_chunks, math.ceil(duration_s / target_s)))
+    chunk_s = duration_s / count
+
+    boundaries = [0.0]
+    for i in range(1, count):
+        ideal = i * chunk_s
+        snapped = min(keyframes, key=lambda t: abs(t - ideal)) if keyframes else ideal
+        if snapped - boundaries[-1] >= MIN_CHUNK_S and duration_s - snapped >= MIN_CHUNK_S:
+            boundaries.append(snapped)
+    boundaries.append(duration_s)
+    return boundaries
+
+
+def split_video(video_path: str, boundaries: List[float], output_dir: str) -> List[VideoChunk]:
+    """
+    Cut the video at the given boundaries with stream copy
+
+    Existing chunk files in output_dir are reused.
+
+    Returns:
+        One VideoChunk per interval
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    ext = os.path.splitext(video_path)[1] or ".mp4"
+
+    chunks = []
+    for i, (start, end) in enumerate(zip(boundaries, boundaries[1:])):
+        path = os.path.join(output_dir, f"chunk_{i:03d}_{start:.3f}{ext}")
+        if not os.path.exists(path):
+            tmp_path = f"{path}.part{ext}"
+            subprocess.run(
+                [
+                    FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error",
+                    "-ss", f"{start:.3f}", "-i", video_path,
+                    "-t", f"{end - start:.3f}",
+                    "-map", "0:v:0", "-map", "0:a:0?",
+                    "-c", "copy", "-avoid_negative_ts", "make_zero",
+                    tmp_path
+                ],
+                capture_output=True,
+                check=True
+            )
+            os.replace(tmp_path, path)
+        chunks.append(VideoChunk(index=i, path=path, start_s=start, end_s=end))
+    return chunks
+
+
+def chunk_long_video(video_path: str, threshold_s: float = LONG_VIDEO_THRESHOLD_S) -> Optional[List[VideoChunk]]:
+    """
+    Split a video into analysis chunks if it is long enough to benefit
+
+    Chunk count and length are derived from the probed duration. Each call
+    cuts into its own directory (concurrent analyses of the same upload don't
+    share files); the caller removes it with remove_chunks() when done.
+
+    Args:
+        video_path: Source video
+        threshold_s: Videos up to this duration are not split
+
+    Returns:
+        List of chunks, or None when the video should be analyzed whole
+    """
+    info = probe_media(video_path)
+    if info.duration_s <= threshold_s:
+        return None
+
+    boundaries = plan_chunk_boundaries(info.duration_s, keyframe_times(video_path))
+    if len(boundaries) <= 2:
+        return None
+
+    os.makedirs(CHUNK_DIR, exist_ok=True)
+    output_dir = tempfile.mkdtemp(prefix=f"{info.content_hash[:16]}_", dir=CHUNK_DIR)
+    try:
+        chunks = split_video(video_path, boundaries, output_dir)
+    except Exception:
+        shutil.rmtree(output_dir, ignore_errors=True)
+        raise
+    print(f"   ✂️ Split {info.duration_s:.0f}s video into {len(chunks)} chunks at keyframes: "
+          f"{', '.join(f'{c.start_s:.0f}s' for c in chunks)}")
+    return chunks
+
+
+def remove_chunks(chunks: List[VideoChunk]):
+    """Delete the directory chunk_long_video() cut the chunks into"""
+    if not chunks:
+        return
+    output_dir = os.path.dirname(chunks[0].path)
+    shutil.rmtree(output_dir, ignore_errors=True)
+    print(f"   🧹 Removed {len(chunks)} chunks: {output_dir}")
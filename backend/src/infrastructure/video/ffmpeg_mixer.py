@@ -0,0 +1,342 @@
+"""
+FFmpeg Mixing Engine
+Compiles the narration audio map into a single ffmpeg filtergraph
+(adelay/volume/amix) and renders the final video in one subprocess.
+Ducking is a per-frame volume expression built from the narration timeline.
+"""
+import os
+import subprocess
+from typing import List, Dict, Optional, Tuple
+
+from src.infrastructure.video.media_probe import MediaInfo, probe_media
+from src.infrastructure.video.ffmpeg_progress import progress_args
+
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg")
+
+MIX_SAMPLE_RATE = 44100
+
+# Ducking defaults: how far the bed (music + original audio) drops under narration
+DUCK_DEPTH = float(os.getenv("AUDIO_DUCK_DEPTH", "0.6"))
+DUCK_ATTACK_S = float(os.getenv("AUDIO_DUCK_ATTACK_S", "0.15"))
+DUCK_RELEASE_S = float(os.getenv("AUDIO_DUCK_RELEASE_S", "0.5"))
+
+
+# Codecs that can be stream-copied into the MP4 output untouched
+REMUX_VIDEO_CODECS = ("h264", "hevc")
+# Demuxers whose H.264/HEVC streams carry the timestamps MP4 needs
+REMUX_CONTAINERS = ("mov", "mp4", "m4a", "matroska", "webm")
+
+
+def can_remux(video_codec: Optional[str], format_name: str) -> bool:
+    """Check whether the source video stream can be copied bit-for-bit into MP4"""
+    if video_codec not in REMUX_VIDEO_CODECS:
+        return False
+    demuxers = format_name.split(",")
+    return any(d in REMUX_CONTAINERS for d in demuxers)
+
+
+def _video_codec_args(remux: bool, video_codec: Optional[str]) -> List[str]:
+    """ffmpeg video encoding arguments for copy or re-encode mode"""
+    if remux:
+        args = ["-c:v", "copy"]
+        if video_codec == "hevc":
+            # Apple players only accept HEVC in MP4 with the hvc1 tag
+            args += ["-tag:v", "hvc1"]
+        return args
+    return ["-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p"]
+
+
+def build_duck_expression(
+    intervals: List[Tuple[float, float]],
+    depth: float = DUCK_DEPTH,
+    attack_s: float = DUCK_ATTACK_S,
+    release_s: float = DUCK_RELEASE_S
+) -> Optional[str]:
+    """
+    Compile the narration timeline into an ffmpeg volume expression of t
+
+    Same trapezoids as audio_mixer.build_duck_envelope: ramp down over
+    `attack_s` before each interval, hold, ramp up over `release_s` after it,
+    overlapping intervals merged by their maximum.
+
+    Args:
+        intervals: List of (start_s, duration_s) narration intervals
+        depth: Fraction of the bed removed under narration (0.0-1.0)
+        attack_s: Fade-down time before each interval
+        release_s: Fade-up time after each interval
+
+    Returns:
+        Expression for `volume=...:eval=frame`, or None without intervals
+    """
+    attack = max(attack_s, 0.001)
+    release = max(release_s, 0.001)
+    terms = []
+    for start_s, duration_s in intervals:
+        if duration_s <= 0:
+            continue
+        start = max(0.0, start_s)
+        end = start + duration_s
+        # Rising edge (0 -> 1 over the attack before start) times falling edge (1 -> 0 over the release after end)
+        terms.append(f"clip((t-{start:.3f})/{attack:.3f}+1,0,1)*clip(({end:.3f}-t)/{release:.3f}+1,0,1)")
+
+    if not terms:
+        return None
+
+    # max() takes two arguments: pair the terms up as a balanced tree to keep nesting shallow
+    while len(terms) > 1:
+        pairs = [f"max({a},{b})" for a, b in zip(terms[::2], terms[1::2])]
+        terms = pairs + (terms[-1:] if len(terms) % 2 else [])
+    depth = min(1.0, max(0.0, depth))
+    return f"1-{depth:.4f}*{terms[0]}"
+
+
+def build_mix_filtergraph(
+    narration_inputs: List[Tuple[int, float]],
+    original_input: Optional[int] = None,
+    original_volume: float = 1.0,
+    background_input: Optional[int] = None,
+    background_volume: float = 0.1,
+    duration: float = 0.0,
+    duck_expression: Optional[str] = None
+) -> Optional[str]:
+    """
+    Compile the audio map into an ffmpeg filter_complex string
+
+    Every stem is normalized to the same sample rate/layout, delayed to its
+    start offset, scaled by its gain and summed with amix (no normalization,
+    so gains behave exactly like the MoviePy CompositeAudioClip sum).
+
+    Args:
+        narration_inputs: List of (ffmpeg input index, start offset in seconds)
+        original_input: Input index carrying the original audio (None to drop it)
+        original_volume: Gain for the original audio
+        background_input: Input index of the background track (looped only when duration is known)
+        background_volume: Gain for the background track
+        duration: Output duration in seconds, used to trim looped stems
+        duck_expression: Gain expression (see build_duck_expression) applied to
+            the music and original-audio bed, never to the narration
+
+    Returns:
+        filter_complex string with a single [aout] label, or None if there is no audio
+    """
+    fmt = f"aformat=sample_rates={MIX_SAMPLE_RATE}:channel_layouts=stereo"
+    duck = f",volume='{duck_expression}':eval=frame" if duck_expression else ""
+    chains = []
+    labels = []
+
+    for n, (index, start_s) in enumerate(narration_inputs):
+        delay_ms = max(0, int(round(start_s * 1000)))
+        chains.append(f"[{index}:a]{fmt},adelay={delay_ms}|{delay_ms}[n{n}]")
+        labels.append(f"[n{n}]")
+
+    if background_input is not None:
+        trim = f",atrim=0:{duration:.3f}" if duration > 0 else ""
+        chains.append(f"[{background_input}:a]{fmt}{trim},volume={background_volume:.4f}{duck}[bg]")
+        labels.append("[bg]")
+
+    if original_input is not None:
+        chains.append(f"[{original_input}:a]{fmt},volume={original_volume:.4f}{duck}[orig]")
+        labels.append("[orig]")
+
+    if not labels:
+        return None
+
+    if len(labels) == 1:
+        chains.append(f"{labels[0]}anull[aout]")
+    else:
+        chains.append(
+            f"{''.join(labels)}amix=inputs={len(labels)}:duration=longest"
+            f":dropout_transition=0:normalize=0[aout]"
+        )
+
+    return ";".join(chains)
+
+
+def mix_audio_with_video_ffmpeg(
+    video_path: str,
+    audio_map: List[Dict],
+    output_path: str,
+    keep_original_audio: bool = True,
+    original_volume_factor: float = 1.0,
+    background_track_path: Optional[str] = None,
+    background_volume_factor: float = 0.1,
+    remux: bool = True,
+    ducking: bool = False,
+    progress_path: Optional[str] = None
+) -> str:
+    """
+    Combina el video con la narración TTS y la música de fondo en un solo proceso de ffmpeg.
+
+    Same contract as video_service.mix_audio_with_video, but the whole mix runs
+    natively inside ffmpeg instead of frame by frame in Python.
+
+    Args:
+        video_path: Path to original video
+        audio_map: List of dicts { 'path': str, 'start_s': float }
+        output_path: Where to save final video
+        keep_original_audio: Whether to include the original video sound
+        original_volume_factor: Volume factor for original audio (0.0 to 1.0)
+        background_track_path: Path to background music file
+        background_volume_factor: Volume for background music (0.0 to 1.0)
+        remux: Copy the source H.264/HEVC stream instead of re-encoding it when possible
+        ducking: Lower music and original audio under each narration segment
+        progress_path: File ffmpeg writes -progress reports to (see ffmpeg_progress.py)
+
+    Returns:
+        Path to the rendered video
+    """
+    info = probe_media(video_path)
+    duration = info.duration_s
+    has_audio = info.has_audio
+
+    cmd = [FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error", "-i", video_path]
+    next_index = 1
+
+    narration_inputs = []
+    intervals = []
+    for item in audio_map:
+        if os.path.exists(item['path']):
+            cmd += ["-i", item['path']]
+            start_s = float(item.get('start_s') or 0.0)
+            narration_inputs.append((next_index, start_s))
+            intervals.append((start_s, _narration_duration(item) if ducking else 0.0))
+            next_index += 1
+        else:
+            print(f"Warning: Audio file {item['path']} not found.")
+
+    background_input = None
+    if background_track_path and os.path.exists(background_track_path):
+        if duration > 0:
+            # Loop the track forever; the filtergraph trims it to the video length
+            cmd += ["-stream_loop", "-1"]
+        else:
+            # Nothing to trim an endless loop to (amix would never end): play the track once
+            print("   ⚠️ Video duration unknown, background track is not looped")
+        cmd += ["-i", background_track_path]
+        background_input = next_index
+        next_index += 1
+        print(f"   🎵 Added background track: {os.path.basename(background_track_path)} (Vol: {background_volume_factor*100:.0f}%)")
+
+    original_input = 0 if (keep_original_audio and has_audio and original_volume_factor > 0) else None
+
+    duck_expression = None
+    if ducking and (original_input is not None or background_input is not None):
+        duck_expression = build_duck_expression(intervals)
+        if duck_expression:
+            print(f"   🦆 Ducking bed under {len(intervals)} narration segments (depth {DUCK_DEPTH*100:.0f}%)")
+
+    filtergraph = build_mix_filtergraph(
+        narration_inputs=narration_inputs,
+        original_input=original_input,
+        original_volume=original_volume_factor,
+        background_input=background_input,
+        background_volume=background_volume_factor,
+        duration=duration,
+        duck_expression=duck_expression
+    )
+
+    cmd += ["-map", "0:v:0"]
+    if filtergraph:
+        cmd += ["-filter_complex", filtergraph, "-map", "[aout]", "-c:a", "aac", "-b:a", "192k"]
+    else:
+        cmd += ["-an"]
+
+    print(f"   🎛️ ffmpeg mix: {len(narration_inputs)} narration stems -> {output_path}")
+    return _encode_output(cmd, info, output_path, remux, progress_path=progress_path)
+
+
+def _narration_duration(item: Dict) -> float:
+    """Length of a narration stem: the audio map's value, else read from the file"""
+    if item.get('duration'):
+        return float(item['duration'])
+    from src.infrastructure.tts.audio_probe import probe_audio_duration
+
+    try:
+        return probe_audio_duration(item['path'])
+    except Exception as e:
+        print(f"   ⚠️ Could not read duration of {item['path']}, not ducking under it: {e}")
+        return 0.0
+
+
+def mux_pcm_with_video(
+    video_path: str,
+    pcm,
+    output_path: str,
+    sample_rate: int = MIX_SAMPLE_RATE,
+    remux: bool = True,
+    info: Optional[MediaInfo] = None,
+    progress_path: Optional[str] = None
+) -> str:
+    """
+    Encode a ready-made PCM mix as the AAC track of the source video
+
+    The float32 buffer is piped straight into ffmpeg's stdin, so no audio
+    ever touches the disk before the final file.
+
+    Args:
+        video_path: Source video (only its video stream is used)
+        pcm: float32 array of shape (samples, channels)
+        output_path: Where to save final video
+        sample_rate: Sample rate of the PCM buffer
+        remux: Copy the source H.264/HEVC stream instead of re-encoding it when possible
+        info: Result of probe_media() if the caller already has it
+        progress_path: File ffmpeg writes -progress reports to
+
+    Returns:
+        Path to the rendered video
+    """
+    info = info or probe_media(video_path)
+    channels = pcm.shape[1] if pcm.ndim == 2 else 1
+
+    cmd = [
+        FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error",
+        "-i", video_path,
+        "-f", "f32le", "-ar", str(sample_rate), "-ac", str(channels), "-i", "pipe:0",
+        "-map", "0:v:0", "-map", "1:a:0", "-c:a", "aac", "-b:a", "192k"
+    ]
+
+    print(f"   🎛️ ffmpeg mux: {len(pcm) / sample_rate:.1f}s PCM mix -> {output_path}")
+    return _encode_output(
+        cmd, info, output_path, remux,
+        stdin_data=pcm.astype("<f4", copy=False).tobytes(),
+        progress_path=progress_path
+    )
+
+
+def _encode_output(
+    cmd: List[str],
+    info: MediaInfo,
+    output_path: str,
+    remux: bool,
+    stdin_data: Optional[bytes] = None,
+    progress_path: Optional[str] = None
+) -> str:
+    """Finish an ffmpeg command with video codec args, retrying as re-encode if stream copy fails"""
+    cmd = cmd + progress_args(progress_path)
+    duration = info.duration_s
+    if duration > 0:
+        cmd = cmd + ["-t", f"{duration:.3f}"]
+    cmd = cmd + ["-movflags", "+faststart"]
+
+    use_copy = remux and can_remux(info.video_codec, info.format_name)
+    print(f"   🎞️ Video: {'remux' if use_copy else 're-encode'} ({info.video_codec})")
+
+    try:
+        _run_ffmpeg(cmd + _video_codec_args(use_copy, info.video_codec) + [output_path], stdin_data)
+    except RuntimeError as e:
+        if not use_copy:
+            raise
+        # Some streams (odd timestamps, exotic profiles) refuse to be copied into MP4
+        print(f"   ⚠️ Stream copy failed, re-encoding video: {e}")
+        _run_ffmpeg(cmd + _video_codec_args(False, info.video_codec) + [output_path], stdin_data)
+
+    return output_path
+
+
+def _run_ffmpeg(cmd: List[str], stdin_data: Optional[bytes] = None):
+    """Run an ffmpeg command, raising RuntimeError with the stderr tail on failure"""
+    try:
+        subprocess.run(cmd, input=stdin_data, capture_output=True, check=True)
+    except subprocess.CalledProcessError as e:
+        stderr = (e.stderr or b"").decode(errors="replace")[-2000:]
+        raise RuntimeError(f"ffmpeg failed: {stderr}") from e
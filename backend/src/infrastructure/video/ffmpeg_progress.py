@@ -0,0 +1,78 @@
+"""
+FFmpeg Progress - render percent from `ffmpeg -progress <file>`
+ffmpeg appends key=value blocks (out_time_us=..., progress=continue|end) to
+the file while it encodes. The render runs in a pool process, so the API
+side tails the file instead of reading the subprocess pipes.
+"""
+import os
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+PROGRESS_POLL_S = float(os.getenv("FFMPEG_PROGRESS_POLL_S", "0.5"))
+
+
+def progress_args(progress_path: Optional[str]) -> List[str]:
+    """Extra ffmpeg arguments that report progress to progress_path (none without a path)"""
+    return ["-progress", progress_path, "-nostats"] if progress_path else []
+
+
+def parse_progress(text: str) -> Optional[Dict]:
+    """
+    Latest complete block of an ffmpeg -progress stream
+
+    Returns:
+        {'out_time_s': float, 'done': bool}, or None before the first block
+    """
+    latest = None
+    values: Dict[str, str] = {}
+    for line in text.splitlines():
+        key, sep, value = line.partition("=")
+        if not sep:
+            continue
+        values[key.strip()] = value.strip()
+        # Every block ends with a progress= line
+        if key.strip() == "progress":
+            latest = values
+            values = {}
+
+    if latest is None:
+        return None
+
+    # out_time_ms is in microseconds too (a long-standing ffmpeg quirk); "N/A" before the first frame
+    raw = latest.get("out_time_us") or latest.get("out_time_ms") or ""
+    out_time_s = int(raw) / 1e6 if raw.lstrip("-").isdigit() else 0.0
+    return {"out_time_s": max(0.0, out_time_s), "done": latest.get("progress") == "end"}
+
+
+async def watch_progress(
+    progress_path: str,
+    duration_s: float,
+    on_percent: Callable[[float], None],
+    poll_s: float = PROGRESS_POLL_S
+):
+    """
+    Tail a -progress file and report percent of duration_s until cancelled
+
+    A render may run ffmpeg more than once (e.g. stream copy, then re-encode);
+    each run truncates the file, so percent simply follows the current run.
+    """
+    last = None
+    while True:
+        try:
+            with open(progress_path, "r", errors="replace") as f:
+                state = parse_progress(f.read())
+        except FileNotFoundError:
+            state = None
+
+        if state is not None:
+            if state["done"]:
+                percent = 100.0
+            elif duration_s > 0:
+                percent = min(99.9, state["out_time_s"] / duration_s * 100)
+            else:
+                percent = None
+            if percent is not None and percent != last:
+                last = percent
+                on_percent(percent)
+
+        await asyncio.sleep(poll_s)
@@ -0,0 +1,158 @@
+"""
+Frame Sampler
+Picks N representative, scene-change-aware timestamps and extracts them as
+compact JPEGs in a single ffmpeg pass (for inline multimodal requests).
+"""
+import os
+import re
+import subprocess
+from dataclasses import dataclass
+from typing import List
+
+from src.infrastructure.video.ffmpeg_mixer import FFMPEG_BINARY
+
+FRAME_SAMPLE_COUNT = int(os.getenv("FRAME_SAMPLE_COUNT", "48"))
+FRAME_SAMPLE_WIDTH = int(os.getenv("FRAME_SAMPLE_WIDTH", "512"))
+# mjpeg qscale: 2 (best) .. 31 (smallest)
+FRAME_SAMPLE_QUALITY = int(os.getenv("FRAME_SAMPLE_QUALITY", "6"))
+
+JPEG_EOI = b"\xff\xd9"
+# showinfo logs one line per frame that passes it, e.g. "[Parsed_showinfo_1 @ 0x..] n:0 pts:1536 pts_time:0.12 ..."
+SHOWINFO_PTS_RE = re.compile(r"Parsed_showinfo.*?pts_time:\s*(-?[\d.]+)")
+
+
+@dataclass
+class SampledFrame:
+    """One JPEG frame and its timestamp in the source video"""
+    time_s: float
+    jpeg: bytes
+
+
+def choose_sample_times(duration_s: float, cuts: List[float], count: int = FRAME_SAMPLE_COUNT) -> List[float]:
+    """
+    Pick sample timestamps: one per shot first, then fill the largest gaps
+
+    Args:
+        duration_s: Video duration
+        cuts: Shot boundaries (from the scene detector), may be empty
+        count: Number of frames wanted
+
+    Returns:
+        Sorted timestamps (at most `count`)
+    """
+    if duration_s <= 0 or count <= 0:
+        return []
+
+    bounds = [0.0] + [c for c in cuts if 0.0 < c < duration_s] + [duration_s]
+    # Middle of every shot so each shot is seen at least once
+    times = [(a + b) / 2 for a, b in zip(bounds, bounds[1:]) if b - a > 0.1]
+
+    if len(times) > count:
+        # More shots than frames: keep an evenly spread subset
+        step = len(times) / count
+        times = [times[int(i * step)] for i in range(count)]
+
+    # Fill the biggest holes (long shots) until we have `count` frames
+    while len(times) < count:
+        edges = [0.0] + times + [duration_s]
+        gap_index = max(range(len(edges) - 1), key=lambda i: edges[i + 1] - edges[i])
+        if edges[gap_index + 1] - edges[gap_index] < 0.5:
+            break
+        times.insert(gap_index, (edges[gap_index] + edges[gap_index + 1]) / 2)
+
+    # Drop near-duplicates; samples that still share a frame come back as one frame
+    result = []
+    for t in sorted(times):
+        if not result or t - result[-1] >= 0.2:
+            result.append(round(t, 3))
+    return result
+
+
+def extract_jpeg_frames(video_path: str, times: List[float], width: int = FRAME_SAMPLE_WIDTH) -> List[SampledFrame]:
+    """
+    Extract frames at the given timestamps in one decode pass
+
+    Uses a select filter that keeps the first frame at or after each
+    timestamp, so only one ffmpeg process runs regardless of N. Several
+    requested times can fall into the same frame interval (low-fps or VFR
+    sources), so each JPEG is labelled with the pts showinfo reports for it
+    rather than with the time that was asked for.
+
+    Returns:
+        SampledFrame list in time order (possibly fewer frames than times)
+    """
+    if not times:
+        return []
+
+    # Keep a frame when a requested time falls in (previous frame, this frame]
+    conditions = "+".join(f"gt({t:.3f},prev_pts*TB)*lte({t:.3f},pts*TB)" for t in times)
+    cmd = [
+        FFMPEG_BINARY, "-hide_banner", "-nostats", "-v", "info",
+        "-i", video_path,
+        "-an", "-sn",
+        "-vf", f"select='{conditions}',showinfo,scale={width}:-2",
+        "-vsync", "vfr",
+        "-c:v", "mjpeg", "-q:v", str(FRAME_SAMPLE_QUALITY),
+        "-f", "image2pipe", "pipe:1"
+    ]
+    result = subprocess.run(cmd, capture_output=True, check=True)
+
+    jpegs = []
+    data = result.stdout
+    start = 0
+    while start < len(data):
+        end = data.find(JPEG_EOI, start)
+        if end < 0:
+            break
+        jpegs.append(data[start:end + 2])
+        start = end + 2
+
+    pts_times = [float(m) for m in SHOWINFO_PTS_RE.findall(result.stderr.decode(errors="replace"))]
+    if len(pts_times) != len(jpegs):
+        # Never guess which frame is which: a wrong [t=...] label corrupts the beat timing
+        print(f"   ⚠️ Got {len(jpegs)} frames but {len(pts_times)} timestamps, seeking each frame instead")
+        return extract_jpeg_frames_seeking(video_path, times, width)
+
+    return [SampledFrame(time_s=round(t, 3), jpeg=jpeg) for t, jpeg in zip(pts_times, jpegs)]
+
+
+def extract_jpeg_frames_seeking(video_path: str, times: List[float], width: int = FRAME_SAMPLE_WIDTH) -> List[SampledFrame]:
+    """
+    One ffmpeg seek per timestamp: slower, but every JPEG is the frame at its own time
+
+    Returns:
+        SampledFrame list in time order (times with no frame are skipped)
+    """
+    frames = []
+    for t in times:
+        cmd = [
+            FFMPEG_BINARY, "-v", "error",
+            "-ss", f"{t:.3f}", "-i", video_path,
+            "-an", "-sn", "-frames:v", "1",
+            "-vf", f"scale={width}:-2",
+            "-c:v", "mjpeg", "-q:v", str(FRAME_SAMPLE_QUALITY),
+            "-f", "image2pipe", "pipe:1"
+        ]
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        if result.stdout:
+            frames.append(SampledFrame(time_s=t, jpeg=result.stdout))
+    return frames
+
+
+def sample_frames(video_path: str, duration_s: float, cuts: List[float], count: int = FRAME_SAMPLE_COUNT) -> List[SampledFrame]:
+    """
+    Representative JPEG frames for a video
+
+    Args:
+        video_path: Source video
+        duration_s: Video duration
+        cuts: Detected scene cuts
+        count: Number of frames
+
+    Returns:
+        SampledFrame list
+    """
+    frames = extract_jpeg_frames(video_path, choose_sample_times(duration_s, cuts, count))
+    total_kb = sum(len(f.jpeg) for f in frames) / 1024
+    print(f"   🖼️ Sampled {len(frames)} frames ({total_kb:.0f} KB) from {duration_s:.0f}s video")
+    return frames
@@ -0,0 +1,233 @@
+"""
+Media Probe Service
+Runs ffprobe once per upload and caches the metadata by file content hash,
+so every later stage (prompt budget, mixing, remux) reads it without reopening the file.
+"""
+import os
+import json
+import hashlib
+import threading
+import subprocess
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional, Tuple
+
+FFPROBE_BINARY = os.getenv("FFPROBE_BINARY", "ffprobe")
+MEDIA_PROBE_CACHE_DIR = os.getenv("MEDIA_PROBE_CACHE_DIR", "src/temp/media_probe")
+MEDIA_PROBE_MEMORY_ENTRIES = 256
+# Memoized upload digests, least recently used dropped first
+MEDIA_HASH_MEMO_ENTRIES = 256
+
+
+@dataclass
+class MediaInfo:
+    """Container and stream metadata for one media file"""
+    content_hash: str
+    duration_s: float = 0.0
+    format_name: str = ""
+    bit_rate: Optional[int] = None
+    size_bytes: int = 0
+    video_codec: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    rotation: int = 0
+    has_audio: bool = False
+    audio_codec: Optional[str] = None
+    audio_sample_rate: Optional[int] = None
+    audio_channels: Optional[int] = None
+
+    @property
+    def has_video(self) -> bool:
+        return self.video_codec is not None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+_hash_memo: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_hash_lock = threading.Lock()
+
+
+def file_content_hash(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    SHA-256 of a file's content
+
+    The digest is memoized per (path, size, mtime) for the most recent
+    MEDIA_HASH_MEMO_ENTRIES files, so stages that ask for the same upload only
+    hash it once.
+
+    Args:
+        path: File to hash
+        chunk_size: Read size in bytes
+
+    Returns:
+        Hex digest
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    with _hash_lock:
+        if memo_key in _hash_memo:
+            _hash_memo.move_to_end(memo_key)
+            return _hash_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+
+    content_hash = digest.hexdigest()
+    with _hash_lock:
+        _hash_memo[memo_key] = content_hash
+        _hash_memo.move_to_end(memo_key)
+        while len(_hash_memo) > MEDIA_HASH_MEMO_ENTRIES:
+            _hash_memo.popitem(last=False)
+    return content_hash
+
+
+def _parse_fps(rate: Optional[str]) -> Optional[float]:
+    """Parse ffprobe rates like '30000/1001'"""
+    if not rate or rate == "0/0":
+        return None
+    try:
+        num, _, den = rate.partition("/")
+        return float(num) / float(den or 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+
+
+def _parse_rotation(stream: Dict) -> int:
+    """Rotation from the legacy 'rotate' tag or the display matrix side data"""
+    rotate = stream.get("tags", {}).get("rotate")
+    if rotate is not None:
+        try:
+            return int(float(rotate)) % 360
+        except ValueError:
+            pass
+    for side_data in stream.get("side_data_list", []):
+        if "rotation" in side_data:
+            return int(-float(side_data["rotation"])) % 360
+    return 0
+
+
+def _run_ffprobe(path: str, content_hash: str) -> MediaInfo:
+    """Read all metadata in a single ffprobe call"""
+    result = subprocess.run(
+        [
+            FFPROBE_BINARY, "-v", "error",
+            "-show_format", "-show_streams",
+            "-of", "json",
+            path
+        ],
+        capture_output=True,
+        check=True
+    )
+    data = json.loads(result.stdout or b"{}")
+    fmt = data.get("format", {})
+    streams = data.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"
+                  and not s.get("disposition", {}).get("attached_pic")), None)
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
+    info = MediaInfo(
+        content_hash=content_hash,
+        duration_s=float(fmt.get("duration") or (video or audio or {}).get("duration") or 0.0),
+        format_name=fmt.get("format_name", ""),
+        bit_rate=int(fmt["bit_rate"]) if fmt.get("bit_rate") else None,
+        size_bytes=int(fmt.get("size") or os.path.getsize(path)),
+        has_audio=audio is not None,
+    )
+    if video:
+        info.video_codec = video.get("codec_name")
+        info.width = video.get("width")
+        info.height = video.get("height")
+        info.fps = _parse_fps(video.get("avg_frame_rate")) or _parse_fps(video.get("r_frame_rate"))
+        info.rotation = _parse_rotation(video)
+    if audio:
+        info.audio_codec = audio.get("codec_name")
+        info.audio_sample_rate = int(audio["sample_rate"]) if audio.get("sample_rate") else None
+        info.audio_channels = audio.get("channels")
+    return info
+
+
+class MediaProbeCache:
+    """In-memory LRU in front of a JSON-per-hash disk cache"""
+
+    def __init__(self, cache_dir: str = MEDIA_PROBE_CACHE_DIR, max_memory_entries: int = MEDIA_PROBE_MEMORY_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries
+        self._memory: "OrderedDict[str, MediaInfo]" = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, content_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{content_hash}.json")
+
+    def get(self, content_hash: str) -> Optional[MediaInfo]:
+        with self._lock:
+            if content_hash in self._memory:
+                self._memory.move_to_end(content_hash)
+                return self._memory[content_hash]
+
+        try:
+            with open(self._path(content_hash), "r") as f:
+                info = MediaInfo(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+        self._remember(info)
+        return info
+
+    def put(self, info: MediaInfo):
+        self._remember(info)
+        tmp_path = f"{self._path(info.content_hash)}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(info.to_dict(), f)
+            os.replace(tmp_path, self._path(info.content_hash))
+        except OSError as e:
+            print(f"   ⚠️ Could not persist media probe: {e}")
+
+    def _remember(self, info: MediaInfo):
+        with self._lock:
+            self._memory[info.content_hash] = info
+            self._memory.move_to_end(info.content_hash)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+
+_cache: Optional[MediaProbeCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_media_probe_cache() -> MediaProbeCache:
+    """Process-wide media probe cache singleton"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MediaProbeCache()
+        return _cache
+
+
+def probe_media(path: str) -> MediaInfo:
+    """
+    Get media metadata, running ffprobe only the first time a content hash is seen
+
+    Args:
+        path: Media file
+
+    Returns:
+        MediaInfo (duration, fps, resolution, codecs, rotation, audio presence, bitrate)
+    """
+    content_hash = file_content_hash(path)
+    cache = get_media_probe_cache()
+
+    info = cache.get(content_hash)
+    if info is not None:
+        return info
+
+    info = _run_ffprobe(path, content_hash)
+    cache.put(info)
+    print(f"   🔎 Probed {os.path.basename(path)}: {info.duration_s:.1f}s "
+          f"{info.width}x{info.height}@{info.fps or 0:.2f} {info.video_codec}/{info.audio_codec}")
+    return info
@@ -2,65 +2,212 @@
 MoviePy Video Processor Adapter - Implements IVideoRepository interface
 Wraps MoviePy for video processing operations
 """
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
+import os
+import uuid
+import asyncio
+import tempfile
 from src.domain.repositories.service_repositories import IVideoRepository
+from src.infrastructure.concurrency import run_blocking
+from src.infrastructure.video.render_pool import RenderPool, get_render_pool
+from src.infrastructure.video.ffmpeg_progress import watch_progress
+
+MIX_ENGINES = ("ffmpeg", "numpy", "moviepy")
+
+
+def render_mix(engine: str, remux: bool, ducking: bool, mix_kwargs: Dict, progress_path: Optional[str] = None) -> str:
+    """
+    Mix with the given engine, falling back to MoviePy (runs inside a render pool worker)
+
+    Returns:
+        Path to final video file
+    """
+    mix_kwargs = dict(mix_kwargs, progress_path=progress_path)
+
+    if engine in ("ffmpeg", "numpy"):
+        try:
+            if engine == "ffmpeg":
+                from src.infrastructure.video.ffmpeg_mixer import mix_audio_with_video_ffmpeg
+                return mix_audio_with_video_ffmpeg(**mix_kwargs, remux=remux, ducking=ducking)
+
+            from src.infrastructure.video.audio_mixer import mix_audio_with_video_numpy
+            return mix_audio_with_video_numpy(**mix_kwargs, remux=remux, ducking=ducking)
+        except Exception as e:
+            # Keep the job alive: the MoviePy path decodes and encodes through MoviePy's own
+            # ffmpeg (imageio-ffmpeg) instead of our ffmpeg pipes
+            print(f"   ⚠️ {engine} engine failed, falling back to MoviePy: {e}")
+
+    # Import existing implementation
+    from src.infrastructure.video import mix_audio_with_video  # ✅ Correct function name
+
+    # Delegate to existing implementation
+    result = mix_audio_with_video(**mix_kwargs, ducking=ducking)
+
+    # Ensure we return the output path (function might return None)
+    return result if result else mix_kwargs["output_path"]  # ✅ Fallback to output_path if None
+
+
+def render_reel(
+    scenes: List[Dict],
+    audio_map: List[Dict],
+    output_path: str,
+    background_track: Optional[str],
+    progress_path: Optional[str] = None
+) -> str:
+    """Assemble a reel from images + narration (runs inside a render pool worker)"""
+    from src.infrastructure.video import create_reel_video
+
+    create_reel_video(
+        scenes=scenes,
+        audio_map=audio_map,
+        output_path=output_path,
+        background_track=background_track,
+        progress_path=progress_path
+    )
+    return output_path
 
 
 class MoviePyAdapter(IVideoRepository):
     """Adapter for MoviePy video processing"""
-    
-    def __init__(self):
-        """Initialize MoviePy adapter"""
-        pass
-    
+
+    def __init__(self, engine: Optional[str] = None, remux: Optional[bool] = None, render_pool: Optional[RenderPool] = None):
+        """
+        Initialize MoviePy adapter
+
+        Args:
+            engine: Mixing engine, "ffmpeg" (single filtergraph subprocess), "numpy"
+                (in-memory mix piped to ffmpeg) or "moviepy" (legacy clip compositing).
+                Defaults to VIDEO_MIX_ENGINE env var.
+            remux: Stream-copy the source video and only encode the new audio track
+                (ffmpeg and numpy engines). Defaults to VIDEO_REMUX env var (on).
+            render_pool: Process pool renders run in (defaults to the shared pool)
+        """
+        self.engine = (engine or os.getenv("VIDEO_MIX_ENGINE", "ffmpeg")).lower()
+        if remux is None:
+            remux = os.getenv("VIDEO_REMUX", "true").lower() == "true"
+        self.remux = remux
+        if self.engine not in MIX_ENGINES:
+            raise ValueError(f"Unknown mix engine '{self.engine}'. Valid: {MIX_ENGINES}")
+        self.render_pool = render_pool or get_render_pool()
+
     async def mix_audio_with_video(
         self,
         video_path: str,
         audio_segments: List[Dict],
         output_path: str,
-        original_volume: float = 0.0
+        original_volume: float = 0.0,
+        background_track_path: Optional[str] = None,
+        background_volume: float = 0.1,
+        ducking: bool = True,
+        on_progress: Optional[Callable[[float], None]] = None
     ) -> str:
         """
-        Mix audio tracks with video using MoviePy
-        
+        Mix audio tracks with video using the configured engine
+
         Args:
             video_path: Path to source video
             audio_segments: List of dicts with 'path', 'start_s', 'duration', 'pause_after'
             output_path: Path for output video
             original_volume: Original audio volume (0.0-1.0)
-            
+            background_track_path: Optional background music file
+            background_volume: Background music volume (0.0-1.0)
+            ducking: Lower music and original audio under the narration
+            on_progress: Called with the render percent parsed from ffmpeg -progress
+
         Returns:
             Path to final video file
         """
-        # Import existing implementation
-        from src.infrastructure.video import mix_audio_with_video  # ✅ Correct function name
-        
-        # Delegate to existing implementation
-        result = mix_audio_with_video(
+        mix_kwargs = dict(
             video_path=video_path,
             audio_map=audio_segments,
             output_path=output_path,
             keep_original_audio=True,
-            original_volume_factor=original_volume
+            original_volume_factor=original_volume,
+            background_track_path=background_track_path,
+            background_volume_factor=background_volume
+        )
+
+        duration_s = 0.0
+        if on_progress:
+            from src.infrastructure.video.media_probe import probe_media
+            duration_s = (await run_blocking("media", probe_media, video_path)).duration_s
+
+        # Rendering is CPU-bound: run it in the process pool so the event loop stays free
+        return await self._render(
+            render_mix, duration_s, on_progress,
+            engine=self.engine, remux=self.remux, ducking=ducking, mix_kwargs=mix_kwargs
         )
-        
-        # Ensure we return the output path (function might return None)
-        return result if result else output_path  # ✅ Fallback to output_path if None
-    
+
+    async def create_reel(
+        self,
+        scenes: List[Dict],
+        audio_map: List[Dict],
+        output_path: str,
+        background_track_path: Optional[str] = None,
+        on_progress: Optional[Callable[[float], None]] = None
+    ) -> str:
+        """
+        Assemble a vertical reel from scene images and narration audio
+
+        Args:
+            scenes: Scenes with 'image_path' and 'duration_estimate'
+            audio_map: List of dicts with 'path', 'start_s', 'duration'
+            output_path: Path for output video
+            background_track_path: Optional background music file
+            on_progress: Called with the render percent parsed from ffmpeg -progress
+
+        Returns:
+            Path to final video file
+        """
+        # Same default scene length create_reel_video uses
+        duration_s = sum(scene.get('duration_estimate', 3.0) for scene in scenes)
+
+        return await self._render(
+            render_reel, duration_s, on_progress,
+            scenes=scenes,
+            audio_map=audio_map,
+            output_path=output_path,
+            background_track=background_track_path
+        )
+
+    async def _render(
+        self,
+        fn: Callable,
+        duration_s: float,
+        on_progress: Optional[Callable[[float], None]],
+        **kwargs
+    ) -> str:
+        """Run a render in the pool, tailing its ffmpeg -progress file when someone listens"""
+        if on_progress is None:
+            return await self.render_pool.run(fn, **kwargs)
+
+        progress_path = os.path.join(tempfile.gettempdir(), f"ffmpeg_progress_{uuid.uuid4().hex}.txt")
+        watcher = asyncio.create_task(watch_progress(progress_path, duration_s, on_progress))
+        try:
+            result = await self.render_pool.run(fn, progress_path=progress_path, **kwargs)
+            on_progress(100.0)
+            return result
+        finally:
+            watcher.cancel()
+            if os.path.exists(progress_path):
+                os.remove(progress_path)
+
     def get_duration(self, video_path: str) -> float:
         """
-        Get video duration in seconds
-        
+        Get media duration in seconds
+
+        Reads MP3/WAV headers directly and uses ffprobe for other containers,
+        so no decoder process is started.
+
         Args:
-            video_path: Path to video file
-            
+            video_path: Path to video or audio file
+
         Returns:
             Duration in seconds
         """
         try:
-            from moviepy.editor import VideoFileClip
-            with VideoFileClip(video_path) as clip:
-                return clip.duration
+            from src.infrastructure.tts import probe_audio_duration
+            return probe_audio_duration(video_path)
         except Exception:
-            # Fallback if MoviePy fails
+            # Fallback if the file can't be probed
             return 0.0
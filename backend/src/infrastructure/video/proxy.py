@@ -0,0 +1,124 @@
+"""
+Analysis Proxy
+Builds a small, low-fps, low-bitrate MP4 of an upload for Gemini. The model
+only needs low resolution, and upload/processing time scale with bytes.
+"""
+import os
+import threading
+import subprocess
+
+from src.infrastructure.video.ffmpeg_mixer import FFMPEG_BINARY
+from src.infrastructure.video.media_probe import probe_media
+
+ANALYSIS_PROXY_ENABLED = os.getenv("ANALYSIS_PROXY_ENABLED", "true").lower() == "true"
+PROXY_DIR = os.getenv("ANALYSIS_PROXY_DIR", "src/temp/proxies")
+PROXY_HEIGHT = int(os.getenv("ANALYSIS_PROXY_HEIGHT", "480"))
+PROXY_FPS = int(os.getenv("ANALYSIS_PROXY_FPS", "4"))
+PROXY_CRF = int(os.getenv("ANALYSIS_PROXY_CRF", "30"))
+# Sources already below this bitrate (and resolution) are uploaded as-is
+PROXY_MIN_SOURCE_BITRATE = 1_500_000
+# Disk budget for cached proxies, least recently used evicted first
+PROXY_CACHE_MAX_MB = int(os.getenv("ANALYSIS_PROXY_CACHE_MAX_MB", "2000"))
+
+_evict_lock = threading.Lock()
+
+
+def evict_proxies(max_bytes: int = PROXY_CACHE_MAX_MB * 1024 * 1024, keep: str = ""):
+    """
+    Trim PROXY_DIR to max_bytes, oldest access first
+
+    The directory is scanned on every call rather than indexed in memory
+    because the API and worker processes share it; mtime is the LRU clock
+    (reuses touch it). Partial builds and `keep` (the proxy just built or
+    reused) are never removed.
+    """
+    with _evict_lock:
+        entries = []
+        for name in os.listdir(PROXY_DIR):
+            path = os.path.join(PROXY_DIR, name)
+            if not name.endswith(".mp4") or name.endswith(".part.mp4") or path == keep:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+
+        total = sum(size for _, _, size in entries)
+        if keep and os.path.exists(keep):
+            total += os.path.getsize(keep)
+        for _, path, size in sorted(entries):
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                print(f"   🧹 Evicted analysis proxy: {path}")
+            except OSError:
+                pass
+
+
+def needs_proxy(path: str) -> bool:
+    """Whether a proxy would be meaningfully smaller than the source"""
+    info = probe_media(path)
+    if not info.has_video:
+        return False
+    short_side = min(info.width or 0, info.height or 0)
+    return short_side > PROXY_HEIGHT or (info.bit_rate or 0) > PROXY_MIN_SOURCE_BITRATE
+
+
+def make_analysis_proxy(video_path: str) -> str:
+    """
+    Get the analysis proxy for a video, building it on first use
+
+    The proxy keeps the source timestamps (the fps filter only drops frames),
+    so beat times returned by the model map 1:1 onto the original. Proxies are
+    cached per content hash within PROXY_CACHE_MAX_MB (LRU). On any failure the
+    original path is returned.
+
+    Args:
+        video_path: Source video
+
+    Returns:
+        Path of the file to upload (the proxy, or the source if it's already small)
+    """
+    try:
+        if not needs_proxy(video_path):
+            return video_path
+
+        info = probe_media(video_path)
+        proxy_path = os.path.join(PROXY_DIR, f"{info.content_hash}_{PROXY_HEIGHT}p{PROXY_FPS}.mp4")
+        if os.path.exists(proxy_path):
+            try:
+                os.utime(proxy_path)
+            except OSError:
+                pass
+            return proxy_path
+
+        os.makedirs(PROXY_DIR, exist_ok=True)
+        tmp_path = f"{proxy_path}.part.mp4"
+        # Scale the short side (portrait phone videos are taller than wide)
+        scale = (f"scale='if(gt(iw,ih),-2,min({PROXY_HEIGHT},iw))':'if(gt(iw,ih),min({PROXY_HEIGHT},ih),-2)'")
+        cmd = [
+            FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error",
+            "-i", video_path,
+            "-map", "0:v:0", "-map", "0:a:0?",
+            "-vf", f"{scale},fps={PROXY_FPS}",
+            "-c:v", "libx264", "-preset", "veryfast", "-crf", str(PROXY_CRF),
+            "-g", str(PROXY_FPS * 2), "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-ac", "1", "-b:a", "48k",
+            "-movflags", "+faststart",
+            tmp_path
+        ]
+        subprocess.run(cmd, capture_output=True, check=True)
+        os.replace(tmp_path, proxy_path)
+
+        ratio = os.path.getsize(proxy_path) / max(1, info.size_bytes)
+        print(f"   🪶 Analysis proxy: {info.size_bytes / 1e6:.1f} MB -> "
+              f"{os.path.getsize(proxy_path) / 1e6:.1f} MB ({ratio * 100:.0f}%)")
+        evict_proxies(keep=proxy_path)
+        return proxy_path
+
+    except Exception as e:
+        print(f"   ⚠️ Proxy generation failed, uploading original: {e}")
+        return video_path
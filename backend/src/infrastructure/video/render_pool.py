@@ -0,0 +1,206 @@
+"""
+Render Pool
+Runs CPU-bound rendering (MoviePy compositing, NumPy mixing, ffmpeg
+orchestration) in a process pool so renders never block the API event loop.
+Each job runs in its own process with soft memory/CPU limits (inherited by
+the ffmpeg children it spawns), so a crash or kill only affects that job.
+"""
+import os
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Set
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits
+    resource = None
+
+# Parallel renders; 0 runs renders in a thread instead (no isolation, for debugging)
+RENDER_POOL_WORKERS = int(os.getenv("RENDER_POOL_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+# Per-job address-space limit for the worker and its ffmpeg children (0 = unlimited)
+RENDER_MEMORY_LIMIT_MB = int(os.getenv("RENDER_MEMORY_LIMIT_MB", "4096"))
+# Per-job CPU-seconds budget; the worker is killed with SIGXCPU past it (0 = unlimited)
+RENDER_CPU_LIMIT_S = int(os.getenv("RENDER_CPU_LIMIT_S", "1800"))
+# Wall-clock deadline for a single render
+RENDER_TIMEOUT_S = float(os.getenv("RENDER_TIMEOUT_S", "1800"))
+
+
+class RenderCrashedError(Exception):
+    """A render worker died (memory/CPU limit, segfault) or missed its deadline"""
+
+
+def _apply_limits(memory_mb: int, cpu_s: int):
+    """Soft rlimits for the current job's process (hard limits stay untouched)"""
+    if resource is None:
+        return
+
+    if memory_mb > 0:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        limit = memory_mb * 1024 * 1024
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+    if cpu_s > 0:
+        # RLIMIT_CPU counts the process lifetime, so the budget starts from what's already used
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        limit = int(usage.ru_utime + usage.ru_stime) + cpu_s
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (limit, hard))
+
+
+def _run_limited(fn: Callable, kwargs: Dict, memory_mb: int, cpu_s: int):
+    """Worker-side entry point: apply this job's limits, then render"""
+    _apply_limits(memory_mb, cpu_s)
+    return fn(**kwargs)
+
+
+def _mp_context():
+    # forkserver children don't inherit the API's threads/sockets; spawn where it's unavailable
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class RenderPool:
+    """
+    Renders in isolated worker processes, at most max_workers at a time
+
+    Every job gets its own single-worker process, so a job that hits its
+    memory/CPU limit, segfaults or times out only takes itself down; renders
+    running next to it are never interrupted and keep their own retry.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = RENDER_POOL_WORKERS,
+        memory_limit_mb: int = RENDER_MEMORY_LIMIT_MB,
+        cpu_limit_s: int = RENDER_CPU_LIMIT_S,
+        timeout_s: float = RENDER_TIMEOUT_S
+    ):
+        self.max_workers = max_workers
+        self.memory_limit_mb = memory_limit_mb
+        self.cpu_limit_s = cpu_limit_s
+        self.timeout_s = timeout_s
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._executors: Set[ProcessPoolExecutor] = set()
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.active = 0
+        self.completed = 0
+        self.crashes = 0
+
+    def _job_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+            print(f"🏭 Render pool started ({self.max_workers} concurrent renders, "
+                  f"{self.memory_limit_mb or '∞'} MB / {self.cpu_limit_s or '∞'} CPU-s per job)")
+        return self._slots
+
+    @staticmethod
+    def _kill(executor: ProcessPoolExecutor):
+        # No public API to stop a running task: terminate the job's own worker
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.kill()
+
+    async def _run_once(self, fn: Callable, kwargs: Dict, name: str) -> Any:
+        """One attempt in a fresh process that serves only this job"""
+        executor = ProcessPoolExecutor(max_workers=1, mp_context=_mp_context())
+        with self._lock:
+            self._executors.add(executor)
+        finished = False
+        try:
+            future = asyncio.get_running_loop().run_in_executor(
+                executor, _run_limited, fn, kwargs, self.memory_limit_mb, self.cpu_limit_s
+            )
+            try:
+                result = await asyncio.wait_for(future, timeout=self.timeout_s)
+            except asyncio.TimeoutError:
+                raise RenderCrashedError(f"{name} exceeded {self.timeout_s:.0f}s and was killed")
+            finished = True
+            return result
+        except BrokenProcessPool:
+            finished = True
+            raise
+        finally:
+            if not finished:
+                # Timed out or the caller was cancelled: don't leave the render burning CPU
+                self._kill(executor)
+            with self._lock:
+                self._executors.discard(executor)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable, **kwargs) -> Any:
+        """
+        Run fn(**kwargs) in a worker process and await the result
+
+        fn must be a module-level (picklable) function. If the job's worker
+        dies, the job is retried once in a new process; a job that keeps
+        crashing its worker raises RenderCrashedError.
+
+        Raises:
+            RenderCrashedError: Worker died twice or the render missed its deadline
+        """
+        if self.max_workers <= 0:
+            return await asyncio.to_thread(fn, **kwargs)
+
+        name = getattr(fn, "__name__", "render")
+        self.queued += 1
+        try:
+            await self._job_slots().acquire()
+        finally:
+            self.queued -= 1
+
+        self.active += 1
+        try:
+            for attempt in (1, 2):
+                try:
+                    result = await self._run_once(fn, kwargs, name)
+                    self.completed += 1
+                    return result
+                except BrokenProcessPool:
+                    self.crashes += 1
+                    print(f"   💥 Render worker died during {name} (attempt {attempt}/2)")
+                except RenderCrashedError:
+                    self.crashes += 1
+                    raise
+        finally:
+            self.active -= 1
+            self._job_slots().release()
+
+        raise RenderCrashedError(
+            f"{name} crashed its render worker twice (memory limit {self.memory_limit_mb} MB, "
+            f"CPU limit {self.cpu_limit_s}s)"
+        )
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.max_workers,
+            "queued": self.queued,
+            "active": self.active,
+            "completed": self.completed,
+            "crashes": self.crashes,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            executors, self._executors = list(self._executors), set()
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_render_pool: Optional[RenderPool] = None
+_render_pool_lock = threading.Lock()
+
+
+def get_render_pool() -> RenderPool:
+    """Process-wide render pool singleton"""
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = RenderPool()
+        return _render_pool
@@ -0,0 +1,191 @@
+"""
+Scene Change Detector
+Decodes small grayscale frames once through ffmpeg and finds hard cuts with
+vectorized NumPy histogram + pixel differences. Cut times feed the analysis
+prompt and snap the model's beat boundaries to real shot changes.
+"""
+import os
+import threading
+import subprocess
+from collections import OrderedDict
+from typing import List, Optional
+import numpy as np
+
+from src.infrastructure.video.ffmpeg_mixer import FFMPEG_BINARY
+from src.infrastructure.video.media_probe import probe_media
+
+SCENE_DETECT_ENABLED = os.getenv("SCENE_DETECT_ENABLED", "true").lower() == "true"
+# Frames are decoded at this size/rate; cut times are accurate to 1 / SCENE_DETECT_FPS
+SCENE_DETECT_FPS = float(os.getenv("SCENE_DETECT_FPS", "8"))
+SCENE_DETECT_WIDTH = 96
+SCENE_DETECT_HEIGHT = 54
+SCENE_DETECT_THRESHOLD = float(os.getenv("SCENE_DETECT_THRESHOLD", "0.35"))
+# Ignore cuts closer than this to the previous one (flashes, strobe)
+MIN_SHOT_S = 0.75
+HISTOGRAM_BINS = 32
+# Beat boundaries within this distance of a cut are moved onto it
+SNAP_TOLERANCE_S = 0.6
+# Cut lists kept in memory, least recently used dropped first
+SCENE_CUT_CACHE_ENTRIES = 256
+
+_cut_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+_cut_cache_lock = threading.Lock()
+
+
+def decode_gray_frames(video_path: str, fps: float = SCENE_DETECT_FPS) -> np.ndarray:
+    """
+    Decode the video as tiny grayscale frames in one ffmpeg pass
+
+    Returns:
+        uint8 array of shape (frames, SCENE_DETECT_HEIGHT, SCENE_DETECT_WIDTH)
+    """
+    cmd = [
+        FFMPEG_BINARY, "-v", "error",
+        "-threads", "0",
+        "-i", video_path,
+        "-an", "-sn",
+        "-vf", f"fps={fps},scale={SCENE_DETECT_WIDTH}:{SCENE_DETECT_HEIGHT}:flags=area,format=gray",
+        "-f", "rawvideo", "pipe:1"
+    ]
+    result = subprocess.run(cmd, capture_output=True, check=True)
+    frame_size = SCENE_DETECT_WIDTH * SCENE_DETECT_HEIGHT
+    usable = len(result.stdout) - (len(result.stdout) % frame_size)
+    return np.frombuffer(result.stdout[:usable], dtype=np.uint8).reshape(-1, SCENE_DETECT_HEIGHT, SCENE_DETECT_WIDTH)
+
+
+def frame_difference_scores(frames: np.ndarray) -> np.ndarray:
+    """
+    Difference score between each frame and the previous one (0 = identical, ~1 = hard cut)
+
+    Combines a histogram distance (robust to motion within a shot) with a
+    normalized mean absolute pixel difference (catches cuts between shots with
+    similar brightness distributions). Both are computed for all frame pairs at once.
+
+    Returns:
+        float32 array of length len(frames) - 1
+    """
+    if len(frames) < 2:
+        return np.zeros(0, dtype=np.float32)
+
+    flat = frames.reshape(len(frames), -1)
+
+    # Per-frame histograms via a single bincount over (frame, bin) indices
+    bins = (flat.astype(np.int32) * HISTOGRAM_BINS) >> 8
+    offsets = np.arange(len(frames), dtype=np.int32)[:, None] * HISTOGRAM_BINS
+    hist = np.bincount((bins + offsets).ravel(), minlength=len(frames) * HISTOGRAM_BINS)
+    hist = hist.reshape(len(frames), HISTOGRAM_BINS).astype(np.float32) / flat.shape[1]
+    hist_diff = 0.5 * np.abs(np.diff(hist, axis=0)).sum(axis=1)
+
+    # Structural term: mean absolute difference after removing each frame's mean brightness
+    centered = flat.astype(np.float32)
+    centered -= centered.mean(axis=1, keepdims=True)
+    pixel_diff = np.abs(np.diff(centered, axis=0)).mean(axis=1) / 64.0
+
+    return (0.5 * hist_diff + 0.5 * np.clip(pixel_diff, 0.0, 1.0)).astype(np.float32)
+
+
+def pick_cuts(
+    scores: np.ndarray,
+    fps: float = SCENE_DETECT_FPS,
+    threshold: float = SCENE_DETECT_THRESHOLD,
+    min_shot_s: float = MIN_SHOT_S
+) -> List[float]:
+    """
+    Turn difference scores into cut times
+
+    A cut needs a score above the threshold that is also a local peak clearly
+    above the surrounding activity (so fast pans don't register as cuts).
+
+    Returns:
+        Cut times in seconds, ascending
+    """
+    if len(scores) == 0:
+        return []
+
+    window = max(1, int(round(fps)))
+    padded = np.pad(scores, window, mode="edge")
+    local = np.lib.stride_tricks.sliding_window_view(padded, 2 * window + 1)
+    baseline = np.median(local, axis=1)
+    is_peak = scores >= local.max(axis=1)
+
+    candidates = np.flatnonzero((scores > threshold) & is_peak & (scores > 2.0 * baseline))
+
+    cuts = []
+    for index in candidates:
+        t = round(float(index + 1) / fps, 3)
+        if not cuts or t - cuts[-1] >= min_shot_s:
+            cuts.append(t)
+    return cuts
+
+
+def detect_scene_cuts(video_path: str) -> List[float]:
+    """
+    Candidate shot boundaries for a video (cached per content hash)
+
+    Args:
+        video_path: Video file
+
+    Returns:
+        Cut times in seconds (empty if detection fails)
+    """
+    try:
+        info = probe_media(video_path)
+        with _cut_cache_lock:
+            if info.content_hash in _cut_cache:
+                _cut_cache.move_to_end(info.content_hash)
+                return _cut_cache[info.content_hash]
+
+        frames = decode_gray_frames(video_path)
+        cuts = [t for t in pick_cuts(frame_difference_scores(frames)) if t < info.duration_s]
+        with _cut_cache_lock:
+            _cut_cache[info.content_hash] = cuts
+            _cut_cache.move_to_end(info.content_hash)
+            while len(_cut_cache) > SCENE_CUT_CACHE_ENTRIES:
+                _cut_cache.popitem(last=False)
+        print(f"   ✂️ Scene detector: {len(cuts)} cuts in {info.duration_s:.0f}s ({len(frames)} frames)")
+        return cuts
+    except Exception as e:
+        print(f"   ⚠️ Scene detection failed: {e}")
+        return []
+
+
+def snap_beats_to_cuts(beats, cuts: List[float], tolerance_s: float = SNAP_TOLERANCE_S, duration_s: Optional[float] = None):
+    """
+    Move beat boundaries onto nearby detected cuts, keeping beats contiguous
+
+    A boundary shared by two beats (end of one, start of the next) moves
+    together. Beats are modified in place.
+
+    Args:
+        beats: List of Beat
+        cuts: Cut times from detect_scene_cuts
+        tolerance_s: Maximum distance a boundary is moved
+        duration_s: Video duration, used to clamp the last beat
+
+    Returns:
+        Number of boundaries snapped
+    """
+    if not cuts or not beats:
+        return 0
+
+    cut_array = np.asarray(cuts, dtype=np.float64)
+
+    def nearest(t: Optional[float]) -> Optional[float]:
+        if t is None:
+            return None
+        i = int(np.abs(cut_array - t).argmin())
+        return float(cut_array[i]) if abs(cut_array[i] - t) <= tolerance_s else None
+
+    snapped = 0
+    for prev, beat in zip(beats, beats[1:]):
+        target = nearest(beat.start_s)
+        if target is None or target <= (prev.start_s or 0.0) or (beat.end_s is not None and target >= beat.end_s):
+            continue
+        if prev.end_s is not None and abs(prev.end_s - beat.start_s) <= tolerance_s:
+            prev.end_s = target
+        beat.start_s = target
+        snapped += 1
+
+    if duration_s and beats[-1].end_s is not None:
+        beats[-1].end_s = min(beats[-1].end_s, duration_s)
+    return snapped
@@ -1,15 +1,45 @@
-from moviepy import VideoFileClip, AudioFileClip, CompositeAudioClip, concatenate_audioclips
+from moviepy import VideoFileClip, AudioFileClip, AudioArrayClip, CompositeAudioClip, concatenate_audioclips
 from typing import List, Optional
 import os
-import tempfile
 import numpy as np
-from scipy.io import wavfile
 
 def check_video_duration(video_path: str) -> float:
-    clip = VideoFileClip(video_path)
-    duration = clip.duration
-    clip.close()
-    return duration
+    """
+    Devuelve la duración del video en segundos.
+
+    Usa el probe cacheado (un solo ffprobe por contenido) en lugar de abrir un VideoFileClip.
+    """
+    from src.infrastructure.video.media_probe import probe_media
+    return probe_media(video_path).duration_s
+
+def decode_audio_moviepy(
+    path: str,
+    sample_rate: int = 44100,
+    channels: int = 2,
+    max_duration: Optional[float] = None
+) -> np.ndarray:
+    """
+    Decodifica el audio de un archivo con AudioFileClip (mismo contrato que audio_mixer.decode_audio).
+
+    Es el decodificador del camino MoviePy: no depende del ffmpeg del sistema que
+    usan los motores ffmpeg/numpy, así que sigue funcionando cuando esos fallan.
+    """
+    source = AudioFileClip(path)
+    try:
+        clip = source
+        if max_duration and source.duration > max_duration:
+            clip = source.subclipped(0, max_duration)
+        samples = np.asarray(clip.to_soundarray(fps=sample_rate), dtype=np.float32)
+    finally:
+        source.close()
+
+    if samples.ndim == 1:
+        samples = samples[:, np.newaxis]
+    if samples.shape[1] != channels:
+        # Mono -> stereo (or downmix anything else)
+        samples = np.repeat(samples.mean(axis=1, keepdims=True), channels, axis=1)
+    return samples
+
 
 def mix_audio_with_video(
     video_path: str, 
@@ -18,7 +48,9 @@ def mix_audio_with_video(
     keep_original_audio: bool = True,
     original_volume_factor: float = 1.0,
     background_track_path: Optional[str] = None,
-    background_volume_factor: float = 0.1
+    background_volume_factor: float = 0.1,
+    ducking: bool = False,
+    progress_path: Optional[str] = None
 ):
     """
     Combina el video con los archivos de narración TTS y música de fondo opcional.
@@ -31,100 +63,30 @@ def mix_audio_with_video(
         original_volume_factor: Volume factor for original audio (0.0 to 1.0)
         background_track_path: Path to background music file
         background_volume_factor: Volume for background music (0.0 to 1.0, default 0.1)
+        ducking: Lower music and original audio while the narration is speaking
+        progress_path: File the encoding ffmpeg writes -progress reports to
     """
+    from src.infrastructure.video.audio_mixer import render_audio_mix, MIX_SAMPLE_RATE
+    from src.infrastructure.video.ffmpeg_progress import progress_args
+
     video = VideoFileClip(video_path)
-    original_audio = video.audio
-    
-    audio_clips = []
-    
-    # ALWAYS add TTS narration clips first
-    for item in audio_map:
-        if os.path.exists(item['path']):
-            # Create AudioFileClip
-            audioclip = AudioFileClip(item['path'])
-            # Set start time (MoviePy v2.0 uses with_start)
-            audioclip = audioclip.with_start(item['start_s'])
-            audio_clips.append(audioclip)
-        else:
-            print(f"Warning: Audio file {item['path']} not found.")
-    
-    # ADD Background Music if provided
-    if background_track_path and os.path.exists(background_track_path):
-        try:
-            bg_music = AudioFileClip(background_track_path)
-            
-            # Loop if shorter than video
-            if bg_music.duration < video.duration:
-                # Calculate number of loops needed
-                repeats = int(np.ceil(video.duration / bg_music.duration))
-                bg_music = concatenate_audioclips([bg_music] * repeats)
-            
-            # Trim to video duration
-            bg_music = bg_music.subclipped(0, video.duration)
-            
-            # Adjust volume (Available in MoviePy v1 as volumex, v2 might differ but audio_fadein usually works)
-            # We will use the same manual numpy approach as original audio to be safe and consistent
-            # Export to temp wav to adjust volume reliably
-            temp_bg = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-            bg_temp_path = temp_bg.name
-            temp_bg.close()
-            
-            bg_music.write_audiofile(bg_temp_path, fps=44100, nbytes=2, codec='pcm_s16le', logger=None)
-            
-            # Read and adjust volume
-            sr, bg_data = wavfile.read(bg_temp_path)
-            bg_data = (bg_data * background_volume_factor).astype(bg_data.dtype)
-            wavfile.write(bg_temp_path, sr, bg_data)
-            
-            # Load back
-            bg_music_final = AudioFileClip(bg_temp_path)
-            audio_clips.append(bg_music_final)
-            print(f"   🎵 Added background track: {os.path.basename(background_track_path)} (Vol: {background_volume_factor*100:.0f}%)")
-            
-            # Clean up later handled by OS or maybe we should track it
-        except Exception as e:
-            print(f"   ⚠️ Error processing background music: {e}")
-    
-    # THEN conditionally add original audio with volume control
-    if keep_original_audio and original_audio:
-        # Apply volume factor if different from 1.0
-        if original_volume_factor != 1.0:
-            # Export to temporary WAV, modify volume, and reload
-            temp_audio = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-            temp_path = temp_audio.name
-            temp_audio.close()
-            
-            try:
-                # Export original audio to WAV
-                original_audio.write_audiofile(temp_path, fps=44100, nbytes=2, codec='pcm_s16le', logger=None)
-                
-                # Read WAV file
-                sample_rate, audio_data = wavfile.read(temp_path)
-                
-                # Multiply by volume factor
-                audio_data = (audio_data * original_volume_factor).astype(audio_data.dtype)
-                
-                # Write modified audio
-                wavfile.write(temp_path, sample_rate, audio_data)
-                
-                # Load modified audio
-                original_audio = AudioFileClip(temp_path)
-                print(f"   🔊 Original audio volume adjusted to {original_volume_factor*100:.0f}%")
-            except Exception as e:
-                print(f"   ⚠️ Warning: Could not adjust volume, using original: {e}")
-                # If volume adjustment fails, use original audio as-is
-            finally:
-                # Clean up temp file if it still exists
-                try:
-                    if os.path.exists(temp_path):
-                        os.unlink(temp_path)
-                except:
-                    pass
-        
-        audio_clips.append(original_audio)
 
-    if audio_clips:
-        final_audio = CompositeAudioClip(audio_clips)
+    # Decode every stem once through MoviePy and mix in memory (no temp WAV round trips)
+    pcm = render_audio_mix(
+        video_path=video_path,
+        audio_map=audio_map,
+        duration=video.duration,
+        keep_original_audio=keep_original_audio,
+        has_original_audio=video.audio is not None,
+        original_volume_factor=original_volume_factor,
+        background_track_path=background_track_path,
+        background_volume_factor=background_volume_factor,
+        ducking=ducking,
+        decoder=decode_audio_moviepy
+    )
+
+    if pcm.any():
+        final_audio = AudioArrayClip(pcm, fps=MIX_SAMPLE_RATE)
         # MoviePy v2.0 uses with_audio
         final_video = video.with_audio(final_audio)
     else:
@@ -132,7 +94,10 @@ def mix_audio_with_video(
         final_video = video.without_audio()
     
 
-    final_video.write_videofile(output_path, codec="libx264", audio_codec="aac")
+    final_video.write_videofile(
+        output_path, codec="libx264", audio_codec="aac",
+        ffmpeg_params=progress_args(progress_path) or None
+    )
     
     video.close()
 
@@ -140,13 +105,16 @@ def create_reel_video(
     scenes: List[dict],
     audio_map: List[dict],
     output_path: str,
-    background_track: Optional[str] = None
+    background_track: Optional[str] = None,
+    progress_path: Optional[str] = None
 ):
     """
     Creates a vertical Reel/Short from images and audio.
     OPTIMIZED for speed - reduced resolution, no dynamic effects.
+    progress_path: file the encoding ffmpeg writes -progress reports to.
     """
     from moviepy import ImageClip, CompositeVideoClip, ColorClip
+    from src.infrastructure.video.ffmpeg_progress import progress_args
     
     clips = []
     current_time = 0.0
@@ -226,5 +194,6 @@ def create_reel_video(
         codec="libx264", 
         audio_codec="aac",
         threads=8,  # Increased from 4
-        preset="ultrafast"  # Fastest encoding
+        preset="ultrafast",  # Fastest encoding
+        ffmpeg_params=progress_args(progress_path) or None
     )
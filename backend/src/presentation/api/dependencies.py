@@ -22,6 +22,7 @@ from src.infrastructure.video.moviepy_adapter import MoviePyAdapter
 from src.infrastructure.storage.minio_adapter import MinIOAdapter
 from src.infrastructure.images.pexels_adapter import PexelsAdapter
 from src.infrastructure.auth.social_auth_adapter import SocialAuthAdapter
+from src.infrastructure.jobs import JobQueue
 
 # Application
 from src.application.use_cases.analyze_video_use_case import AnalyzeVideoUseCase
@@ -71,6 +72,12 @@ def get_social_auth_repository() -> ISocialAuthRepository:
     return SocialAuthAdapter()
 
 
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    """Provide the background job queue (Postgres)"""
+    return JobQueue()
+
+
 # ============= Use Case Providers =============
 
 def get_analyze_video_use_case() -> AnalyzeVideoUseCase:
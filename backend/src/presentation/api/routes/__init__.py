@@ -1,5 +1,4 @@
 # Route modules exports
-from src.presentation.api.routes import auth, videos, analysis, voices, social, reels
-
-__all__ = ["auth", "videos", "analysis", "voices", "social", "reels"]
+from src.presentation.api.routes import auth, videos, analysis, voices, social, reels, jobs, progress
 
+__all__ = ["auth", "videos", "analysis", "voices", "social", "reels", "jobs", "progress"]
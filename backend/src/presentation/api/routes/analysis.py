@@ -17,11 +17,33 @@ from src.application.use_cases.analyze_video_use_case import (
     AnalyzeVideoUseCase,
     AnalyzeVideoRequest
 )
+from src.application.services.progress import get_progress_broker, STAGE_UPLOAD
 from src.presentation.api.dependencies import get_analyze_video_use_case
 
 router = APIRouter(tags=["analysis"])
 
 
+async def save_upload(video: UploadFile) -> str:
+    """Write an uploaded video to src/temp/uploads and return its path"""
+    file_path = f"src/temp/uploads/{int(time.time())}_{video.filename}"
+    with open(file_path, "wb") as f:
+        content = await video.read()
+        f.write(content)
+    
+    print(f"[{time.strftime('%X')}] 💾 Video saved: {file_path}")
+    return file_path
+
+
+def remove_upload(file_path: str):
+    """Delete an uploaded video once its request is over"""
+    try:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+            print(f"   ✅ Removed: {file_path}")
+    except OSError as e:
+        print(f"   ⚠️ Could not remove {file_path}: {e}")
+
+
 @router.post("/analyze-v2")
 async def analyze_video_v2(
     video: UploadFile = File(...),  # ✅ Changed from 'file' to 'video' to match frontend
@@ -34,6 +56,9 @@ async def analyze_video_v2(
     original_volume: int = Form(10),  # ✅ Changed to int to match frontend
     background_track: Optional[str] = Form(None),  # ✅ Changed from background_music_file
     background_volume: int = Form(10),
+    ducking: bool = Form(True),
+    input_mode: str = Form("video"),  # "video" or "frames"
+    progress_id: Optional[str] = Form(None),  # Stream progress from /progress/{progress_id}/events
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_db_session),
     use_case: AnalyzeVideoUseCase = Depends(get_analyze_video_use_case)
@@ -46,13 +71,17 @@ async def analyze_video_v2(
     if current_user.credits <= 0:
         raise HTTPException(400, "Insufficient credits")
     
-    # Save uploaded file
-    file_path = f"src/temp/uploads/{int(time.time())}_{video.filename}"
-    with open(file_path, "wb") as f:
-        content = await video.read()
-        f.write(content)
+    if input_mode not in ("video", "frames"):
+        raise HTTPException(400, "input_mode must be 'video' or 'frames'")
     
-    print(f"[{time.strftime('%X')}] 💾 Video saved: {file_path}")
+    try:
+        progress = get_progress_broker().reporter(progress_id, current_user.id)
+    except PermissionError:
+        raise HTTPException(409, "progress_id is already in use")
+    
+    # Save uploaded file
+    file_path = await save_upload(video)
+    progress.emit(STAGE_UPLOAD, "Video received")
     
     try:
         # Create request DTO
@@ -65,12 +94,15 @@ async def analyze_video_v2(
             language="es",
             original_volume=original_volume / 100.0,  # Convert percentage to decimal
             background_music_path=f"src/assets/music/{background_track}" if background_track else None,
+            background_volume=background_volume / 100.0,
+            ducking=ducking,
+            input_mode=input_mode,
             session=session  # ✅ Pass DB session for saving video record
         )
         
         # Execute use case
         print(f"[{time.strftime('%X')}] 🚀 Executing AnalyzeVideoUseCase...")
-        response = await use_case.execute(request)
+        response = await use_case.execute(request, progress)
         
         if not response.success:
             raise HTTPException(500, response.error or "Analysis failed")
@@ -96,6 +128,17 @@ async def analyze_video_v2(
         import traceback
         traceback.print_exc()
         raise HTTPException(500, f"Processing failed: {str(e)}")
+    finally:
+        remove_upload(file_path)
+
+
+@router.get("/analysis/latency")
+async def get_analysis_latency(current_user: User = Depends(get_current_user)):
+    """Get AI analysis latency per mode (unified/two_stage, video/frames, cache hits)"""
+    from src.presentation.api.dependencies import get_ai_repository
+    
+    ai = get_ai_repository()
+    return ai.get_latency_stats() if hasattr(ai, "get_latency_stats") else {}
 
 
 # Keep old endpoint for backward compatibility
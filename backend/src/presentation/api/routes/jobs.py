@@ -0,0 +1,180 @@
+"""
+Jobs Router - Background processing endpoints
+Submitting returns immediately with a job id; a worker process
+(src.presentation.worker) runs the pipeline and charges credits on success.
+"""
+import asyncio
+from dataclasses import asdict
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from typing import Optional
+
+from src.infrastructure.database import User
+from src.infrastructure.auth import get_current_user
+from src.infrastructure.jobs import JobQueue, job_to_dict, JOB_CREDIT_COSTS
+
+from src.application.use_cases.analyze_video_use_case import AnalyzeVideoRequest
+from src.application.use_cases.create_reel_use_case import CreateReelRequest
+from src.presentation.api.dependencies import get_job_queue
+from src.presentation.api.routes.analysis import save_upload, remove_upload
+from src.presentation.api.routes.progress import sse_message, sse_keepalive, SSE_HEADERS, SSE_KEEPALIVE_S
+from src.presentation.api.routes.reels import ReelCreationRequest
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+# How often /jobs/{job_id}/events re-reads the job row
+JOB_EVENTS_POLL_S = 1.0
+
+
+@router.post("/analyze", status_code=202)
+async def submit_analyze_job(
+    video: UploadFile = File(...),
+    style: str = Form("viral"),
+    pace: str = Form("medium"),
+    voice_id: Optional[str] = Form(None),
+    original_volume: int = Form(10),
+    background_track: Optional[str] = Form(None),
+    background_volume: int = Form(10),
+    ducking: bool = Form(True),
+    input_mode: str = Form("video"),
+    current_user: User = Depends(get_current_user),
+    queue: JobQueue = Depends(get_job_queue)
+):
+    """
+    Queue a video analysis (same form as /analyze-v2)
+
+    Poll /jobs/{job_id} for progress and /jobs/{job_id}/result for the output
+    """
+    if current_user.credits < JOB_CREDIT_COSTS["analyze_video"]:
+        raise HTTPException(400, "Insufficient credits")
+
+    if input_mode not in ("video", "frames"):
+        raise HTTPException(400, "input_mode must be 'video' or 'frames'")
+
+    file_path = await save_upload(video)
+
+    try:
+        request = AnalyzeVideoRequest(
+            video_path=file_path,
+            user_id=current_user.id,
+            style=style,
+            pace=pace,
+            voice_id=voice_id,
+            language="es",
+            original_volume=original_volume / 100.0,
+            background_music_path=f"src/assets/music/{background_track}" if background_track else None,
+            background_volume=background_volume / 100.0,
+            ducking=ducking,
+            input_mode=input_mode
+        )
+        payload = {k: v for k, v in asdict(request).items() if k != "session"}
+
+        job = await queue.submit(current_user.id, "analyze_video", payload)
+    except Exception:
+        # No job row points at the upload, so no worker will ever remove it
+        remove_upload(file_path)
+        raise
+    return job_to_dict(job)
+
+
+@router.post("/reels", status_code=202)
+async def submit_reel_job(
+    request: ReelCreationRequest,
+    current_user: User = Depends(get_current_user),
+    queue: JobQueue = Depends(get_job_queue)
+):
+    """Queue a reel render (same body as /reels/create)"""
+    if current_user.credits < JOB_CREDIT_COSTS["create_reel"]:
+        raise HTTPException(403, "Insufficient credits")
+
+    payload = asdict(CreateReelRequest(
+        script=request.script,
+        voice_id=request.voice_id,
+        user_id=current_user.id,
+        bg_music=request.bg_music
+    ))
+
+    job = await queue.submit(current_user.id, "create_reel", payload)
+    return job_to_dict(job)
+
+
+@router.get("")
+async def list_jobs(
+    current_user: User = Depends(get_current_user),
+    queue: JobQueue = Depends(get_job_queue)
+):
+    """Most recent jobs of the current user"""
+    jobs = await queue.list_for_user(current_user.id)
+    return {"jobs": [job_to_dict(job) for job in jobs]}
+
+
+@router.get("/{job_id}")
+async def get_job_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    queue: JobQueue = Depends(get_job_queue)
+):
+    """Job status (queued, running, completed, failed)"""
+    job = await queue.get(job_id, user_id=current_user.id)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+    return job_to_dict(job)
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    queue: JobQueue = Depends(get_job_queue)
+):
+    """Output of a completed job"""
+    job = await queue.get(job_id, user_id=current_user.id)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+    if job.status == "failed":
+        raise HTTPException(500, job.error or "Job failed")
+    if job.status != "completed":
+        raise HTTPException(409, f"Job is {job.status}")
+    return job_to_dict(job, include_result=True)
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    queue: JobQueue = Depends(get_job_queue)
+):
+    """
+    Stream a job's progress as SSE
+
+    The worker runs in another process, so this follows the job row:
+    `event: progress` for each new stage/percent, `event: status` on status
+    changes, and a final `event: done` with the job once it finishes.
+    """
+    job = await queue.get(job_id, user_id=current_user.id)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+
+    async def frames():
+        current, last_status, last_progress, idle = job, None, None, 0.0
+        while True:
+            if current.status != last_status:
+                last_status = current.status
+                yield sse_message("status", {"status": current.status, "attempts": current.attempts})
+            if current.progress and current.progress != last_progress:
+                last_progress = current.progress
+                yield sse_message("progress", current.progress)
+            if current.status in ("completed", "failed"):
+                yield sse_message("done", job_to_dict(current))
+                return
+
+            await asyncio.sleep(JOB_EVENTS_POLL_S)
+            idle += JOB_EVENTS_POLL_S
+            if idle >= SSE_KEEPALIVE_S:
+                idle = 0.0
+                yield sse_keepalive()
+            current = await queue.get(job_id, user_id=current_user.id)
+            if current is None:
+                return
+
+    return StreamingResponse(frames(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -0,0 +1,54 @@
+"""
+Progress Router - Server-Sent Events for long-running requests
+The client picks a progress id (e.g. a UUID), opens
+GET /progress/{progress_id}/events and sends the same id as `progress_id`
+with /analyze-v2 or /reels/create. The two requests may be served by
+different API processes: events are relayed between them through Postgres
+LISTEN/NOTIFY. Background jobs stream from /jobs/{job_id}/events instead.
+"""
+import json
+from typing import Dict
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from src.infrastructure.database import User
+from src.infrastructure.auth import get_current_user
+from src.application.services.progress import get_progress_broker
+
+router = APIRouter(prefix="/progress", tags=["progress"])
+
+# Comment line sent while nothing happens, so proxies don't drop the idle connection
+SSE_KEEPALIVE_S = 15.0
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_message(event: str, data: Dict) -> str:
+    """One SSE frame"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def sse_keepalive() -> str:
+    return ": keepalive\n\n"
+
+
+@router.get("/{progress_id}/events")
+async def stream_progress(
+    progress_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream progress events of a request as SSE
+
+    Events (`event: progress`) carry stage, message, current/total, percent
+    and timestamp; the stream ends after a `completed` or `failed` stage.
+    """
+    try:
+        events = get_progress_broker().subscribe(progress_id, current_user.id, keepalive_s=SSE_KEEPALIVE_S)
+    except PermissionError:
+        raise HTTPException(403, "Progress id belongs to another user")
+
+    async def frames():
+        async for event in events:
+            yield sse_keepalive() if event is None else sse_message("progress", event.to_dict())
+
+    return StreamingResponse(frames(), media_type="text/event-stream", headers=SSE_HEADERS)
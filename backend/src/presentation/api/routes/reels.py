@@ -18,6 +18,7 @@ from src.application.use_cases.create_reel_use_case import (
     CreateReelUseCase,
     CreateReelRequest
 )
+from src.application.services.progress import get_progress_broker
 from src.presentation.api.dependencies import (
     get_generate_reel_script_use_case,
     get_create_reel_use_case
@@ -38,6 +39,7 @@ class ReelCreationRequest(BaseModel):
     script: dict
     voice_id: str
     bg_music: Optional[str] = None
+    progress_id: Optional[str] = None  # Stream progress from /progress/{progress_id}/events
 
 
 @router.post("/generate-script")
@@ -93,6 +95,11 @@ async def create_reel(
     if current_user.credits < REEL_COST:
         raise HTTPException(403, "Insufficient credits")
     
+    try:
+        progress = get_progress_broker().reporter(request.progress_id, current_user.id)
+    except PermissionError:
+        raise HTTPException(409, "progress_id is already in use")
+    
     print(f"[Reels] Creating reel for user {current_user.id}")
     
     response = await use_case.execute(
@@ -101,7 +108,8 @@ async def create_reel(
             voice_id=request.voice_id,
             user_id=current_user.id,
             bg_music=request.bg_music
-        )
+        ),
+        progress
     )
     
     if not response.success:
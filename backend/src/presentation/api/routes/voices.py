@@ -1,11 +1,15 @@
 """
 Voices Router - Voice management and preview endpoints
 """
-from fastapi import APIRouter, Form, HTTPException
+from fastapi import APIRouter, Depends, Form, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
 import os
 
+from src.infrastructure.concurrency import run_blocking
+from src.infrastructure.database import User
+from src.infrastructure.auth import get_current_user
+
 router = APIRouter(prefix="/voices", tags=["voices"])
 audio_router = APIRouter(prefix="/audio", tags=["audio"])
 
@@ -21,7 +25,7 @@ async def get_available_voices():
             raise HTTPException(500, "ElevenLabs API key not configured")
         
         client = ElevenLabs(api_key=api_key)
-        voices_response = client.voices.get_all()
+        voices_response = await run_blocking("elevenlabs", client.voices.get_all)
         
         voices = [
             {
@@ -54,7 +58,9 @@ async def preview_voice(
         
         output_path = f"src/temp/outputs/preview_{voice_id}_{int(time.time())}.mp3"
         
-        result = generate_audio_for_beat(
+        result = await run_blocking(
+            "elevenlabs",
+            generate_audio_for_beat,
             text=text,  # ✅ Use text parameter
             output_path=output_path,
             voice_id=voice_id,
@@ -83,6 +89,14 @@ async def preview_voice(
         raise HTTPException(500, f"Preview failed: {str(e)}")
 
 
+@router.get("/cache/stats")
+async def get_tts_cache_stats(current_user: User = Depends(get_current_user)):
+    """Get TTS cache hit/miss counters and disk usage"""
+    from src.infrastructure.tts import get_tts_cache
+    
+    return get_tts_cache().stats()
+
+
 @audio_router.get("/background-tracks")
 async def get_background_tracks():
     """Get list of available background music tracks"""
@@ -8,7 +8,7 @@ from fastapi.staticfiles import StaticFiles
 import os
 
 # Import all routers
-from src.presentation.api.routes import auth, videos, analysis, voices, social, reels
+from src.presentation.api.routes import auth, videos, analysis, voices, social, reels, jobs, progress
 
 # Ensure directories exist (all temp files go into src/temp)
 os.makedirs("src/temp/uploads", exist_ok=True)
@@ -75,6 +75,14 @@ app = FastAPI(
             "name": "reels",
             "description": "Viral short video generation"
         },
+        {
+            "name": "jobs",
+            "description": "Background jobs - queue analyses/reels and poll for the result"
+        },
+        {
+            "name": "progress",
+            "description": "Server-Sent Events with stage progress of long-running requests"
+        },
         {
             "name": "audio",
             "description": "Background music management"
@@ -93,9 +101,34 @@ async def startup_event():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     print("✅ Database initialized")
+
+    # TTL eviction for cached Gemini analyses
+    from src.infrastructure.ai.analysis_cache import AnalysisCache, ANALYSIS_CACHE_ENABLED
+    if ANALYSIS_CACHE_ENABLED:
+        try:
+            purged = await AnalysisCache().purge_expired()
+            print(f"🧹 Analysis cache: purged {purged} expired entries")
+        except Exception as e:
+            print(f"⚠️ Analysis cache purge failed: {e}")
+
+    # Progress events of requests handled by other API processes
+    from src.application.services.progress import get_progress_broker
+    from src.infrastructure.database.progress_relay import start_progress_relay
+    start_progress_relay(get_progress_broker())
     print("📚 API Docs: http://localhost:8000/docs")
     print("📖 ReDoc: http://localhost:8000/redoc")
 
+# Shutdown event
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the progress relay, render workers and service thread pools"""
+    from src.infrastructure.video.render_pool import get_render_pool
+    from src.infrastructure.concurrency import shutdown_service_pools
+    from src.infrastructure.database.progress_relay import stop_progress_relay
+    await stop_progress_relay()
+    get_render_pool().shutdown()
+    shutdown_service_pools()
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -117,6 +150,8 @@ app.include_router(voices.router)
 app.include_router(voices.audio_router)  # Audio endpoints
 app.include_router(social.router)
 app.include_router(reels.router)
+app.include_router(jobs.router)
+app.include_router(progress.router)
 
 # Health check
 @app.get("/", tags=["health"])
@@ -131,6 +166,18 @@ async def health_check():
     }
 
 
+@app.get("/metrics/executors", tags=["health"])
+async def executor_metrics():
+    """Queue depth and wait/run times of the service thread pools, render pool and pipeline stages"""
+    from src.infrastructure.video.render_pool import get_render_pool
+    from src.infrastructure.concurrency import service_pool_stats, pipeline_stats
+    return {
+        "service_pools": service_pool_stats(),
+        "render_pool": get_render_pool().stats(),
+        "pipelines": pipeline_stats()
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     print("🚀 Starting AI Video Narrator API...")
@@ -0,0 +1,262 @@
+"""
+Background Worker - runs queued jobs outside the API process
+Claims jobs from the Postgres queue and executes the same use cases the HTTP
+endpoints use. Run one or more of these next to the API:
+
+    python -m src.presentation.worker
+"""
+import os
+import signal
+import socket
+import asyncio
+import traceback
+import uuid
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.database import async_session_maker, engine, Base, Job, Video
+from src.infrastructure.jobs import JobQueue, InsufficientCreditsError, JobLostError
+from src.infrastructure.concurrency import shutdown_service_pools
+from src.infrastructure.video.render_pool import get_render_pool
+from src.application.services.progress import ProgressEvent, ProgressReporter, STAGE_COMPLETED, STAGE_FAILED
+from src.application.use_cases.analyze_video_use_case import AnalyzeVideoRequest
+from src.application.use_cases.create_reel_use_case import CreateReelRequest
+from src.presentation.api.dependencies import get_analyze_video_use_case, get_create_reel_use_case
+
+# Jobs run at once by one worker process (each job already fans out TTS internally)
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "1"))
+WORKER_POLL_INTERVAL_S = float(os.getenv("WORKER_POLL_INTERVAL_S", "2"))
+WORKER_HEARTBEAT_S = float(os.getenv("WORKER_HEARTBEAT_S", "30"))
+# How often the latest progress event is written to the job row (clients stream it via SSE)
+WORKER_PROGRESS_FLUSH_S = float(os.getenv("WORKER_PROGRESS_FLUSH_S", "1"))
+# Comma-separated job kinds this worker accepts (empty = all), e.g. to run render-only pools
+WORKER_JOB_KINDS = [k for k in os.getenv("WORKER_JOB_KINDS", "").split(",") if k]
+
+
+async def handle_analyze_video(job: Job, session: AsyncSession, progress: ProgressReporter) -> Dict:
+    """analyze_video: narrate an uploaded video (the use case adds the Video row to session)"""
+    request = AnalyzeVideoRequest(**job.payload, session=session)
+    response = await get_analyze_video_use_case().execute(request, progress)
+    if not response.success:
+        raise RuntimeError(response.error or "Analysis failed")
+
+    return {
+        "analysis": response.analysis.model_dump() if response.analysis else None,
+        "storage_url": response.storage_url,
+        "output_video": response.final_video_path
+    }
+
+
+async def handle_create_reel(job: Job, session: AsyncSession, progress: ProgressReporter) -> Dict:
+    """create_reel: render a reel from a script and record it as a Video"""
+    response = await get_create_reel_use_case().execute(CreateReelRequest(**job.payload), progress)
+    if not response.success:
+        raise RuntimeError(response.error or "Reel creation failed")
+
+    filename = response.storage_url.split("/")[-1].split("?")[0] if response.storage_url else "reel.mp4"
+    video = Video(
+        user_id=job.user_id,
+        original_filename=filename,
+        storage_url=response.storage_url,
+        storage_object_name=f"users/{job.user_id}/videos/{filename}",
+        status="completed",
+        completed_at=datetime.utcnow()
+    )
+    session.add(video)
+    await session.flush()
+
+    return {"storage_url": response.storage_url, "video_id": video.id}
+
+
+JOB_HANDLERS: Dict[str, Callable[[Job, AsyncSession, ProgressReporter], Awaitable[Dict]]] = {
+    "analyze_video": handle_analyze_video,
+    "create_reel": handle_create_reel,
+}
+
+# Payload fields holding files the API wrote for the job (removed once no attempt can need them again)
+JOB_INPUT_FILES: Dict[str, List[str]] = {
+    "analyze_video": ["video_path"],
+}
+
+
+def remove_job_inputs(job: Job):
+    """Delete a finished job's uploaded inputs (after its final commit or final failure)"""
+    for field in JOB_INPUT_FILES.get(job.kind, []):
+        path = (job.payload or {}).get(field)
+        if not path:
+            continue
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+                print(f"   ✅ Removed: {path}")
+        except OSError as e:
+            print(f"   ⚠️ Could not remove {path}: {e}")
+
+
+class Worker:
+    """Polls the job queue and runs up to `concurrency` jobs at a time"""
+
+    def __init__(self, queue: JobQueue = None, concurrency: int = WORKER_CONCURRENCY, kinds=None):
+        self.queue = queue or JobQueue()
+        self.concurrency = max(1, concurrency)
+        self.kinds = kinds if kinds is not None else WORKER_JOB_KINDS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._stopping = asyncio.Event()
+
+    def stop(self):
+        """Stop claiming new jobs; running jobs are allowed to finish"""
+        if not self._stopping.is_set():
+            print(f"🛑 Worker {self.worker_id} stopping after the current jobs...")
+            self._stopping.set()
+
+    async def run(self):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await self._requeue_stale()
+        print(f"👷 Worker {self.worker_id} started (concurrency {self.concurrency}, "
+              f"kinds: {', '.join(self.kinds) or 'all'})")
+
+        slots = asyncio.Semaphore(self.concurrency)
+        running = set()
+        idle_polls = 0
+
+        while not self._stopping.is_set():
+            await slots.acquire()
+            if self._stopping.is_set():
+                slots.release()
+                break
+            try:
+                job = await self.queue.claim(self.worker_id, self.kinds or None)
+            except Exception as e:
+                print(f"⚠️ Job claim failed: {e}")
+                job = None
+
+            if job is None:
+                slots.release()
+                idle_polls += 1
+                # Look for jobs abandoned by dead workers now and then while idle
+                if idle_polls % 30 == 0:
+                    await self._requeue_stale()
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=WORKER_POLL_INTERVAL_S)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            idle_polls = 0
+            task = asyncio.create_task(self._run_job(job))
+            running.add(task)
+            task.add_done_callback(running.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        get_render_pool().shutdown()
+        shutdown_service_pools()
+        await engine.dispose()
+        print(f"👋 Worker {self.worker_id} stopped")
+
+    async def _requeue_stale(self):
+        try:
+            for job in await self.queue.requeue_stale():
+                remove_job_inputs(job)
+        except Exception as e:
+            print(f"⚠️ Stale job recovery failed: {e}")
+
+    async def _heartbeat(self, job: Job):
+        while True:
+            await asyncio.sleep(WORKER_HEARTBEAT_S)
+            try:
+                if not await self.queue.heartbeat(job):
+                    print(f"⚠️ Lost ownership of job {job.id}")
+                    return
+            except Exception as e:
+                print(f"⚠️ Heartbeat failed for job {job.id}: {e}")
+
+    async def _flush_progress(self, job: Job, latest: Dict[str, Optional[ProgressEvent]]):
+        """Write the newest progress event to the job row, at most every WORKER_PROGRESS_FLUSH_S"""
+        written = None
+        while True:
+            await asyncio.sleep(WORKER_PROGRESS_FLUSH_S)
+            event = latest["event"]
+            if event is None or event is written:
+                continue
+            try:
+                await self.queue.update_progress(job, event.to_dict())
+                written = event
+            except Exception as e:
+                print(f"⚠️ Progress update failed for job {job.id}: {e}")
+
+    @staticmethod
+    async def _stop(task: asyncio.Task):
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    @staticmethod
+    def _final_progress(latest: Dict[str, Optional[ProgressEvent]], stage: str, message: str = "") -> Dict:
+        """The handler's own terminal event if it emitted one, else a generic one for `stage`"""
+        event = latest["event"]
+        if event is None or event.stage != stage:
+            event = ProgressEvent(stage, message)
+        return event.to_dict()
+
+    async def _run_job(self, job: Job):
+        print(f"▶️ Job {job.id} ({job.kind}) attempt {job.attempts}/{job.max_attempts}")
+        handler = JOB_HANDLERS.get(job.kind)
+        if handler is None:
+            await self.queue.fail(job, f"No handler for job kind '{job.kind}'", retry=False)
+            return
+
+        latest: Dict[str, Optional[ProgressEvent]] = {"event": None}
+        progress = ProgressReporter(lambda event: latest.update(event=event))
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        flusher = asyncio.create_task(self._flush_progress(job, latest))
+        try:
+            async with async_session_maker() as session:
+                # Inputs stay on disk until no attempt can need them: a requeued
+                # attempt (lost worker, retry) must still find the upload
+                # The flusher is stopped before the status change and the terminal event is
+                # written with it: a flush after that would be refused (job no longer running),
+                # leaving SSE clients without their completed/failed event
+                try:
+                    result = await handler(job, session, progress)
+                    await self._stop(flusher)
+                    # Charge + status change + the handler's rows commit together
+                    await self.queue.complete(
+                        session, job, result, progress=self._final_progress(latest, STAGE_COMPLETED)
+                    )
+                    remove_job_inputs(job)
+                except InsufficientCreditsError as e:
+                    await session.rollback()
+                    await self._stop(flusher)
+                    await self.queue.fail(
+                        job, str(e), retry=False, progress=ProgressEvent(STAGE_FAILED, str(e)).to_dict()
+                    )
+                    remove_job_inputs(job)
+                except JobLostError as e:
+                    await session.rollback()
+                    print(f"⚠️ {e}, discarding result")
+                except Exception as e:
+                    await session.rollback()
+                    traceback.print_exc()
+                    await self._stop(flusher)
+                    final = self._final_progress(latest, STAGE_FAILED, str(e))
+                    if not await self.queue.fail(job, str(e), progress=final):
+                        remove_job_inputs(job)
+        finally:
+            heartbeat.cancel()
+            flusher.cancel()
+
+
+async def main():
+    worker = Worker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""
+In-memory NumPy mixer (looping, offsets, gains, clipping) and the ducking envelope/expression (no ffmpeg needed)
+Run from backend/: python -m pytest tests
+"""
+import numpy as np
+
+from src.infrastructure.video.audio_mixer import build_duck_envelope, loop_to_length, mix_stems
+from src.infrastructure.video.ffmpeg_mixer import build_duck_expression, build_mix_filtergraph
+
+RATE = 10  # samples per second, keeps offsets readable
+
+
+def stereo(values) -> np.ndarray:
+    mono = np.asarray(values, dtype=np.float32)
+    return np.stack([mono, mono], axis=1)
+
+
+def test_loop_to_length_repeats_and_trims():
+    looped = loop_to_length(stereo([1, 2, 3]), 7)
+
+    assert looped[:, 0].tolist() == [1, 2, 3, 1, 2, 3, 1]
+
+
+def test_loop_to_length_trims_long_buffers_and_fills_empty_ones():
+    assert len(loop_to_length(stereo(range(20)), 5)) == 5
+
+    silent = loop_to_length(np.zeros((0, 2), dtype=np.float32), 4)
+    assert silent.shape == (4, 2) and not silent.any()
+
+
+def test_mix_stems_offsets_and_gains():
+    mix = mix_stems(
+        length=10,
+        narration=[(stereo([0.5, 0.5]), 0.3)],
+        original=stereo([0.2] * 10),
+        original_gain=0.5,
+        background=stereo([0.4, 0.0]),
+        background_gain=0.5,
+        sample_rate=RATE
+    )
+
+    expected = [0.1 + (0.2 if i % 2 == 0 else 0.0) + (0.5 if i in (3, 4) else 0.0) for i in range(10)]
+    assert mix.shape == (10, 2)
+    np.testing.assert_allclose(mix[:, 0], expected, atol=1e-6)
+    np.testing.assert_allclose(mix[:, 0], mix[:, 1])
+
+
+def test_mix_stems_drops_late_narration_and_clips():
+    mix = mix_stems(
+        length=4,
+        narration=[(stereo([0.9, 0.9, 0.9]), 0.2), (stereo([1.0]), 5.0)],
+        original=stereo([0.5] * 4),
+        sample_rate=RATE
+    )
+
+    np.testing.assert_allclose(mix[:, 0], [0.5, 0.5, 1.0, 1.0])
+
+
+def eval_duck_expression(expression: str, t: float) -> float:
+    """Evaluate an ffmpeg volume expression of t (it only uses clip, max and arithmetic)"""
+    return eval(expression, {"__builtins__": {}}, {"clip": lambda x, lo, hi: min(max(x, lo), hi), "max": max, "t": t})
+
+
+def test_duck_envelope_trapezoid():
+    # Narration from 2s to 4s; 1s attack before it, 1s release after it
+    envelope = build_duck_envelope([(2.0, 2.0)], 80, sample_rate=RATE, depth=0.5, attack_s=1.0, release_s=1.0)
+
+    assert envelope[:10].tolist() == [1.0] * 10
+    assert envelope[15] == 0.75  # halfway down the attack
+    np.testing.assert_allclose(envelope[20:41], 0.5)
+    assert envelope[45] == 0.75  # halfway up the release
+    assert envelope[50:].tolist() == [1.0] * 30
+
+
+def test_duck_envelope_overlaps_never_duck_deeper_than_depth():
+    envelope = build_duck_envelope(
+        [(1.0, 2.0), (2.0, 2.0), (9.0, 0.0)], 60, sample_rate=RATE, depth=0.6, attack_s=0.5, release_s=0.5
+    )
+
+    assert envelope.min() >= 0.4 - 1e-6
+    np.testing.assert_allclose(envelope[10:41], 0.4, atol=1e-6)
+    # Zero-length intervals don't duck
+    assert envelope[55:].tolist() == [1.0] * 5
+
+
+def test_duck_expression_matches_envelope():
+    intervals = [(0.5, 1.0), (1.2, 0.6), (4.0, 1.5)]
+    envelope = build_duck_envelope(intervals, 8 * RATE * 10, sample_rate=RATE * 10,
+                                   depth=0.6, attack_s=0.15, release_s=0.5)
+    expression = build_duck_expression(intervals, depth=0.6, attack_s=0.15, release_s=0.5)
+
+    for i in range(0, len(envelope), 7):
+        assert abs(eval_duck_expression(expression, i / (RATE * 10)) - envelope[i]) < 0.01
+
+
+def test_duck_expression_without_narration():
+    assert build_duck_expression([]) is None
+    assert build_duck_expression([(1.0, 0.0)]) is None
+
+
+def test_ducking_only_touches_the_bed():
+    graph = build_mix_filtergraph(
+        [(1, 0.0)], original_input=0, background_input=2, duration=5.0, duck_expression="1-0.5"
+    )
+    chains = dict(chain.rsplit("[", 1)[::-1] for chain in graph.split(";"))
+
+    assert "volume='1-0.5':eval=frame" in chains["bg]"]
+    assert "volume='1-0.5':eval=frame" in chains["orig]"]
+    assert "volume=" not in chains["n0]"]
@@ -0,0 +1,77 @@
+"""
+Header-based MP3/WAV duration probe on synthetic files (no ffprobe needed)
+Run from backend/: python -m pytest tests
+"""
+import struct
+
+import pytest
+
+from src.infrastructure.tts.audio_probe import mp3_duration, probe_audio_duration, wav_duration
+
+# MPEG-1 Layer III, 128 kbps, 44.1 kHz, stereo, no padding: 417-byte frames of 1152 samples
+FRAME_HEADER = b"\xff\xfb\x90\x00"
+FRAME_LENGTH = 417
+FRAME_S = 1152 / 44100
+
+
+def cbr_frames(count: int) -> bytes:
+    return (FRAME_HEADER + bytes(FRAME_LENGTH - 4)) * count
+
+
+def id3v2_tag(size: int) -> bytes:
+    syncsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    return b"ID3\x04\x00\x00" + syncsafe + bytes(size)
+
+
+def wav_file(seconds: float, data_size=None, sample_rate: int = 44100, channels: int = 2) -> bytes:
+    byte_rate = sample_rate * channels * 2
+    pcm = bytes(int(byte_rate * seconds))
+    fmt = struct.pack("<HHIIHH", 1, channels, sample_rate, byte_rate, channels * 2, 16)
+    size = len(pcm) if data_size is None else data_size
+    return (b"RIFF" + struct.pack("<I", 36 + len(pcm)) + b"WAVE"
+            + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+            + b"data" + struct.pack("<I", size) + pcm)
+
+
+def test_mp3_frame_scan():
+    assert mp3_duration(cbr_frames(100)) == pytest.approx(100 * FRAME_S)
+
+
+def test_mp3_skips_id3v2_and_id3v1():
+    data = id3v2_tag(300) + cbr_frames(40) + b"TAG" + bytes(125)
+
+    assert mp3_duration(data) == pytest.approx(40 * FRAME_S)
+
+
+def test_mp3_xing_frame_count():
+    # Xing header right after the 32-byte stereo side information of the first frame
+    xing = b"Xing" + struct.pack(">II", 0x01, 5000)
+    first = FRAME_HEADER + bytes(32) + xing
+    data = first + bytes(FRAME_LENGTH - len(first)) + cbr_frames(3)
+
+    assert mp3_duration(data) == pytest.approx(5000 * FRAME_S)
+
+
+def test_mp3_without_frames():
+    assert mp3_duration(b"not an mp3 at all" * 10) is None
+
+
+def test_wav_duration():
+    assert wav_duration(wav_file(1.5)) == pytest.approx(1.5)
+    assert wav_duration(b"RIFF\x00\x00\x00\x00AVI LIST") is None
+
+
+def test_wav_streaming_placeholder_uses_file_size():
+    data = wav_file(2.0, data_size=0xFFFFFFFF)
+
+    assert wav_duration(data, file_size=len(data)) == pytest.approx(2.0)
+
+
+def test_probe_audio_duration_reads_headers(tmp_path):
+    mp3 = tmp_path / "clip.mp3"
+    mp3.write_bytes(cbr_frames(50))
+    wav = tmp_path / "clip.wav"
+    wav.write_bytes(wav_file(0.5, sample_rate=22050, channels=1))
+
+    assert probe_audio_duration(str(mp3)) == pytest.approx(50 * FRAME_S)
+    assert probe_audio_duration(str(wav)) == pytest.approx(0.5)
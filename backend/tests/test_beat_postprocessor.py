@@ -0,0 +1,109 @@
+"""
+Deterministic beat repair: timestamps, short beats and word budgets
+Run from backend/: python -m pytest tests
+"""
+from src.application.services.beat_postprocessor import (
+    available_time,
+    repair_beats,
+    script_of,
+    split_text,
+    word_budget,
+    word_count,
+)
+from src.domain.entities.video_analysis import Beat, Voiceover
+
+
+def make_beat(start, end, script="", pause=0.0, summary=None, beat_id=None) -> Beat:
+    return Beat(id=beat_id, start_s=start, end_s=end, visual_summary=summary,
+                voiceover=Voiceover(script=script, pause_after_s=pause))
+
+
+def words(n: int, start: int = 0) -> str:
+    return " ".join(f"w{i}" for i in range(start, start + n))
+
+
+def test_split_text_prefers_sentence_then_clause():
+    assert split_text("Uno dos. Tres cuatro cinco", 4) == ("Uno dos.", "Tres cuatro cinco")
+    assert split_text("Uno dos, tres cuatro cinco", 4) == ("Uno dos,", "tres cuatro cinco")
+    assert split_text("uno dos tres cuatro cinco", 3) == ("uno dos tres", "cuatro cinco")
+    assert split_text("uno dos", 5) == ("uno dos", "")
+
+
+def test_timestamps_filled_clamped_sorted_and_deoverlapped():
+    beats = [
+        make_beat(4.0, 6.0, "c"),
+        make_beat(None, None, "a"),  # follows the previous end, runs until the next start
+        make_beat(1.0, 5.0, "b"),
+        make_beat(8.0, 30.0, "d"),
+    ]
+
+    repaired, report = repair_beats(beats, duration_s=10.0, words_per_sec=None)
+
+    assert [(b.id, script_of(b), b.start_s, b.end_s) for b in repaired] == [
+        (1, "b", 1.0, 4.0),
+        (2, "c", 4.0, 6.0),
+        (3, "a", 6.0, 8.0),
+        (4, "d", 8.0, 10.0),
+    ]
+    assert report.reordered
+    assert report.times_fixed >= 3
+
+
+def test_short_beat_merged_into_previous():
+    beats = [make_beat(0.0, 3.0, "Hola", summary="A"), make_beat(3.0, 3.2, "mundo", summary="B"),
+             make_beat(3.2, 6.0, "adiós")]
+
+    repaired, report = repair_beats(beats, duration_s=6.0, words_per_sec=None)
+
+    assert [(script_of(b), b.end_s, b.visual_summary) for b in repaired] == [
+        ("Hola mundo", 3.2, "A / B"), ("adiós", 6.0, None),
+    ]
+    assert report.merged == 1
+
+
+def test_overflow_moves_to_the_next_beat_at_a_sentence():
+    beats = [make_beat(0.0, 2.0, "Uno dos tres cuatro. Cinco seis", beat_id=7), make_beat(2.0, 10.0, "siete", beat_id=8)]
+
+    repaired, report = repair_beats(beats, duration_s=10.0, words_per_sec=2.0)
+
+    assert [script_of(b) for b in repaired] == ["Uno dos tres cuatro.", "Cinco seis siete"]
+    # Reported by the model's ids (repaired beats are renumbered afterwards)
+    assert report.overlong == [7]
+    assert report.words_moved == 2
+
+
+def test_pause_is_shortened_before_words_are_moved():
+    beats = [make_beat(0.0, 3.0, words(4), pause=2.0), make_beat(3.0, 6.0, "x")]
+
+    repaired, report = repair_beats(beats, duration_s=6.0, words_per_sec=2.0)
+
+    assert script_of(repaired[0]) == words(4)
+    assert repaired[0].voiceover.pause_after_s == 1.0
+    assert report.pauses_reduced == 1 and report.words_moved == 0
+
+
+def test_overflow_of_the_last_beat_goes_back_then_is_trimmed():
+    beats = [make_beat(0.0, 4.0, words(2)), make_beat(4.0, 6.0, words(10, start=2))]
+
+    repaired, report = repair_beats(beats, duration_s=6.0, words_per_sec=2.0)
+
+    # 8 words fit before the next beat, 4 in the last one: 12 words in order, nothing trimmed
+    assert [script_of(b) for b in repaired] == [words(8), words(4, start=8)]
+    assert report.words_trimmed == 0
+
+    beats = [make_beat(0.0, 1.0, words(2)), make_beat(1.0, 2.0, words(10, start=2))]
+    repaired, report = repair_beats(beats, duration_s=2.0, words_per_sec=2.0)
+
+    assert [script_of(b) for b in repaired] == [words(2), words(2, start=2)]
+    assert report.words_trimmed == 8
+
+
+def test_every_beat_fits_its_budget_after_repair():
+    beats = [make_beat(i * 2.0, i * 2.0 + 2.0, words(3 + (i * 7) % 9, start=i * 20), pause=0.5 * (i % 2))
+             for i in range(10)]
+
+    repaired, _ = repair_beats(beats, duration_s=20.0, words_per_sec=2.5)
+
+    for index, beat in enumerate(repaired):
+        available = available_time(repaired, index, 20.0) - (beat.voiceover.pause_after_s or 0.0)
+        assert word_count(script_of(beat)) <= word_budget(available, 2.5)
@@ -0,0 +1,68 @@
+"""
+Incremental beat extraction from streamed Gemini JSON
+Run from backend/: python -m pytest tests
+"""
+import json
+
+from src.infrastructure.ai.beat_stream_parser import BeatStreamParser
+
+RESPONSE = json.dumps({
+    "title": "Demo [draft]",
+    "beats": [
+        {"start": 0.0, "end": 2.5, "text": "Hola {mundo}"},
+        {"start": 2.5, "end": 5.0, "text": "Dice \"adiós\" y se va", "tags": ["a", "b"]},
+        {"start": 5.0, "end": 8.0, "text": "Fin", "meta": {"shot": 3}},
+    ],
+})
+
+
+def feed_in_chunks(parser: BeatStreamParser, text: str, size: int):
+    beats = []
+    for i in range(0, len(text), size):
+        beats.extend(parser.feed(text[i:i + size]))
+    return beats
+
+
+def test_beats_identical_for_any_chunking():
+    expected = json.loads(RESPONSE)["beats"]
+
+    for size in (1, 3, 7, 64, len(RESPONSE)):
+        assert feed_in_chunks(BeatStreamParser(), RESPONSE, size) == expected
+
+
+def test_beat_emitted_as_soon_as_it_closes():
+    parser = BeatStreamParser()
+    # The first "}" is inside a string; the object closes after it
+    first_end = RESPONSE.index('mundo}"}') + len('mundo}"}')
+
+    assert parser.feed(RESPONSE[:first_end - 1]) == []
+    assert parser.feed(RESPONSE[first_end - 1:first_end]) == [{"start": 0.0, "end": 2.5, "text": "Hola {mundo}"}]
+    assert parser.emitted == 1
+
+
+def test_markdown_fence_and_truncated_tail():
+    text = "Aquí está:\n```json\n" + RESPONSE[:RESPONSE.index('{"start": 5.0') + 10]
+    parser = BeatStreamParser()
+
+    beats = feed_in_chunks(parser, text, 5)
+
+    assert [b["start"] for b in beats] == [0.0, 2.5]
+    assert parser.text == text
+
+
+def test_scenes_key_and_trailing_comma():
+    beats = BeatStreamParser().feed('{"scenes": [{"start": 1, "text": "x",}, {"start": 2}]}')
+
+    assert beats == [{"start": 1, "text": "x"}, {"start": 2}]
+
+
+def test_only_the_first_beats_array_is_streamed():
+    text = '{"beats": [{"n": 1}], "debug": {"beats": [{"n": 2}]}}'
+
+    assert BeatStreamParser().feed(text) == [{"n": 1}]
+
+
+def test_malformed_beat_is_skipped():
+    beats = BeatStreamParser().feed('{"beats": [{"n": 1 "x"}, {"n": 2}]}')
+
+    assert beats == [{"n": 2}]
@@ -0,0 +1,104 @@
+"""
+Long-video chunking: boundary planning, merging and the retry/fail policy
+Run from backend/: python -m pytest tests
+"""
+import asyncio
+
+import pytest
+
+from src.domain.entities.video_analysis import Beat, Overall, VideoAnalysis, VisualBeat
+from src.infrastructure.ai.chunked_analysis import ChunkAnalysisError, analyze_chunks, merge_chunk_analyses
+from src.infrastructure.video.chunker import VideoChunk, plan_chunk_boundaries
+
+
+def test_boundaries_snap_to_nearest_keyframes():
+    keyframes = [0.0, 48.0, 98.0, 103.0, 199.0, 205.0, 260.0]
+
+    assert plan_chunk_boundaries(300.0, keyframes, target_s=120, max_chunks=8) == [0.0, 98.0, 199.0, 300.0]
+
+
+def test_boundaries_without_keyframes_split_evenly():
+    assert plan_chunk_boundaries(300.0, [], target_s=120, max_chunks=8) == [0.0, 100.0, 200.0, 300.0]
+
+
+def test_boundaries_capped_by_max_chunks():
+    assert len(plan_chunk_boundaries(2000.0, [], target_s=120, max_chunks=8)) == 9
+
+
+def test_boundaries_skip_keyframes_that_leave_tiny_chunks():
+    assert plan_chunk_boundaries(300.0, [5.0, 295.0], target_s=120, max_chunks=8) == [0.0, 300.0]
+
+
+CHUNKS = [VideoChunk(0, "c0.mp4", 0.0, 100.0), VideoChunk(1, "c1.mp4", 100.0, 180.0)]
+
+
+def beat(start: float, end: float, beat_id: int = 1) -> Beat:
+    return Beat(id=beat_id, start_s=start, end_s=end)
+
+
+def chunk_analysis(beats, narrative: str, cta=None, hook=None) -> VideoAnalysis:
+    return VideoAnalysis(
+        beats=beats,
+        overall=Overall(hook=hook, full_narrative_script=narrative),
+        visual_timeline=[VisualBeat(id=1, start_s=0.0, end_s=10.0, visual_description="shot")],
+        final_cta=cta
+    )
+
+
+def test_merge_rebases_and_renumbers():
+    merged = merge_chunk_analyses(CHUNKS, [
+        chunk_analysis([beat(0.0, 40.0, 1), beat(40.0, 95.0, 2)], "Parte uno.", hook="Gancho"),
+        chunk_analysis([beat(0.0, 30.0, 1), beat(30.0, 90.0, 2)], " Parte dos. ", cta="Síguenos"),
+    ])
+
+    assert [(b.id, b.start_s, b.end_s) for b in merged.beats] == [
+        (1, 0.0, 40.0), (2, 40.0, 95.0), (3, 100.0, 130.0), (4, 130.0, 180.0),  # clamped to the chunk end
+    ]
+    assert [(v.id, v.start_s) for v in merged.visual_timeline] == [(1, 0.0), (2, 100.0)]
+    assert merged.overall.hook == "Gancho"
+    assert merged.overall.full_narrative_script == "Parte uno. Parte dos."
+    assert merged.final_cta == "Síguenos"
+    assert merged.duration_s == 180.0
+
+
+def test_empty_chunk_is_retried_and_beats_are_streamed_rebased():
+    calls = []
+    streamed = []
+
+    async def analyze_chunk(chunk, context, on_beat):
+        calls.append(chunk.index)
+        if chunk.index == 1 and calls.count(1) == 1:
+            return VideoAnalysis()  # Gemini error reported as an empty analysis
+        result = chunk_analysis([beat(1.0, 5.0)], f"Parte {chunk.index + 1}.")
+        await on_beat(result.beats[0])
+        return result
+
+    async def on_beat(b):
+        streamed.append(b.start_s)
+
+    merged = asyncio.run(analyze_chunks(CHUNKS, analyze_chunk, on_beat=on_beat, retries=1))
+
+    assert calls == [0, 1, 1]
+    assert [b.start_s for b in merged.beats] == [1.0, 101.0]
+    assert streamed == [1.0, 101.0]
+
+
+def test_chunk_without_beats_after_retries_fails_the_analysis():
+    chunks = CHUNKS + [VideoChunk(2, "c2.mp4", 180.0, 260.0)]
+    cancelled = []
+
+    async def analyze_chunk(chunk, context, on_beat):
+        if chunk.index == 1:
+            return VideoAnalysis()
+        if chunk.index == 2:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(chunk.index)
+                raise
+        return chunk_analysis([beat(0.0, 5.0)], "Parte.")
+
+    with pytest.raises(ChunkAnalysisError):
+        asyncio.run(analyze_chunks(chunks, analyze_chunk, retries=2))
+    # The other chunks stop instead of running to completion for nothing
+    assert cancelled == [2]
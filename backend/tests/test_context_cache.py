@@ -0,0 +1,127 @@
+"""
+Context cache lifecycle against FakeContextCacheBackend (no Gemini calls)
+Run from backend/: python -m pytest tests
+"""
+import asyncio
+
+import pytest
+
+from src.infrastructure.ai import context_cache
+from src.infrastructure.ai.context_cache import (
+    ContextCacheManager,
+    FakeContextCacheBackend,
+    CONTEXT_CACHE_EXPIRY_MARGIN_S,
+    CONTEXT_CACHE_RETRY_AFTER_S,
+)
+
+MODEL = "models/gemini-2.5-flash"
+TTL_S = 3600
+
+
+class Clock:
+    """Controllable time.time() for the cache module"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    fake = Clock()
+    monkeypatch.setattr(context_cache.time, "time", fake)
+    return fake
+
+
+def make_manager(backend: FakeContextCacheBackend, min_tokens: int = 0) -> ContextCacheManager:
+    return ContextCacheManager(backend=backend, ttl_s=TTL_S, enabled=True, min_tokens=min_tokens)
+
+
+def get_model(manager: ContextCacheManager, version: str = "v1", prefix_text: str = "static rules"):
+    return asyncio.run(manager.get_model(MODEL, version, prefix_text, {"temperature": 0.2}))
+
+
+def test_create_then_hit(clock):
+    backend = FakeContextCacheBackend()
+    manager = make_manager(backend)
+
+    first = get_model(manager)
+    second = get_model(manager)
+
+    assert first.prefix.name == second.prefix.name
+    assert backend.created == 1
+    assert (manager.misses, manager.hits) == (1, 1)
+    # The per-key creation lock does not outlive the creation
+    assert manager._locks == {}
+
+
+def test_recreated_inside_expiry_margin(clock):
+    backend = FakeContextCacheBackend()
+    manager = make_manager(backend)
+    first = get_model(manager)
+
+    clock.now += TTL_S - CONTEXT_CACHE_EXPIRY_MARGIN_S + 1
+    second = get_model(manager)
+
+    assert second.prefix.name != first.prefix.name
+    assert backend.created == 2
+    # The replaced cache is deleted
+    assert first.prefix.name not in backend.entries
+    assert backend.deleted == 1
+
+
+def test_invalidate_forgets_prefix(clock):
+    backend = FakeContextCacheBackend()
+    manager = make_manager(backend)
+    first = get_model(manager)
+
+    manager.invalidate(MODEL, "v1")
+    second = get_model(manager)
+
+    # Still alive in the backend, so it is found again rather than recreated
+    assert second.prefix.name == first.prefix.name
+    assert backend.created == 1
+    assert manager.misses == 2
+
+
+def test_failure_backoff(clock):
+    backend = FakeContextCacheBackend(min_chars=1000)
+    manager = make_manager(backend)
+
+    assert get_model(manager) is None
+    assert manager.misses == 1
+    assert manager._locks == {}
+
+    # Inside the backoff window the backend is not asked again
+    clock.now += CONTEXT_CACHE_RETRY_AFTER_S - 1
+    assert get_model(manager) is None
+    assert manager.misses == 1
+
+    backend.min_chars = 0
+    clock.now += 2
+    assert get_model(manager) is not None
+    assert backend.created == 1
+
+
+def test_prefix_below_model_minimum_skips_backend(clock):
+    backend = FakeContextCacheBackend()
+    manager = make_manager(backend, min_tokens=1024)
+
+    assert get_model(manager, prefix_text="x" * 100) is None
+    # Not a failure to back off from: the backend is never asked, now or later
+    clock.now += CONTEXT_CACHE_RETRY_AFTER_S + 1
+    assert get_model(manager, prefix_text="x" * 100) is None
+    assert (backend.created, manager.misses) == (0, 0)
+
+    # A new prompt version big enough to cache is cached normally
+    assert get_model(manager, version="v2", prefix_text="x" * 4096 * 4) is not None
+    assert backend.created == 1
+
+
+def test_model_minimum(clock):
+    manager = ContextCacheManager(backend=FakeContextCacheBackend(), enabled=True)
+
+    assert manager.min_tokens_for("models/gemini-2.5-pro") == 4096
+    assert manager.min_tokens_for(MODEL) == context_cache.GEMINI_CONTEXT_CACHE_MIN_TOKENS
@@ -0,0 +1,67 @@
+"""
+Filtergraph compilation of the ffmpeg mixing engine (no ffmpeg needed)
+Run from backend/: python -m pytest tests
+"""
+import pytest
+
+from src.infrastructure.video.ffmpeg_mixer import build_mix_filtergraph, can_remux, _video_codec_args
+
+FMT = "aformat=sample_rates=44100:channel_layouts=stereo"
+
+
+def test_no_audio():
+    assert build_mix_filtergraph([]) is None
+
+
+def test_single_narration_passes_through():
+    graph = build_mix_filtergraph([(1, 2.5)])
+
+    assert graph == f"[1:a]{FMT},adelay=2500|2500[n0];[n0]anull[aout]"
+
+
+def test_full_mix():
+    graph = build_mix_filtergraph(
+        [(1, 0.0), (2, 3.25)],
+        original_input=0,
+        original_volume=0.1,
+        background_input=3,
+        background_volume=0.2,
+        duration=12.0
+    )
+    chains = graph.split(";")
+
+    assert chains == [
+        f"[1:a]{FMT},adelay=0|0[n0]",
+        f"[2:a]{FMT},adelay=3250|3250[n1]",
+        f"[3:a]{FMT},atrim=0:12.000,volume=0.2000[bg]",
+        f"[0:a]{FMT},volume=0.1000[orig]",
+        "[n0][n1][bg][orig]amix=inputs=4:duration=longest:dropout_transition=0:normalize=0[aout]",
+    ]
+
+
+def test_negative_offset_is_clamped():
+    assert "adelay=0|0" in build_mix_filtergraph([(1, -0.4)])
+
+
+def test_background_not_trimmed_without_duration():
+    graph = build_mix_filtergraph([], background_input=1, background_volume=0.3)
+
+    assert graph == f"[1:a]{FMT},volume=0.3000[bg];[bg]anull[aout]"
+
+
+@pytest.mark.parametrize("codec, format_name, expected", [
+    ("h264", "mov,mp4,m4a,3gp,3g2,mj2", True),
+    ("hevc", "matroska,webm", True),
+    ("h264", "mpegts", False),
+    ("vp9", "matroska,webm", False),
+    (None, "mov,mp4,m4a,3gp,3g2,mj2", False),
+])
+def test_can_remux(codec, format_name, expected):
+    assert can_remux(codec, format_name) is expected
+
+
+def test_video_codec_args():
+    assert _video_codec_args(True, "h264") == ["-c:v", "copy"]
+    # Apple players need the hvc1 tag for HEVC in MP4
+    assert _video_codec_args(True, "hevc") == ["-c:v", "copy", "-tag:v", "hvc1"]
+    assert _video_codec_args(False, "vp9")[:2] == ["-c:v", "libx264"]
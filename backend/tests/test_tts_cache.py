@@ -0,0 +1,57 @@
+"""
+TTS cache: key derivation and the disk tier's size-bounded LRU (remote tier off)
+Run from backend/: python -m pytest tests
+"""
+from src.infrastructure.tts.tts_cache import TTSCache, make_cache_key
+
+SETTINGS = {"stability": 0.5, "similarity_boost": 0.75}
+
+
+def make_cache(tmp_path, max_bytes: int = 1000) -> TTSCache:
+    return TTSCache(cache_dir=str(tmp_path / "cache"), max_bytes=max_bytes, use_remote=False)
+
+
+def test_cache_key_covers_everything_that_changes_the_audio():
+    key = make_cache_key("Hola", "voice-a", "model-1", SETTINGS)
+
+    assert key == make_cache_key("Hola", "voice-a", "model-1", dict(reversed(list(SETTINGS.items()))))
+    assert key != make_cache_key("Hola.", "voice-a", "model-1", SETTINGS)
+    assert key != make_cache_key("Hola", "voice-b", "model-1", SETTINGS)
+    assert key != make_cache_key("Hola", "voice-a", "model-2", SETTINGS)
+    assert key != make_cache_key("Hola", "voice-a", "model-1", {**SETTINGS, "stability": 0.6})
+
+
+def test_store_then_fetch(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.store("a", b"mp3-a")
+    out = tmp_path / "out" / "a.mp3"
+
+    assert cache.fetch("a", str(out))
+    assert out.read_bytes() == b"mp3-a"
+    assert not cache.fetch("missing", str(tmp_path / "missing.mp3"))
+    assert (cache.stats()["hits_disk"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_lru_evicts_least_recently_used(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=300)
+    cache.store("a", b"a" * 100)
+    cache.store("b", b"b" * 100)
+    cache.store("c", b"c" * 100)
+    # Touch "a" so "b" becomes the oldest
+    assert cache.fetch("a", str(tmp_path / "a.mp3"))
+
+    cache.store("d", b"d" * 100)
+
+    assert not cache.fetch("b", str(tmp_path / "b.mp3"))
+    assert all(cache.fetch(key, str(tmp_path / f"{key}.mp3")) for key in "acd")
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_bytes"] == 300
+
+
+def test_index_rebuilt_from_disk(tmp_path):
+    make_cache(tmp_path).store("a", b"mp3-a")
+
+    reopened = make_cache(tmp_path)
+
+    assert reopened.stats()["entries"] == 1
+    assert reopened.fetch("a", str(tmp_path / "a.mp3"))